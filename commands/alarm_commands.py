@@ -3,9 +3,22 @@ Alarm Commands - Fiyat alarm sistemi
 /alarm, /alarmlist, /alarmstop komutları - HABER SİSTEMİ ENTEGRELİ
 """
 
-import requests
 import telebot
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from config import *
+from utils.alarm_index import index_add_alarm, index_remove_alarm, index_pop_triggered, index_coins, get_index_size, index_bulk_load
+from utils import binance_api
+from utils.binance_api import fetch_binance_klines, decode_klines
+from utils.binance_rate import PRIORITY_BACKGROUND
+from utils.ticker_snapshot import get_snapshot_prices
+from utils.coingecko_api import resolve_coin_id, coingecko_get
+from utils.alarm_store import (
+    load_alarm_store, build_snapshot, store_save_alarm, store_delete_alarm,
+    start_alarm_store, stop_alarm_store, DIRECTIONS
+)
 
 # 🔥 HABER SİSTEMİ İMPORT
 try:
@@ -16,8 +29,16 @@ except ImportError:
         pass  # Boş fonksiyon - hata vermemesi için
 
 # Global alarm değişkenleri
-price_alarms = {}  # {user_id: [{'coin': 'eth', 'target_price': 3500, 'coin_id': 'ethereum'}]}
+price_alarms = {}  # {user_id: [{'coin': 'ETH', 'target_price': 3500, 'coin_id': 'ethereum', 'direction': 'above', 'created_at': zaman}]}
 user_states = {}   # {user_id: {'state': 'waiting_price', 'coin': 'eth'}}
+alarm_lock = threading.RLock()  # Handler thread'leri ve kontrol thread'i arasında
+cold_alarms = None  # Diskten yüklenen, henüz dokunulmamış alarmlar (user_id'ye göre sıralı diziler)
+cold_users_loaded = set()  # cold_alarms'tan price_alarms'a taşınmış kullanıcılar
+alarm_coin_symbols = {}  # {coin_id: 'BTC'} - Binance mum verisi için sembol eşlemesi
+alarm_price_snapshot = {}  # {coin_id: (fiyat, zaman)} - son toplu fiyat sonuçları, komutlarla paylaşılır
+alarm_thread = None  # Alarm kontrol thread'i
+alarm_checker_running = False
+alarm_stats = {'ticks': 0, 'upstream_calls': 0, 'fired': 0, 'wick_fired': 0, 'last_tick': None, 'started': None}
 
 def register_alarm_commands(bot):
     """Alarm komutlarını bot'a kaydet"""
@@ -113,12 +134,15 @@ def register_alarm_commands(bot):
         
         alarm_text = "⏰ **Aktif Fiyat Alarmların:**\n\n"
         
+        # Tüm alarmların fiyatlarını tek seferde al
+        current_prices = resolve_alarm_prices(alarm['coin_id'] for alarm in user_alarms)
+        
         for i, alarm in enumerate(user_alarms, 1):
             coin_name = alarm['coin_id'].replace('-', ' ').title()
             target = alarm['target_price']
             
-            # Mevcut fiyatı al
-            current_price = get_current_price_for_alarm(alarm['coin_id'])
+            # Mevcut fiyat
+            current_price = current_prices.get(alarm['coin_id'])
             if current_price:
                 if target < 0.01:
                     target_str = f"${target:.8f}"
@@ -317,7 +341,7 @@ def register_alarm_commands(bot):
             coin_id = user_state['coin_id']
             target_price = user_state['target_price']
             
-            add_price_alarm(user_id, coin, coin_id, target_price)
+            add_price_alarm(user_id, coin, coin_id, target_price, user_state['current_price'])
             
             # Fiyat formatı
             if target_price < 0.01:
@@ -360,68 +384,460 @@ def register_alarm_commands(bot):
 # =============================================================================
 
 def search_coin_for_alarm(query):
-    """Alarm için coin ara"""
-    try:
-        search_url = f"{COINGECKO_BASE_URL}/search?query={query}"
-        response = requests.get(search_url, timeout=COINGECKO_TIMEOUT)
-        if response.status_code == 200:
-            search_data = response.json()
-            if search_data.get('coins'):
-                return search_data['coins'][0]['id']
-    except:
-        pass
-    return None
+    """Alarm için coin ID'sini yerel katalogdan çöz"""
+    return resolve_coin_id(query)
 
 def get_current_price_for_alarm(coin_id):
     """Alarm için güncel fiyat al"""
     try:
         url = f"{COINGECKO_BASE_URL}/simple/price?ids={coin_id}&vs_currencies=usd"
-        response = requests.get(url, timeout=COINGECKO_TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
-            if coin_id in data:
-                return data[coin_id]['usd']
+        data = coingecko_get(url)
+        if data and coin_id in data:
+            return data[coin_id]['usd']
     except:
         pass
     return None
 
-def add_price_alarm(user_id, coin, coin_id, target_price):
+def get_prices_for_alarm(coin_ids):
+    """Birden fazla coin için fiyatları toplu al - {coin_id: price}"""
+    prices = {}
+    coin_ids = sorted(set(coin_ids))
+    
+    # URL çok uzamasın diye parça parça iste
+    for i in range(0, len(coin_ids), ALARM_PRICE_BATCH_SIZE):
+        batch = coin_ids[i:i + ALARM_PRICE_BATCH_SIZE]
+        try:
+            url = f"{COINGECKO_BASE_URL}/simple/price?ids={','.join(batch)}&vs_currencies=usd"
+            data = coingecko_get(url)
+            alarm_stats['upstream_calls'] += 1
+            if data is not None:
+                fetched_at = time.time()
+                for coin_id in batch:
+                    if coin_id in data and 'usd' in data[coin_id]:
+                        prices[coin_id] = data[coin_id]['usd']
+                        alarm_price_snapshot[coin_id] = (prices[coin_id], fetched_at)
+        except Exception as e:
+            print(f"Toplu alarm fiyat hatası: {e}")
+    
+    return prices
+
+def get_snapshot_prices_for_alarm(coin_ids):
+    """
+    Binance paritesi olan coinlerin fiyatlarını ticker tablosundan al (ağ isteği yok)
+    Dönüş: ({coin_id: price}, tabloda bulunamayan coin_id listesi)
+    """
+    symbols = {}
+    for coin_id in coin_ids:
+        coin = alarm_coin_symbols.get(coin_id)
+        symbol = binance_api.BINANCE_SYMBOLS.get(coin.lower()) if coin else None
+        if symbol:
+            symbols[coin_id] = symbol
+    
+    table_prices = get_snapshot_prices(symbols.values())
+    prices = {coin_id: table_prices[symbol] for coin_id, symbol in symbols.items() if symbol in table_prices}
+    return prices, [coin_id for coin_id in coin_ids if coin_id not in prices]
+
+def resolve_alarm_prices(coin_ids, max_age=ALARM_CHECK_INTERVAL):
+    """
+    Bir cevap için gereken tüm fiyatları çöz - taze olanlar paylaşılan snapshot'tan,
+    Binance paritesi olanlar ticker tablosundan, kalanlar tek toplu istekle
+    """
+    now = time.time()
+    prices = {}
+    missing = []
+    
+    for coin_id in set(coin_ids):
+        cached = alarm_price_snapshot.get(coin_id)
+        if cached and now - cached[1] <= max_age:
+            prices[coin_id] = cached[0]
+        else:
+            missing.append(coin_id)
+    
+    if missing:
+        table_prices, missing = get_snapshot_prices_for_alarm(missing)
+        prices.update(table_prices)
+    if missing:
+        prices.update(get_prices_for_alarm(missing))
+    
+    return prices
+
+def get_user_alarm_list(user_id):
+    """
+    Kullanıcının canlı alarm listesini döndür (alarm_lock altında çağrılmalı)
+    Diskten yüklenen alarmlar ilk erişimde price_alarms'a taşınır
+    """
+    alarms = price_alarms.get(user_id)
+    if alarms is None and cold_alarms is not None and user_id not in cold_users_loaded:
+        cold_users_loaded.add(user_id)
+        user_ids = cold_alarms['user_ids']
+        lo = np.searchsorted(user_ids, user_id, side='left')
+        hi = np.searchsorted(user_ids, user_id, side='right')
+        if hi > lo:
+            alarms = price_alarms[user_id] = [
+                {
+                    'coin': cold_alarms['coins'][cold_alarms['coin_idx'][i]],
+                    'coin_id': cold_alarms['coin_ids'][cold_alarms['coin_idx'][i]],
+                    'target_price': float(cold_alarms['targets'][i]),
+                    'direction': DIRECTIONS[cold_alarms['directions'][i]]
+                }
+                for i in range(lo, hi)
+            ]
+    return alarms
+
+def set_user_alarm(user_id, new_alarm, persist=True):
+    """Alarmı kullanıcı listesine, indekse ve kalıcı depoya yaz"""
+    coin_id = new_alarm['coin_id']
+    
+    with alarm_lock:
+        user_alarms = get_user_alarm_list(user_id)
+        if user_alarms is None:
+            user_alarms = price_alarms[user_id] = []
+        
+        # Aynı coin için mevcut alarm var mı kontrol et
+        for i, alarm in enumerate(user_alarms):
+            if alarm['coin_id'] == coin_id:
+                # Mevcut alarmı güncelle
+                index_remove_alarm(coin_id, user_id, alarm['target_price'], alarm['direction'])
+                user_alarms[i] = new_alarm
+                break
+        else:
+            # Maksimum alarm kontrolü
+            if len(user_alarms) >= MAX_ALARMS_PER_USER:
+                return False
+            
+            # Yeni alarm ekle
+            user_alarms.append(new_alarm)
+        
+        index_add_alarm(coin_id, user_id, new_alarm['target_price'], new_alarm['direction'])
+        alarm_coin_symbols[coin_id] = new_alarm['coin']
+        if persist:
+            store_save_alarm(user_id, new_alarm)
+        return True
+
+def add_price_alarm(user_id, coin, coin_id, target_price, current_price=None):
     """Kullanıcı için fiyat alarmı ekle"""
-    if user_id not in price_alarms:
-        price_alarms[user_id] = []
-    
-    # Aynı coin için mevcut alarm var mı kontrol et
-    for i, alarm in enumerate(price_alarms[user_id]):
-        if alarm['coin_id'] == coin_id:
-            # Mevcut alarmı güncelle
-            price_alarms[user_id][i] = {
-                'coin': coin.upper(),
-                'coin_id': coin_id,
-                'target_price': target_price
-            }
-            return True
+    if not current_price:
+        current_price = get_current_price_for_alarm(coin_id)
     
-    # Maksimum alarm kontrolü
-    if len(price_alarms[user_id]) >= MAX_ALARMS_PER_USER:
-        return False
+    # Alarm yönü: hedef şu anki fiyatın üstündeyse yukarı kesişim beklenir
+    direction = 'above' if not current_price or target_price >= current_price else 'below'
     
-    # Yeni alarm ekle
-    price_alarms[user_id].append({
+    return set_user_alarm(user_id, {
         'coin': coin.upper(),
         'coin_id': coin_id,
-        'target_price': target_price
+        'target_price': target_price,
+        'direction': direction,
+        'created_at': time.time()
     })
-    return True
 
-def remove_price_alarm(user_id, coin_id):
+def remove_price_alarm(user_id, coin_id, persist=True):
     """Kullanıcının belirli coin alarmını kaldır"""
-    if user_id in price_alarms:
-        price_alarms[user_id] = [alarm for alarm in price_alarms[user_id] if alarm['coin_id'] != coin_id]
+    with alarm_lock:
+        user_alarms = get_user_alarm_list(user_id)
+        if user_alarms is None:
+            return
+        
+        for alarm in user_alarms:
+            if alarm['coin_id'] == coin_id:
+                index_remove_alarm(coin_id, user_id, alarm['target_price'], alarm['direction'])
+                if persist:
+                    store_delete_alarm(user_id, coin_id)
+        
+        price_alarms[user_id] = [alarm for alarm in user_alarms if alarm['coin_id'] != coin_id]
         if not price_alarms[user_id]:
             del price_alarms[user_id]
 
 def get_user_alarms(user_id):
     """Kullanıcının aktif alarmlarını getir"""
-    return price_alarms.get(user_id, [])
+    with alarm_lock:
+        return list(get_user_alarm_list(user_id) or [])
+
+def load_price_alarms():
+    """Kalıcı depodaki alarmları indekse yükle, journal'ı üzerine uygula"""
+    global cold_alarms
+    
+    snapshot, journal = load_alarm_store()
+    
+    with alarm_lock:
+        price_alarms.clear()
+        cold_users_loaded.clear()
+        cold_alarms = None
+        
+        if snapshot is not None and len(snapshot['user_ids']):
+            # Kullanıcı bazlı erişim için user_id'ye göre sırala; alarm dict'leri ilk erişimde oluşur
+            order = np.argsort(snapshot['user_ids'], kind='stable')
+            cold_alarms = {
+                'user_ids': snapshot['user_ids'][order],
+                'coin_idx': snapshot['coin_idx'][order],
+                'targets': snapshot['targets'][order],
+                'directions': snapshot['directions'][order],
+                'coin_ids': snapshot['coin_ids'],
+                'coins': snapshot['coins']
+            }
+            index_bulk_load(snapshot['coin_ids'], snapshot['coin_idx'], snapshot['user_ids'],
+                            snapshot['targets'], snapshot['directions'])
+            alarm_coin_symbols.update(zip(snapshot['coin_ids'], snapshot['coins']))
+        
+        # Snapshot sonrası değişiklikleri uygula
+        for entry in journal:
+            if entry['op'] == 'save':
+                set_user_alarm(entry['user_id'], {
+                    'coin': entry['coin'],
+                    'coin_id': entry['coin_id'],
+                    'target_price': entry['target_price'],
+                    'direction': entry['direction'],
+                    'created_at': entry.get('created_at', 0)
+                }, persist=False)
+            else:
+                remove_price_alarm(entry['user_id'], entry['coin_id'], persist=False)
+    
+    total = get_index_size()
+    print(f"💾 {total} alarm diskten yüklendi")
+    return total
+
+def export_all_alarms():
+    """Tüm alarmların kolon bazlı snapshot'ı (alarm_lock altında çağrılır)"""
+    hot_rows = [
+        (user_id, alarm['coin_id'], alarm['coin'], alarm['target_price'], alarm['direction'])
+        for user_id, user_alarms in price_alarms.items()
+        for alarm in user_alarms
+    ]
+    
+    if cold_alarms is None:
+        return build_snapshot(hot_rows)
+    
+    # Henüz belleğe taşınmamış disk alarmları dizi olarak kalır, sadece bellektekiler eklenir
+    hot = build_snapshot(hot_rows, cold_alarms['coin_ids'], cold_alarms['coins'])
+    loaded = np.array(list(cold_users_loaded), dtype=np.int64)
+    mask = ~np.isin(cold_alarms['user_ids'], loaded)
+    
+    return {
+        'user_ids': np.concatenate([cold_alarms['user_ids'][mask], hot['user_ids']]),
+        'coin_idx': np.concatenate([cold_alarms['coin_idx'][mask], hot['coin_idx']]),
+        'targets': np.concatenate([cold_alarms['targets'][mask], hot['targets']]),
+        'directions': np.concatenate([cold_alarms['directions'][mask], hot['directions']]),
+        'coin_ids': hot['coin_ids'],
+        'coins': hot['coins']
+    }
+
+# =============================================================================
+# ALARM KONTROL MOTORU
+# =============================================================================
+
+def get_trigger_limits(highs, lows):
+    """
+    Fiyat aralıklarından indeks eşiklerini hesapla (PRICE_TOLERANCE kadar yaklaşma da sayılır)
+    'above' alarmı: high >= hedef * (1 - tolerans)  <=>  hedef <= high / (1 - tolerans)
+    'below' alarmı: low <= hedef * (1 + tolerans)   <=>  hedef >= low / (1 + tolerans)
+    """
+    return highs / (1 - PRICE_TOLERANCE), lows / (1 + PRICE_TOLERANCE)
+
+def get_price_ranges_since(coin_ids, since_ms):
+    """
+    since_ms'den sonra kapanan Binance 1m mumları - coin başına (kapanış zamanları, low, high, son kapanış)
+    Tick arasında hedefe dokunup geri dönen iğneleri yakalamak için. Ham /klines paralel indirilir;
+    paylaşılan kline deposuna yazılmaz (etkileşimli serileri LRU'dan itmesin)
+    """
+    limit = min(1000, int(np.ceil((time.time() * 1000 - since_ms) / 60_000)) + 1)
+    symbols = {}
+    for coin_id in coin_ids:
+        coin = alarm_coin_symbols.get(coin_id)
+        symbol = binance_api.BINANCE_SYMBOLS.get(coin.lower()) if coin else None
+        if symbol:
+            symbols[coin_id] = symbol
+    if not symbols:
+        return {}
+
+    def fetch(symbol):
+        return fetch_binance_klines(symbol, "1m", limit, start_time=since_ms - 60_000,
+                                    priority=PRIORITY_BACKGROUND)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(ALARM_RANGE_WORKERS, len(symbols)))) as pool:
+        results = list(pool.map(fetch, symbols.values()))
+    alarm_stats['upstream_calls'] += len(symbols)
+
+    ranges = {}
+    for coin_id, rows in zip(symbols, results):
+        if not rows:
+            continue
+        arrays = decode_klines(rows)
+        close_times = arrays['open_time'] + 59_999
+        keep = close_times >= since_ms
+        if keep.any():
+            ranges[coin_id] = (close_times[keep], arrays['low'][keep], arrays['high'][keep],
+                               float(arrays['close'][-1]))
+    return ranges
+
+def wick_range(candles, since_ms):
+    """since_ms'den sonra kapanan mumların (low, high, son kapanış) özeti - mum yoksa NaN'lar"""
+    if candles is None:
+        return (np.nan, np.nan, np.nan)
+    close_times, lows, highs, last_close = candles
+    keep = close_times >= since_ms
+    if not keep.any():
+        return (np.nan, np.nan, last_close)
+    return (float(lows[keep].min()), float(highs[keep].max()), last_close)
+
+def alarm_crossed(direction, target, low, high):
+    """Aralık (low, high) alarm hedefine PRICE_TOLERANCE kadar yaklaştı mı (NaN: hayır)"""
+    if direction == 'above':
+        return high >= target * (1 - PRICE_TOLERANCE)
+    return low <= target * (1 + PRICE_TOLERANCE)
+
+def send_alarm_notification(bot, user_id, alarm, price):
+    """Tetiklenen alarm için kullanıcıya bildirim gönder"""
+    target = alarm['target_price']
+    
+    # Fiyat formatları
+    if target < 0.01:
+        target_str = f"${target:.8f}"
+    elif target < 1:
+        target_str = f"${target:.6f}"
+    else:
+        target_str = f"${target:,.2f}"
+        
+    if price < 0.01:
+        price_str = f"${price:.8f}"
+    elif price < 1:
+        price_str = f"${price:.6f}"
+    else:
+        price_str = f"${price:,.2f}"
+    
+    coin_name = alarm['coin_id'].replace('-', ' ').title()
+    direction_emoji = "📈" if alarm.get('direction') == 'above' else "📉"
+    
+    try:
+        bot.send_message(user_id, 
+            f"🚨 **FİYAT ALARMI!** {direction_emoji}\n\n"
+            f"🪙 **{coin_name}** ({alarm['coin']})\n"
+            f"🎯 **Hedef:** {target_str}\n"
+            f"💰 **Şu an:** {price_str}\n\n"
+            f"⏰ Yeni alarm için: /alarm {alarm['coin'].lower()}",
+            parse_mode="Markdown")
+        return True
+    except Exception as e:
+        print(f"❌ Alarm bildirimi gönderilemedi {user_id}: {e}")
+        return False
+
+def check_price_alarms(bot):
+    """
+    Tek kontrol turu - coin başına tek fiyat + son tick'ten beri mum high/low aralığı,
+    tetiklenen alarmları indeksten bisect ile bul
+    """
+    coin_ids = index_coins()
+    if not coin_ids:
+        return 0
+    
+    # Her coin için tek fiyat - Binance paritesi olanlar ticker tablosundan,
+    # kalanlar tek toplu CoinGecko isteğiyle
+    prices, missing = get_snapshot_prices_for_alarm(coin_ids)
+    if missing:
+        prices.update(get_prices_for_alarm(missing))
+    
+    # Tick arası iğneler için mum aralıkları - son tick'ten (ilk turda kontrolün başladığı andan) beri
+    since_ms = int((alarm_stats['last_tick'] or alarm_stats['started'] or time.time()) * 1000)
+    candles = get_price_ranges_since(coin_ids, since_ms)
+    
+    # Tüm coinler için aralık ve eşikleri tek vektörel geçişte hesapla
+    checked_ids = [coin_id for coin_id in coin_ids if coin_id in prices or coin_id in candles]
+    if not checked_ids:
+        return 0
+    
+    spot = np.array([prices.get(coin_id, np.nan) for coin_id in checked_ids], dtype=float)
+    wick = np.array([wick_range(candles.get(coin_id), since_ms) for coin_id in checked_ids], dtype=float)
+    highs = np.fmax(spot, wick[:, 1])
+    lows = np.fmin(spot, wick[:, 0])
+    high_limits, low_limits = get_trigger_limits(highs, lows)
+    # Bildirimde gösterilecek fiyat: spot fiyat, yoksa son mum kapanışı
+    shown_prices = np.where(np.isnan(spot), wick[:, 2], spot)
+    
+    triggered = []
+    wick_count = 0
+    with alarm_lock:
+        for coin_id, spot_price, high_limit, low_limit, price in zip(
+                checked_ids, spot.tolist(), high_limits.tolist(), low_limits.tolist(), shown_prices.tolist()):
+            for user_id, target, direction in index_pop_triggered(coin_id, high_limit, low_limit):
+                alarm = next((a for a in get_user_alarm_list(user_id) or [] if a['coin_id'] == coin_id), None)
+                
+                # Bu tick içinde kurulan alarm: sadece kurulduktan sonra kapanan mumlar sayılır
+                created_ms = int(alarm.get('created_at', 0) * 1000) if alarm else 0
+                if created_ms > since_ms:
+                    low, high, _ = wick_range(candles.get(coin_id), created_ms)
+                    if not alarm_crossed(direction, target, np.fmin(spot_price, low), np.fmax(spot_price, high)):
+                        index_add_alarm(coin_id, user_id, target, direction)
+                        continue
+                
+                # Güncel fiyat hedefi geçmediyse iğne ile yakalandı
+                if not alarm_crossed(direction, target, price, price):
+                    wick_count += 1
+                
+                # Bildirim için kullanıcının alarm kaydını al ve kaldır
+                if alarm is not None:
+                    triggered.append((user_id, alarm, price))
+                remove_price_alarm(user_id, coin_id)
+    
+    # Bildirimleri kilit dışında gönder
+    for user_id, alarm, price in triggered:
+        send_alarm_notification(bot, user_id, alarm, price)
+    
+    alarm_stats['fired'] += len(triggered)
+    alarm_stats['wick_fired'] += wick_count
+    if triggered:
+        print(f"🚨 {len(triggered)} alarm tetiklendi ({wick_count} iğne ile, {len(coin_ids)} coin kontrol edildi)")
+    
+    return len(triggered)
+
+def alarm_checker_loop(bot):
+    """Ana alarm kontrol döngüsü"""
+    print("🔄 Alarm kontrolü başlatıldı...")
+    
+    while alarm_checker_running:
+        try:
+            tick_start = time.time()
+            check_price_alarms(bot)
+            alarm_stats['ticks'] += 1
+            alarm_stats['last_tick'] = tick_start
+        except Exception as e:
+            print(f"❌ Alarm kontrol döngü hatası: {e}")
+        
+        time.sleep(ALARM_CHECK_INTERVAL)
+
+def start_alarm_checker(bot):
+    """Alarm kontrol sistemini başlat"""
+    global alarm_thread, alarm_checker_running
+    
+    if alarm_checker_running:
+        print("⚠️ Alarm kontrolü zaten çalışıyor!")
+        return False
+    
+    # Alarmları diskten geri yükle ve kalıcı depoyu aç
+    load_price_alarms()
+    start_alarm_store(export_all_alarms, alarm_lock)
+    
+    alarm_checker_running = True
+    alarm_stats['started'] = time.time()
+    alarm_thread = threading.Thread(target=alarm_checker_loop, args=(bot,), daemon=True)
+    alarm_thread.start()
+    
+    print(f"✅ Alarm kontrolü başladı! (Her {ALARM_CHECK_INTERVAL} saniyede)")
+    return True
+
+def stop_alarm_checker():
+    """Alarm kontrol sistemini durdur"""
+    global alarm_checker_running
+    alarm_checker_running = False
+    stop_alarm_store()
+    print("⏹️ Alarm kontrolü durduruldu")
+
+def get_alarm_stats():
+    """Alarm sistemi istatistiklerini al"""
+    return {
+        'total_alarms': get_index_size(),
+        'ticks': alarm_stats['ticks'],
+        'upstream_calls': alarm_stats['upstream_calls'],
+        'fired': alarm_stats['fired'],
+        'wick_fired': alarm_stats['wick_fired'],
+        'system_running': alarm_checker_running
+    }
 
 print("⏰ Alarm commands yüklendi!")
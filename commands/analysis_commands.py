@@ -1,14 +1,14 @@
-commands/analysis_commands.py"""
+"""
 Clean and Simple Analysis Commands  
 Sadece 4 timeframe butonu + AI yorumu + Fibonacci dahil - HABER SİSTEMİ ENTEGRELİ
 """
 
-import requests
 import telebot
 from telebot import types
 import pandas as pd
 from config import *
-from utils.binance_api import find_binance_symbol, get_binance_ohlc
+from utils.binance_api import find_binance_symbol, suggest_binance_symbols
+from utils.kline_resample import get_resampled_ohlc
 from utils.chart_generator import create_advanced_chart
 
 # 🔥 HABER SİSTEMİ İMPORT
@@ -56,9 +56,15 @@ def register_analysis_commands(bot):
             binance_symbol = find_binance_symbol(coin_input)
             
             if not binance_symbol:
+                suggestions = suggest_binance_symbols(coin_input)
+                if suggestions:
+                    hint = ", ".join(f"/analiz {key}" for key, _ in suggestions)
+                    hint_text = f"🤔 **Bunu mu demek istediniz:** {hint}"
+                else:
+                    hint_text = "💡 **Popüler:** BTC, ETH, SOL, DOGE, ADA"
                 bot.send_message(message.chat.id, 
                     f"❌ **'{coin_input.upper()}' Binance'da bulunamadı!**\n\n"
-                    f"💡 **Popüler:** BTC, ETH, SOL, DOGE, ADA",
+                    f"{hint_text}",
                     parse_mode="Markdown")
                 return
 
@@ -82,7 +88,7 @@ def register_analysis_commands(bot):
             
             # Güncel fiyatı göster
             try:
-                df_quick = get_binance_ohlc(binance_symbol, interval="1d", limit=2)
+                df_quick = get_resampled_ohlc(binance_symbol, interval="1d", limit=2)
                 if df_quick is not None and not df_quick.empty:
                     current_price = df_quick['close'].iloc[-1]
                     prev_price = df_quick['close'].iloc[-2]
@@ -189,7 +195,8 @@ def perform_complete_timeframe_analysis(message, symbol, coin_input, timeframe,
         limit_map = {'1h': 168, '4h': 168, '1d': 100, '1w': 52}
         limit = limit_map.get(timeframe, 100)
         
-        df = get_binance_ohlc(symbol, interval=timeframe, limit=limit)
+        # 4h/1d/1w depodaki 1h serisinden yerelde üretilir
+        df = get_resampled_ohlc(symbol, interval=timeframe, limit=limit)
         if df is None or df.empty:
             bot.send_message(message.chat.id, f"❌ {symbol} veri alınamadı!")
             return
@@ -323,19 +330,18 @@ def format_complete_analysis_message(analysis_result, support_resistance, coin_i
 # BASIT TEKNİK ANALİZ FONKSİYONLARI
 # =============================================================================
 
-from utils.technical_analysis import (
-    calculate_rsi, calculate_macd, calculate_bollinger_bands
-)
+from utils.indicators import get_indicators
 
 def perform_comprehensive_analysis(df, symbol, timeframe):
     """Kapsamlı teknik analiz - basitleştirilmiş"""
     try:
         current_price = df['close'].iloc[-1]
         
-        # Temel indikatörler
-        rsi = calculate_rsi(df['close']).iloc[-1]
-        macd_data = calculate_macd(df['close'])
-        bb_data = calculate_bollinger_bands(df['close'])
+        # Temel indikatörler - tek paket (grafik de aynı paketi okur)
+        indicators = get_indicators(df, ('rsi', 'macd', 'bb', 'sma_20'))
+        rsi = indicators['rsi'].iloc[-1]
+        macd_data = indicators['macd']
+        bb_data = indicators['bb']
         
         # Sinyal gücü analizi
         signals = calculate_basic_signals(df, rsi, macd_data, bb_data)
@@ -435,7 +441,7 @@ def calculate_basic_score(signals, rsi, current_price, df):
         signal_score = sum(s['strength'] for s in signals if s['type'] == 'BUY') - sum(s['strength'] for s in signals if s['type'] == 'SELL')
         
         # Trend skoru
-        sma_20 = df['close'].rolling(20).mean().iloc[-1]
+        sma_20 = get_indicators(df, ('sma_20',))['sma_20'].iloc[-1]
         trend_score = 2 if current_price > sma_20 else -2
         
         # RSI skoru
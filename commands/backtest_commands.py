@@ -0,0 +1,109 @@
+"""
+Backtest Commands - Sinyal geçmiş performansı
+/backtest komutu - botun sinyal kurallarını yılların mumları üzerinde test eder - HABER SİSTEMİ ENTEGRELİ
+"""
+
+import telebot
+from datetime import datetime, timezone
+from config import *
+from utils.binance_api import find_binance_symbol, suggest_binance_symbols
+from utils.backtest import backtest_symbol
+
+# 🔥 HABER SİSTEMİ İMPORT
+try:
+    from utils.news_system import add_active_user
+except ImportError:
+    print("⚠️ Haber sistemi import edilemedi")
+    def add_active_user(user_id):
+        pass  # Boş fonksiyon - hata vermemesi için
+
+BACKTEST_TIMEFRAMES = ("1h", "4h", "1d", "1w")
+
+def register_backtest_commands(bot):
+    """Backtest komutlarını bot'a kaydet"""
+
+    @bot.message_handler(commands=['backtest'])
+    def backtest(message):
+        """Sinyal kurallarının geçmiş performansı"""
+        try:
+            # 🔥 HABER SİSTEMİ: Kullanıcıyı otomatik kaydet
+            add_active_user(message.from_user.id)
+
+            parts = message.text.strip().split()
+            if len(parts) < 2:
+                bot.send_message(message.chat.id,
+                    "🧪 **Sinyal Backtest**\n\n"
+                    "🔹 **Kullanım:** /backtest COIN [TF]\n\n"
+                    f"⏰ **TF:** {', '.join(BACKTEST_TIMEFRAMES)} (varsayılan 1h)\n\n"
+                    "**Örnekler:**\n"
+                    "• /backtest btc\n"
+                    "• /backtest eth 4h\n"
+                    "• /backtest sol 1d",
+                    parse_mode="Markdown")
+                return
+
+            coin_input = parts[1].lower()
+            timeframe = parts[2].lower() if len(parts) > 2 else "1h"
+            if timeframe not in BACKTEST_TIMEFRAMES:
+                bot.send_message(message.chat.id,
+                    f"❌ Geçersiz zaman dilimi! Desteklenen: {', '.join(BACKTEST_TIMEFRAMES)}")
+                return
+
+            binance_symbol = find_binance_symbol(coin_input)
+            if not binance_symbol:
+                suggestions = suggest_binance_symbols(coin_input)
+                if suggestions:
+                    hint = ", ".join(f"/backtest {key}" for key, _ in suggestions)
+                    hint_text = f"🤔 **Bunu mu demek istediniz:** {hint}"
+                else:
+                    hint_text = "💡 **Popüler:** BTC, ETH, SOL, DOGE, ADA"
+                bot.send_message(message.chat.id,
+                    f"❌ **'{coin_input.upper()}' Binance'da bulunamadı!**\n\n"
+                    f"{hint_text}",
+                    parse_mode="Markdown")
+                return
+
+            bot.send_message(message.chat.id, f"🧪 {coin_input.upper()} {timeframe} backtest hazırlanıyor...")
+
+            result = backtest_symbol(binance_symbol, timeframe)
+            if result is None:
+                bot.send_message(message.chat.id, "❌ Backtest için yeterli geçmiş veri alınamadı!")
+                return
+
+            bot.send_message(message.chat.id, format_backtest_message(result, coin_input),
+                             parse_mode="Markdown")
+
+        except Exception as e:
+            print(f"Backtest komutu hatası: {e}")
+            bot.send_message(message.chat.id, ERROR_MESSAGES["api_error"])
+
+# =============================================================================
+# YARDIMCI FONKSİYONLAR
+# =============================================================================
+
+def format_backtest_message(result, coin_input):
+    """Backtest sonucunu formatla"""
+    def day(ms):
+        return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+    mesaj = f"🧪 **{coin_input.upper()} {result['interval']} Backtest**\n\n"
+    mesaj += f"📅 {day(result['start'])} → {day(result['end'])} ({result['bars']:,} mum)\n"
+    mesaj += f"⏱️ Sinyal sonrası {result['horizon']} mum getirisi ölçülür\n"
+    if result['baseline_return'] is not None:
+        mesaj += f"⚖️ Tüm mumlar ortalaması: %{result['baseline_return']:+.2f}\n"
+    mesaj += "\n"
+
+    for stats in result['signals'].values():
+        emoji = "🟢" if stats['type'] == 'BUY' else "🔴"
+        if not stats['count']:
+            mesaj += f"{emoji} **{stats['label']}:** sinyal yok\n"
+            continue
+        mesaj += (f"{emoji} **{stats['label']}:** {stats['count']} sinyal\n"
+                  f"   🎯 İsabet %{stats['hit_rate']:.1f} | 📈 Ort. %{stats['avg_return']:+.2f} | "
+                  f"📉 Maks. düşüş %{stats['max_drawdown']:.1f}\n")
+
+    mesaj += (f"\n⚡ {result['load_ms'] + result['compute_ms']:.0f} ms\n"
+              "⚠️ *Geçmiş performans gelecek sonuçları garanti etmez.*")
+    return mesaj
+
+print("🧪 Backtest commands yüklendi!")
@@ -1,11 +1,14 @@
 """
 Price Commands - Fiyat ile ilgili komutlar
-/fiyat, /top10, /trending komutları - HABER SİSTEMİ ENTEGRELİ
+/fiyat, /top10, /trending, /movers komutları - HABER SİSTEMİ ENTEGRELİ
 """
 
-import requests
 import telebot
 from config import *
+from utils import binance_api
+from utils.binance_stream import is_stream_active, touch_stream_symbol, get_stream_price
+from utils.ticker_snapshot import get_top_movers
+from utils.coingecko_api import resolve_coin_id, coingecko_get
 
 # 🔥 HABER SİSTEMİ İMPORT
 try:
@@ -57,6 +60,15 @@ def register_price_commands(bot):
                 bot.send_message(message.chat.id, ERROR_MESSAGES["api_error"])
                 return
 
+            # Akış modunda Binance'taki canlı fiyatı kullan
+            if is_stream_active():
+                symbol = binance_api.BINANCE_SYMBOLS.get(coin_input)
+                if symbol:
+                    touch_stream_symbol(symbol)
+                    live_price = get_stream_price(symbol)
+                    if live_price:
+                        price_data = dict(price_data, usd=live_price)
+
             # Mesajı formatla
             formatted_message = format_price_message(coin_id, price_data, coin_input)
             bot.send_message(message.chat.id, formatted_message, parse_mode="Markdown")
@@ -75,13 +87,12 @@ def register_price_commands(bot):
             bot.send_message(message.chat.id, "🔄 Top 10 yükleniyor...")
             
             url = f"{COINGECKO_BASE_URL}/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10&page=1"
-            response = requests.get(url, timeout=COINGECKO_TIMEOUT)
+            coins = coingecko_get(url)
             
-            if response.status_code != 200:
+            if coins is None:
                 bot.send_message(message.chat.id, ERROR_MESSAGES["api_error"])
                 return
-                
-            coins = response.json()
+
             result_text = "🏆 **Top 10 Cryptocurrency:**\n\n"
             
             for i, coin in enumerate(coins, 1):
@@ -122,13 +133,12 @@ def register_price_commands(bot):
             bot.send_message(message.chat.id, "🔥 Trend coinler yükleniyor...")
             
             url = f"{COINGECKO_BASE_URL}/search/trending"
-            response = requests.get(url, timeout=COINGECKO_TIMEOUT)
+            data = coingecko_get(url)
             
-            if response.status_code != 200:
+            if data is None:
                 bot.send_message(message.chat.id, ERROR_MESSAGES["api_error"])
                 return
-                
-            data = response.json()
+
             trending = data.get('coins', [])[:7]
             
             if not trending:
@@ -152,33 +162,49 @@ def register_price_commands(bot):
             print(f"Trending hatası: {e}")
             bot.send_message(message.chat.id, ERROR_MESSAGES["api_error"])
 
+    @bot.message_handler(commands=['movers'])
+    def top_movers(message):
+        """24 saatte en çok yükselen / düşen Binance USDT pariteleri"""
+        try:
+            # 🔥 HABER SİSTEMİ: Kullanıcıyı otomatik kaydet
+            add_active_user(message.from_user.id)
+            
+            # Ticker tablosundan - ağ isteği yok
+            gainers, losers = get_top_movers(count=5)
+            if not gainers:
+                bot.send_message(message.chat.id, "❌ Piyasa verisi henüz hazır değil, biraz sonra tekrar dene!")
+                return
+            
+            result_text = "🚀 **24s En Çok Yükselenler:**\n\n"
+            for i, (symbol, change, price) in enumerate(gainers, 1):
+                result_text += f"**{i}. {symbol.replace('USDT', '')}** 🟢 %{change:.2f} (${price:,.6g})\n"
+            
+            result_text += "\n🩸 **24s En Çok Düşenler:**\n\n"
+            for i, (symbol, change, price) in enumerate(losers, 1):
+                result_text += f"**{i}. {symbol.replace('USDT', '')}** 🔴 %{change:.2f} (${price:,.6g})\n"
+            
+            result_text += "\n💡 **Detay için:** /fiyat SYMBOL"
+            bot.send_message(message.chat.id, result_text, parse_mode="Markdown")
+            
+        except Exception as e:
+            print(f"Movers hatası: {e}")
+            bot.send_message(message.chat.id, ERROR_MESSAGES["api_error"])
+
 # =============================================================================
 # YARDIMCI FONKSİYONLAR
 # =============================================================================
 
 def search_coin_id(query):
-    """CoinGecko'da coin ara"""
-    try:
-        search_url = f"{COINGECKO_BASE_URL}/search?query={query}"
-        response = requests.get(search_url, timeout=COINGECKO_TIMEOUT)
-        if response.status_code == 200:
-            search_data = response.json()
-            if search_data.get('coins'):
-                return search_data['coins'][0]['id']
-    except:
-        pass
-    return None
+    """CoinGecko coin ID'sini yerel katalogdan çöz"""
+    return resolve_coin_id(query)
 
 def get_coin_price(coin_id):
     """Coin fiyat bilgilerini al"""
     try:
         url = f"{COINGECKO_BASE_URL}/simple/price?ids={coin_id}&vs_currencies=usd&include_24hr_change=true&include_24hr_vol=true&include_market_cap=true"
-        response = requests.get(url, timeout=COINGECKO_TIMEOUT)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if coin_id in data:
-                return data[coin_id]
+        data = coingecko_get(url)
+        if data and coin_id in data:
+            return data[coin_id]
     except:
         pass
     return None
@@ -0,0 +1,98 @@
+"""
+Scanner Commands - Piyasa tarama komutları
+/tara komutu - tüm USDT paritelerini önceden hesaplanmış tablo üzerinden tarar - HABER SİSTEMİ ENTEGRELİ
+"""
+
+import telebot
+from config import *
+from utils.market_scanner import parse_scan_query, scan_market
+
+# 🔥 HABER SİSTEMİ İMPORT
+try:
+    from utils.news_system import add_active_user
+except ImportError:
+    print("⚠️ Haber sistemi import edilemedi")
+    def add_active_user(user_id):
+        pass  # Boş fonksiyon - hata vermemesi için
+
+# Sonuçlarda gösterilen sinyal etiketleri
+SIGNAL_LABELS = {
+    'rsi_oversold': "RSI aşırı satım", 'rsi_overbought': "RSI aşırı alım",
+    'macd_cross_up': "MACD pozitif kesişim", 'macd_cross_down': "MACD negatif kesişim",
+    'below_bb': "Bollinger alt band altında", 'above_bb': "Bollinger üst band üzerinde"
+}
+
+SCAN_USAGE = ("🔭 **Piyasa Tarayıcı**\n\n"
+              "🔹 **Kullanım:** /tara KOŞUL [KOŞUL...] [TF]\n\n"
+              "**Koşullar:**\n"
+              "• rsi<30, rsi>70 - RSI\n"
+              "• degisim>5 - Son mum değişimi (%)\n"
+              "• hacim>2 - Hacim / 20 mum ortalaması\n"
+              "• fiyat<1 - Fiyat ($)\n"
+              "• al, sat - Herhangi bir al/sat sinyali\n"
+              "• `rsi_al`, `rsi_sat`, `macd_al`, `macd_sat`, `bb_alt`, `bb_ust` - Tek kural sinyali\n\n"
+              f"⏰ **TF:** {', '.join(SCANNER_INTERVALS)} (varsayılan {SCANNER_INTERVALS[0]})\n\n"
+              "**Örnekler:**\n"
+              "• /tara rsi<30 1h\n"
+              "• `/tara macd_al hacim>1.5 4h`\n"
+              "• /tara sat 1d")
+
+def register_scanner_commands(bot):
+    """Tarama komutlarını bot'a kaydet"""
+
+    @bot.message_handler(commands=['tara'])
+    def tara(message):
+        """Tüm USDT paritelerini koşullara göre tara"""
+        try:
+            # 🔥 HABER SİSTEMİ: Kullanıcıyı otomatik kaydet
+            add_active_user(message.from_user.id)
+
+            parts = message.text.strip().split()
+            try:
+                interval, conditions = parse_scan_query(parts[1:])
+            except ValueError as e:
+                error_text = f"❌ `{e}`\n\n" if len(parts) > 1 else ""
+                bot.send_message(message.chat.id, error_text + SCAN_USAGE, parse_mode="Markdown")
+                return
+
+            result = scan_market(interval, conditions)
+            if result is None:
+                bot.send_message(message.chat.id,
+                    f"⏳ {interval} tarama tablosu hazırlanıyor, birkaç dakika sonra tekrar dene!")
+                return
+
+            bot.send_message(message.chat.id, format_scan_message(result, interval, parts[1:]),
+                             parse_mode="Markdown")
+
+        except Exception as e:
+            print(f"Tara komutu hatası: {e}")
+            bot.send_message(message.chat.id, ERROR_MESSAGES["api_error"])
+
+# =============================================================================
+# YARDIMCI FONKSİYONLAR
+# =============================================================================
+
+def format_scan_message(result, interval, tokens):
+    """Tarama sonucunu formatla"""
+    query = " ".join(token for token in tokens if token.lower() != interval)
+    mesaj = f"🔭 **Tarama:** `{query}` ({interval})\n\n"
+
+    if not result['matches']:
+        mesaj += "🤷 Koşullara uyan parite yok.\n\n"
+    else:
+        for i, match in enumerate(result['matches'], 1):
+            change_color = "🟢" if match['change'] > 0 else "🔴"
+            mesaj += (f"**{i}. {match['symbol'].replace('USDT', '')}** ${match['price']:,.6g} "
+                      f"{change_color} %{match['change']:+.2f} | RSI {match['rsi']:.1f} | "
+                      f"Hacim x{match['volume_ratio']:.1f}\n")
+            if match['signals']:
+                mesaj += f"   ⚡ {', '.join(SIGNAL_LABELS[name] for name in match['signals'])}\n"
+        mesaj += "\n"
+
+    age_minutes = result['age_seconds'] / 60
+    mesaj += (f"📊 {result['total']}/{result['scanned']} parite eşleşti "
+              f"({result['elapsed_ms']:.2f} ms, tablo {age_minutes:.0f} dk önce)\n\n")
+    mesaj += "💡 **Detay için:** /analiz COIN"
+    return mesaj
+
+print("🔭 Scanner commands yüklendi!")
@@ -23,6 +23,11 @@ YAHOO_FINANCE_BASE_URL = "https://query1.finance.yahoo.com/v8/finance"
 ALARM_CHECK_INTERVAL = 60  # Saniye (60 = 1 dakika)
 MAX_ALARMS_PER_USER = 10   # Kullanıcı başına maksimum alarm
 PRICE_TOLERANCE = 0.01     # Fiyat toleransı (%1)
+ALARM_PRICE_BATCH_SIZE = 100  # Tek /simple/price isteğindeki maksimum coin sayısı
+ALARM_RANGE_WORKERS = 8  # Tick arası 1m mum aralıkları için aynı anda indirilen coin sayısı
+ALARM_SNAPSHOT_FILE = "alarms_snapshot.npz"  # Kalıcı alarm deposu (kolon bazlı snapshot)
+ALARM_JOURNAL_FILE = "alarms_journal.jsonl"  # Snapshot sonrası değişiklikler (append-only)
+ALARM_JOURNAL_COMPACT_EVERY = 10000  # Bu kadar journal kaydından sonra snapshot'a sıkıştır
 
 # Grafik ayarları
 CHART_WIDTH = 18
@@ -33,6 +38,68 @@ CHART_DPI = 200
 API_TIMEOUT = 15  # Saniye
 BINANCE_TIMEOUT = 10
 COINGECKO_TIMEOUT = 10
+TELEGRAM_TIMEOUT = 10
+
+# Binance sembol tablosu (hızlı açılış için disk snapshot'ı)
+BINANCE_SYMBOLS_FILE = "binance_symbols.json"
+BINANCE_SYMBOLS_REFRESH_HOURS = 6  # /exchangeInfo arka planda bu kadar saatte bir yenilenir
+
+# Binance istek ağırlığı (utils/binance_rate.py)
+BINANCE_WEIGHT_LIMIT = 6000  # IP başına dakikalık ağırlık limiti (X-MBX-USED-WEIGHT-1M)
+
+# HTTP bağlantı havuzu (utils/http_client.py)
+HTTP_POOL_CONNECTIONS = 10  # Havuz tutulacak farklı host sayısı
+HTTP_POOL_MAXSIZE = 16      # Host başına açık tutulacak bağlantı (telebot worker'ları + arka plan thread'leri)
+
+# OHLCV deposu (utils/kline_cache.py)
+KLINE_CACHE_MAX_ENTRIES = 256  # Bellekte tutulacak maksimum (sembol, interval) sayısı - LRU
+KLINE_OPEN_CANDLE_TTL = 10     # Saniye - açık (kapanmamış) mum bu süreden sonra yenilenir
+KLINE_STORE_CAPACITY = 500     # (sembol, interval) başına halka tamponda tutulan kapanmış mum sayısı
+
+# Geçmiş kline indirme (utils/kline_backfill.py)
+BACKFILL_WORKERS = 4  # Aynı anda indirilen sayfa sayısı (ağırlık zamanlayıcısı yine sınırlar)
+BACKFILL_RETRIES = 2  # Alınamayan sayfalar için tekrar deneme turu
+
+# Diskte kolon bazlı OHLCV arşivi (utils/kline_archive.py)
+KLINE_ARCHIVE_ENABLED = True       # Kapanmış mumları diske yaz, yeniden başlatmada oradan yükle
+KLINE_ARCHIVE_DIR = "kline_archive"  # Sembol/interval/kolon.bin dosyalarının kök dizini
+KLINE_ARCHIVE_SYMBOL_MAX_MB = 64   # Sembol başına disk sınırı - aşılırsa en eski mumlar atılır
+
+# Üst timeframe üretimi (utils/kline_resample.py)
+RESAMPLE_BASE_INTERVAL = "1h"  # 4h/1d/1w bu seriden yerelde üretilir (tek upstream seri)
+
+# İndikatör motoru (utils/indicators.py)
+INDICATOR_CACHE_MAX_ENTRIES = 32  # Önbellekte tutulan seri (indikatör paketi) sayısı - LRU
+INDICATOR_STATE_FILE = "indicator_states.json"  # Akış indikatörü durumlarının disk kopyası (utils/streaming_indicators.py)
+LIVE_INDICATOR_NAMES = ('rsiw_14', 'sma_20', 'ema_12', 'macd', 'bb', 'stochastic')  # Akışta kapanan mumla güncellenenler (boş: kapalı)
+
+# Binance WebSocket akışı (utils/binance_stream.py) - websocket-client paketi gerekir
+BINANCE_STREAM_ENABLED = False  # True: fiyat/mum verisi REST yerine canlı akıştan beslenir
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream"  # Yerel test: "ws://127.0.0.1:8765/stream"
+BINANCE_STREAM_IDLE_SECONDS = 900  # Bu süre istenmeyen semboller için akış aboneliği bırakılır
+BINANCE_STREAM_MAX_AGE = 30        # Saniye - bundan eski canlı fiyat kullanılmaz
+BINANCE_STREAM_RECORD_FILE = None  # Örn. "stream_record.jsonl" - gelen mesajları replay için kaydet
+
+# Toplu ticker tablosu (utils/ticker_snapshot.py)
+TICKER_SNAPSHOT_INTERVAL = 30  # Saniye - tüm semboller için /ticker/24hr yenileme aralığı
+TICKER_SNAPSHOT_MAX_AGE = 120  # Saniye - bundan eski tablo kullanılmaz (REST'e düşülür)
+
+# Piyasa tarayıcı (utils/market_scanner.py)
+SCANNER_ENABLED = True                  # Tüm USDT paritelerinin indikatör tablosunu arka planda hazırla (/tara)
+SCANNER_INTERVALS = ("1h", "4h", "1d")  # Önceden hesaplanan timeframe'ler - ilki /tara varsayılanı
+SCANNER_CANDLES = 99                    # Sembol başına mum (100'ün altı: /klines ağırlığı 1)
+SCANNER_REFRESH_INTERVAL = 300          # Saniye - tablolar bu aralıkla yenilenir
+SCANNER_WORKERS = 8                     # Aynı anda indirilen sembol sayısı (düşük öncelik, ağırlık doluysa düşürülür)
+SCANNER_RESULT_COUNT = 15               # /tara cevabında gösterilen en fazla parite
+
+# Sinyal backtest (utils/backtest.py)
+BACKTEST_DAYS = 1095  # Geçmiş uzunluğu (gün) - arşivde eksik kısım bir kez indirilir
+BACKTEST_HORIZONS = {"1h": 24, "4h": 12, "1d": 5, "1w": 2}  # İleri getiri penceresi / pozisyon süresi (mum)
+BACKTEST_MIN_BARS = 100  # Bundan kısa geçmişte backtest yapılmaz
+
+# CoinGecko coin kataloğu (utils/coingecko_api.py)
+COIN_LIST_FILE = "coingecko_coins.json"  # /coins/list kataloğunun disk kopyası
+COIN_LIST_REFRESH_HOURS = 6              # Katalog bu kadar saatte bir yenilenir
 
 # =============================================================================
 # DESTEKLENEN COİN LİSTESİ (İLK ETAPTA)
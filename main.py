@@ -10,15 +10,25 @@ import atexit
 from config import *
 
 # Utils modüllerini import et
-from utils.binance_api import load_all_binance_symbols, find_binance_symbol
+from utils.binance_api import load_all_binance_symbols, find_binance_symbol, stop_symbols_refresh
 from utils.technical_analysis import *
 from utils.chart_generator import create_advanced_chart, create_simple_price_chart
 from utils.news_system import start_news_system, stop_news_system, add_active_user, get_news_stats
+from utils.binance_rate import get_rate_stats
+from utils.singleflight import get_singleflight_stats
+from utils.http_client import http_get, close_http_session
+from utils.binance_stream import start_binance_stream, stop_binance_stream
+from utils.ticker_snapshot import start_ticker_snapshot, stop_ticker_snapshot
+from utils.coingecko_api import start_coin_list, stop_coin_list
+from utils.market_scanner import start_market_scanner, stop_market_scanner
+from utils.streaming_indicators import load_live_indicators, save_live_indicators
 
 # Komut modüllerini import et
 from commands.price_commands import register_price_commands
-from commands.alarm_commands import register_alarm_commands
+from commands.alarm_commands import register_alarm_commands, start_alarm_checker, stop_alarm_checker
 from commands.analysis_commands import register_analysis_commands
+from commands.scanner_commands import register_scanner_commands
+from commands.backtest_commands import register_backtest_commands
 
 # Likidite haritası modülü
 from utils.liquidity_heatmap import add_liquidity_command_to_bot
@@ -30,6 +40,8 @@ bot = telebot.TeleBot(TELEGRAM_TOKEN)
 register_price_commands(bot)
 register_alarm_commands(bot)
 register_analysis_commands(bot)
+register_scanner_commands(bot)
+register_backtest_commands(bot)
 
 # Likidite komutlarını kaydet
 add_liquidity_command_to_bot(bot)
@@ -111,10 +123,13 @@ def yardim(message):
 - /fiyat COIN - Coin fiyatı (örn: /fiyat btc)
 - /top10 - En büyük 10 coin
 - /trending - Trend coinler
+- /movers - 24s en çok yükselen/düşenler
 
 📈 **Analiz:**
 - /analiz COIN - Teknik analiz (örn: /analiz eth)
 - /likidite COIN - Likidite haritası
+- /tara KOŞUL TF - Tüm USDT paritelerini tara (örn: /tara rsi<30 1h)
+- /backtest COIN TF - Sinyallerin geçmiş performansı (örn: /backtest btc 1h)
 
 ⏰ **Alarm Sistemi:**
 - /alarm COIN - Fiyat alarmı kur
@@ -133,6 +148,8 @@ def yardim(message):
 - /analiz eth
 - /likidite sol
 - /alarm doge
+- /tara rsi<30 1h
+- /backtest eth 4h
 
 🚀 **500+ coin destekleniyor!**
 
@@ -153,8 +170,10 @@ def test_bot(message):
     # 🔥 HABER SİSTEMİ: Kullanıcıyı otomatik kaydet
     register_user_for_news(message.from_user.id)
     
-    # Haber sistemi istatistikleri
+    # Haber sistemi ve Binance ağırlık istatistikleri
     news_stats = get_news_stats()
+    rate_stats = get_rate_stats()
+    flight_stats = get_singleflight_stats()
     
     bot.send_message(message.chat.id, 
                      f"✅ **Bot Çalışıyor!**\n\n"
@@ -165,12 +184,18 @@ def test_bot(message):
                      f"• Fiyat sorgulama ✅\n"
                      f"• Teknik analiz ✅\n"
                      f"• Likidite haritası ✅\n"
+                     f"• Piyasa tarayıcı (/tara) ✅\n"
+                     f"• Sinyal backtest (/backtest) ✅\n"
                      f"• Alarm sistemi ✅\n"
                      f"• **Otomatik haberler ✅**\n\n"
                      f"📰 **Haber Sistemi:**\n"
                      f"• Kanal: @{news_stats['channel']} ✅\n"
                      f"• Aktif kullanıcı: {news_stats['active_users']} kişi\n"
                      f"• Durum: {'🟢 Aktif' if news_stats['system_running'] else '🔴 Pasif'}\n\n"
+                     f"⚖️ **Binance Ağırlık:** {rate_stats['used_weight']}/{rate_stats['weight_limit']} "
+                     f"(%{rate_stats['headroom_pct']:.0f} boş)\n"
+                     f"🛫 **Birleştirilen istek:** {flight_stats['coalesced']}/{flight_stats['calls']} "
+                     f"(%{flight_stats['saved_pct']:.0f} tasarruf)\n\n"
                      f"🎯 **Test komutları:**\n"
                      f"• /fiyat btc\n"
                      f"• /analiz eth\n"
@@ -202,12 +227,10 @@ def fear_greed_index(message):
     register_user_for_news(message.from_user.id)
     
     try:
-        import requests
-        
         bot.send_message(message.chat.id, "📊 Fear & Greed Index yükleniyor...")
         
         url = "https://api.alternative.me/fng/"
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -376,6 +399,14 @@ def cleanup_on_exit():
     """Çıkışta temizlik yap"""
     print("🔄 Bot kapatılıyor...")
     stop_news_system()
+    stop_alarm_checker()
+    stop_binance_stream()
+    save_live_indicators()
+    stop_ticker_snapshot()
+    stop_coin_list()
+    stop_market_scanner()
+    stop_symbols_refresh()
+    close_http_session()
     print("👋 Bot temiz şekilde kapatıldı!")
 
 def main():
@@ -395,6 +426,20 @@ def main():
     else:
         print("⚠️ Binance yüklemede sorun var, temel coinler kullanılacak")
     
+    # 🦎 COINGECKO COIN KATALOĞU (diskten, eskiyse indirilir)
+    start_coin_list()
+    
+    # 📋 TOPLU TICKER TABLOSU (fiyat, alarm ve movers sorguları için)
+    start_ticker_snapshot()
+    
+    # 🔭 PİYASA TARAYICI (tablolar arka planda hazırlanır)
+    start_market_scanner()
+    
+    # 📡 BINANCE AKIŞ MODU (config'de açıksa) - canlı indikatörler kaldığı yerden devam eder
+    load_live_indicators()
+    if start_binance_stream():
+        print("✅ Binance canlı akış modu aktif!")
+    
     # 🔥 HABER SİSTEMİNİ BAŞLAT
     print("📰 Otomatik haber sistemi başlatılıyor...")
     news_started = start_news_system()
@@ -404,6 +449,10 @@ def main():
     else:
         print("⚠️ Haber sistemi başlatılamadı, bot yine de çalışacak")
     
+    # ⏰ ALARM KONTROLÜNÜ BAŞLAT
+    print("⏰ Alarm kontrol sistemi başlatılıyor...")
+    start_alarm_checker(bot)
+    
     # OpenAI kontrolü
     ai_status = "✅ Aktif" if OPENAI_API_KEY and OPENAI_API_KEY != "BURAYA_OPENAI_KEYINI_YAZ" else "❌ API key gerekli"
     
@@ -415,8 +464,11 @@ def main():
     print("• Fiyat sorgulama (/fiyat)")
     print("• Top 10 listesi (/top10)")
     print("• Trend coinler (/trending)")
+    print("• Yükselen/düşenler (/movers)")
     print("• Teknik analiz (/analiz)")
     print("• Likidite haritası (/likidite)")
+    print("• Piyasa tarayıcı (/tara)")
+    print("• Sinyal backtest (/backtest)")
     print("• Fear & Greed Index (/korku)")
     print("• Fiyat alarmları (/alarm)")
     print("• Alarm yönetimi (/alarmlist, /alarmstop)")
@@ -431,6 +483,8 @@ def main():
     print("• /analiz eth")
     print("• /likidite sol")
     print("• /alarm doge")
+    print("• /tara rsi<30 1h")
+    print("• /backtest btc 1h")
     print("• /top10")
     print("• /korku")
     print("• /haberdurum (haber sistemi test)")
@@ -6,62 +6,10 @@ Gelişmiş teknik indikatörler ve çoklu timeframe analizi
 import pandas as pd
 import numpy as np
 from config import *
-
-def calculate_rsi(prices, window=14):
-    """RSI (Relative Strength Index) hesapla"""
-    try:
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    except Exception as e:
-        print(f"RSI hesaplama hatası: {e}")
-        return pd.Series(index=prices.index, dtype=float)
-
-def calculate_macd(prices, fast=12, slow=26, signal=9):
-    """MACD (Moving Average Convergence Divergence) hesapla"""
-    try:
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
-        
-        return {
-            'macd': macd_line,
-            'signal': signal_line,
-            'histogram': histogram
-        }
-    except Exception as e:
-        print(f"MACD hesaplama hatası: {e}")
-        return {
-            'macd': pd.Series(index=prices.index, dtype=float),
-            'signal': pd.Series(index=prices.index, dtype=float),
-            'histogram': pd.Series(index=prices.index, dtype=float)
-        }
-
-def calculate_bollinger_bands(prices, window=20, num_std=2):
-    """Bollinger Bands hesapla"""
-    try:
-        sma = prices.rolling(window=window).mean()
-        std = prices.rolling(window=window).std()
-        upper_band = sma + (std * num_std)
-        lower_band = sma - (std * num_std)
-        
-        return {
-            'upper': upper_band,
-            'middle': sma,
-            'lower': lower_band
-        }
-    except Exception as e:
-        print(f"Bollinger Bands hesaplama hatası: {e}")
-        return {
-            'upper': pd.Series(index=prices.index, dtype=float),
-            'middle': pd.Series(index=prices.index, dtype=float),
-            'lower': pd.Series(index=prices.index, dtype=float)
-        }
+from utils.indicators import get_indicators, get_indicator
+# RSI/MACD/BB tek kaynaktan (eski içe aktarmalar bozulmasın diye burada da erişilebilir)
+from utils.technical_analysis import calculate_rsi, calculate_macd, calculate_bollinger_bands
+from utils.technical_analysis import find_support_levels, find_resistance_levels
 
 # =============================================================================
 # YENİ GELİŞMİŞ İNDİKATÖRLER
@@ -70,16 +18,7 @@ def calculate_bollinger_bands(prices, window=20, num_std=2):
 def calculate_stochastic(df, k_period=14, d_period=3):
     """Stochastic Oscillator hesapla"""
     try:
-        high_max = df['high'].rolling(window=k_period).max()
-        low_min = df['low'].rolling(window=k_period).min()
-        
-        k_percent = ((df['close'] - low_min) / (high_max - low_min)) * 100
-        d_percent = k_percent.rolling(window=d_period).mean()
-        
-        return {
-            'k_percent': k_percent,
-            'd_percent': d_percent
-        }
+        return get_indicator(df, f'stoch_{k_period}_{d_period}')
     except Exception as e:
         print(f"Stochastic hesaplama hatası: {e}")
         return {
@@ -90,23 +29,7 @@ def calculate_stochastic(df, k_period=14, d_period=3):
 def calculate_fibonacci_levels(df, lookback=50):
     """Fibonacci Retracement Levels hesapla"""
     try:
-        recent_data = df.tail(lookback)
-        high_price = recent_data['high'].max()
-        low_price = recent_data['low'].min()
-        
-        diff = high_price - low_price
-        
-        fib_levels = {
-            '0%': high_price,
-            '23.6%': high_price - (diff * 0.236),
-            '38.2%': high_price - (diff * 0.382),
-            '50%': high_price - (diff * 0.5),
-            '61.8%': high_price - (diff * 0.618),
-            '78.6%': high_price - (diff * 0.786),
-            '100%': low_price
-        }
-        
-        return fib_levels
+        return get_indicator(df, f'fib_{lookback}')
     except Exception as e:
         print(f"Fibonacci hesaplama hatası: {e}")
         return {}
@@ -114,34 +37,7 @@ def calculate_fibonacci_levels(df, lookback=50):
 def calculate_ichimoku(df):
     """Ichimoku Cloud hesapla"""
     try:
-        # Conversion Line (Tenkan-sen)
-        high_9 = df['high'].rolling(window=9).max()
-        low_9 = df['low'].rolling(window=9).min()
-        conversion_line = (high_9 + low_9) / 2
-        
-        # Base Line (Kijun-sen)
-        high_26 = df['high'].rolling(window=26).max()
-        low_26 = df['low'].rolling(window=26).min()
-        base_line = (high_26 + low_26) / 2
-        
-        # Leading Span A (Senkou Span A)
-        leading_span_a = ((conversion_line + base_line) / 2).shift(26)
-        
-        # Leading Span B (Senkou Span B)
-        high_52 = df['high'].rolling(window=52).max()
-        low_52 = df['low'].rolling(window=52).min()
-        leading_span_b = ((high_52 + low_52) / 2).shift(26)
-        
-        # Lagging Span (Chikou Span)
-        lagging_span = df['close'].shift(-26)
-        
-        return {
-            'conversion_line': conversion_line,
-            'base_line': base_line,
-            'leading_span_a': leading_span_a,
-            'leading_span_b': leading_span_b,
-            'lagging_span': lagging_span
-        }
+        return get_indicator(df, 'ichimoku')
     except Exception as e:
         print(f"Ichimoku hesaplama hatası: {e}")
         return {}
@@ -153,22 +49,19 @@ def calculate_ichimoku(df):
 def analyze_multiple_timeframes(symbol, timeframes=['1h', '4h', '1d', '1w']):
     """Çoklu timeframe analizi"""
     try:
-        from utils.binance_api import get_binance_ohlc
+        from utils.kline_resample import get_multi_timeframe_ohlc
         
         timeframe_results = {}
         
+        # Limit'i timeframe'e göre ayarla
+        limit_map = {'1h': 168, '4h': 168, '1d': 100, '1w': 52}  # 1 hafta, 4 hafta, 100 gün, 1 yıl
+        limits = {tf: limit_map.get(tf, 100) for tf in timeframes}
+        
+        # Tüm timeframe'ler tek 1h serisinden yerelde üretilir (uzun pencere disk arşivinden)
+        frames = get_multi_timeframe_ohlc(symbol, limits)
+        
         for tf in timeframes:
-            # Limit'i timeframe'e göre ayarla
-            if tf == '1h':
-                limit = 168  # 1 hafta
-            elif tf == '4h':
-                limit = 168  # 4 hafta
-            elif tf == '1d':
-                limit = 100  # 100 gün
-            else:  # 1w
-                limit = 52   # 1 yıl
-            
-            df = get_binance_ohlc(symbol, interval=tf, limit=limit)
+            df = frames.get(tf)
             if df is not None and not df.empty:
                 analysis = perform_single_timeframe_analysis(df)
                 timeframe_results[tf] = analysis
@@ -183,15 +76,16 @@ def perform_single_timeframe_analysis(df):
     try:
         current_price = df['close'].iloc[-1]
         
-        # Temel indikatörler
-        rsi = calculate_rsi(df['close']).iloc[-1]
-        macd_data = calculate_macd(df['close'])
-        bb_data = calculate_bollinger_bands(df['close'])
-        stoch_data = calculate_stochastic(df)
+        # Temel indikatörler - tek paketten
+        indicators = get_indicators(df, ('rsi', 'macd', 'bb', 'stochastic', 'sma_20', 'sma_50'))
+        rsi = indicators['rsi'].iloc[-1]
+        macd_data = indicators['macd']
+        bb_data = indicators['bb']
+        stoch_data = indicators['stochastic']
         
         # Trend analizi
-        sma_20 = df['close'].rolling(20).mean().iloc[-1]
-        sma_50 = df['close'].rolling(50).mean().iloc[-1]
+        sma_20 = indicators['sma_20'].iloc[-1]
+        sma_50 = indicators['sma_50'].iloc[-1]
         
         # Sinyal gücü hesaplama
         signals = calculate_signal_strength(df, rsi, macd_data, bb_data, stoch_data)
@@ -383,34 +277,6 @@ def calculate_entry_exit_points(df, current_price, bb_data, signals):
         print(f"Entry/Exit hesaplama hatası: {e}")
         return {}
 
-def find_support_levels(df, current_price, window=5):
-    """Destek seviyelerini bul"""
-    try:
-        lows = []
-        for i in range(window, len(df) - window):
-            if all(df['low'].iloc[i] <= df['low'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['low'].iloc[i] <= df['low'].iloc[i+j] for j in range(1, window+1)):
-                if df['low'].iloc[i] < current_price:  # Sadece mevcut fiyatın altındaki destekler
-                    lows.append(df['low'].iloc[i])
-        
-        return sorted(lows, reverse=True)[:3]  # En yakın 3 destek
-    except:
-        return []
-
-def find_resistance_levels(df, current_price, window=5):
-    """Direnç seviyelerini bul"""
-    try:
-        highs = []
-        for i in range(window, len(df) - window):
-            if all(df['high'].iloc[i] >= df['high'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['high'].iloc[i] >= df['high'].iloc[i+j] for j in range(1, window+1)):
-                if df['high'].iloc[i] > current_price:  # Sadece mevcut fiyatın üstündeki dirençler
-                    highs.append(df['high'].iloc[i])
-        
-        return sorted(highs)[:3]  # En yakın 3 direnç
-    except:
-        return []
-
 # =============================================================================
 # YARDIMCI FONKSİYONLAR
 # =============================================================================
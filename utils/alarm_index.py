@@ -0,0 +1,185 @@
+"""
+Alarm Index Utils
+Coin bazında sıralı hedef fiyat indeksi - tetiklenen alarmları bisect ile bul
+"""
+
+import bisect
+import threading
+import time
+import random
+import numpy as np
+from config import *
+
+# Global indeks
+# {coin_id: {'above': [hedefler], 'above_users': [user_id], 'below': [hedefler], 'below_users': [user_id]}}
+# 'above' alarmları fiyat hedefin üstüne çıkınca, 'below' alarmları altına inince tetiklenir.
+# Her iki liste de hedef fiyata göre artan sırada tutulur.
+ALARM_INDEX = {}
+index_lock = threading.RLock()
+
+def new_coin_entry():
+    """Boş coin girişi oluştur"""
+    return {'above': [], 'above_users': [], 'below': [], 'below_users': []}
+
+def index_add_alarm(coin_id, user_id, target_price, direction):
+    """İndekse alarm ekle - O(log n) arama + liste ekleme"""
+    side = 'below' if direction == 'below' else 'above'
+    with index_lock:
+        entry = ALARM_INDEX.get(coin_id)
+        if entry is None:
+            entry = ALARM_INDEX[coin_id] = new_coin_entry()
+
+        targets = entry[side]
+        users = entry[f'{side}_users']
+        pos = bisect.bisect_right(targets, target_price)
+        targets.insert(pos, target_price)
+        users.insert(pos, user_id)
+
+def index_remove_alarm(coin_id, user_id, target_price, direction):
+    """İndeksten alarm kaldır - bulunamazsa False döner"""
+    side = 'below' if direction == 'below' else 'above'
+    with index_lock:
+        entry = ALARM_INDEX.get(coin_id)
+        if entry is None:
+            return False
+
+        targets = entry[side]
+        users = entry[f'{side}_users']
+
+        # Aynı hedefe sahip alarmlar arasında kullanıcıyı bul
+        pos = bisect.bisect_left(targets, target_price)
+        while pos < len(targets) and targets[pos] == target_price:
+            if users[pos] == user_id:
+                del targets[pos]
+                del users[pos]
+                if not entry['above'] and not entry['below']:
+                    del ALARM_INDEX[coin_id]
+                return True
+            pos += 1
+
+        return False
+
+def index_pop_triggered(coin_id, high_price, low_price=None):
+    """
+    Fiyat aralığında geçilen alarmları indeksten çıkar ve döndür
+    high_price: 'above' hedefleri için (hedef <= high_price olanlar tetiklenir)
+    low_price: 'below' hedefleri için (hedef >= low_price olanlar tetiklenir)
+    """
+    if low_price is None:
+        low_price = high_price
+
+    triggered = []
+    with index_lock:
+        entry = ALARM_INDEX.get(coin_id)
+        if entry is None:
+            return triggered
+
+        # Yukarı alarmlar: sıralı listenin başı
+        cut = bisect.bisect_right(entry['above'], high_price)
+        if cut:
+            for target, user_id in zip(entry['above'][:cut], entry['above_users'][:cut]):
+                triggered.append((user_id, target, 'above'))
+            del entry['above'][:cut]
+            del entry['above_users'][:cut]
+
+        # Aşağı alarmlar: sıralı listenin sonu
+        cut = bisect.bisect_left(entry['below'], low_price)
+        if cut < len(entry['below']):
+            for target, user_id in zip(entry['below'][cut:], entry['below_users'][cut:]):
+                triggered.append((user_id, target, 'below'))
+            del entry['below'][cut:]
+            del entry['below_users'][cut:]
+
+        if not entry['above'] and not entry['below']:
+            del ALARM_INDEX[coin_id]
+
+    return triggered
+
+def index_bulk_load(coin_ids, coin_idx, user_ids, targets, directions):
+    """
+    İndeksi kolon dizilerinden toplu kur (yeniden başlatmada hızlı yükleme)
+    coin_ids: coin ID listesi, coin_idx: her alarmın coin_ids içindeki sırası
+    directions: 0 = 'above', 1 = 'below'
+    Tek tek insert yerine tek bir lexsort ile tüm listeler sıralı oluşur
+    """
+    order = np.lexsort((targets, directions, coin_idx))
+    sorted_keys = coin_idx[order].astype(np.int64) * 2 + directions[order]
+    sorted_targets = targets[order].tolist()
+    sorted_users = user_ids[order].tolist()
+    boundaries = [0] + (np.flatnonzero(np.diff(sorted_keys)) + 1).tolist() + [len(order)]
+
+    with index_lock:
+        ALARM_INDEX.clear()
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            if start == end:
+                continue
+            key = int(sorted_keys[start])
+            coin_id = coin_ids[key // 2]
+            side = 'below' if key % 2 else 'above'
+            entry = ALARM_INDEX.get(coin_id)
+            if entry is None:
+                entry = ALARM_INDEX[coin_id] = new_coin_entry()
+            entry[side] = sorted_targets[start:end]
+            entry[f'{side}_users'] = sorted_users[start:end]
+
+def index_coins():
+    """İndekste alarmı olan coin ID'leri"""
+    with index_lock:
+        return list(ALARM_INDEX.keys())
+
+def index_clear():
+    """İndeksi tamamen temizle"""
+    with index_lock:
+        ALARM_INDEX.clear()
+
+def get_index_size():
+    """İndeksteki toplam alarm sayısı"""
+    with index_lock:
+        return sum(len(entry['above']) + len(entry['below']) for entry in ALARM_INDEX.values())
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark_alarm_index(num_alarms=1_000_000, num_coins=500, ticks=20):
+    """1M alarm / 500 coin ile tick başına değerlendirme süresini ölç"""
+    print(f"🧪 Alarm indeksi benchmark: {num_alarms:,} alarm, {num_coins} coin")
+    index_clear()
+
+    rng = random.Random(42)
+    base_prices = {f"coin-{i}": rng.uniform(0.001, 50000) for i in range(num_coins)}
+    coin_ids = list(base_prices.keys())
+
+    start = time.perf_counter()
+    for user_id in range(num_alarms):
+        coin_id = coin_ids[user_id % num_coins]
+        price = base_prices[coin_id]
+        if user_id % 2:
+            index_add_alarm(coin_id, user_id, price * rng.uniform(1.001, 1.5), 'above')
+        else:
+            index_add_alarm(coin_id, user_id, price * rng.uniform(0.5, 0.999), 'below')
+    build_time = time.perf_counter() - start
+    print(f"📦 İndeks kuruldu: {build_time:.2f}s ({get_index_size():,} alarm)")
+
+    tick_times = []
+    fired = 0
+    for _ in range(ticks):
+        # Her tick'te fiyatlar küçük oynasın
+        prices = {coin_id: price * rng.uniform(0.995, 1.005) for coin_id, price in base_prices.items()}
+
+        start = time.perf_counter()
+        for coin_id, price in prices.items():
+            fired += len(index_pop_triggered(coin_id, price))
+        tick_times.append(time.perf_counter() - start)
+
+    tick_times.sort()
+    print(f"⚡ Tick süresi: medyan {tick_times[len(tick_times) // 2] * 1000:.3f} ms, "
+          f"en kötü {tick_times[-1] * 1000:.3f} ms ({fired} alarm tetiklendi)")
+    index_clear()
+    return tick_times
+
+if DEBUG_MODE:
+    print("🗂️ Alarm index utils yüklendi!")
+
+if __name__ == "__main__":
+    benchmark_alarm_index()
@@ -0,0 +1,221 @@
+"""
+Alarm Store Utils
+Kalıcı alarm deposu - kolon bazlı NumPy snapshot + append-only journal
+Komut tarafı sadece kuyruğa yazar; diske yazma ve sıkıştırma arka plan thread'inde
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from config import *
+
+# Global değişkenler
+write_queue = queue.Queue()
+writer_thread = None
+store_running = False
+store_stats = {'writes': 0, 'compactions': 0, 'journal_entries': 0, 'last_load_seconds': None}
+
+STOP_SIGNAL = object()
+DIRECTIONS = ('above', 'below')  # Snapshot'ta 0/1 olarak saklanır
+
+def load_alarm_store():
+    """
+    Snapshot ve journal'ı diskten oku
+    Dönüş: (snapshot, journal) - snapshot kolon dizileri içeren dict ya da None
+    """
+    start = time.perf_counter()
+    snapshot = None
+    journal = []
+
+    try:
+        if os.path.exists(ALARM_SNAPSHOT_FILE):
+            with np.load(ALARM_SNAPSHOT_FILE) as data:
+                snapshot = {
+                    'user_ids': data['user_ids'],
+                    'coin_idx': data['coin_idx'],
+                    'targets': data['targets'],
+                    'directions': data['directions'],
+                    'coin_ids': data['coin_ids'].tolist(),
+                    'coins': data['coins'].tolist()
+                }
+    except Exception as e:
+        print(f"❌ Alarm snapshot okuma hatası: {e}")
+
+    try:
+        if os.path.exists(ALARM_JOURNAL_FILE):
+            with open(ALARM_JOURNAL_FILE, 'r') as f:
+                for line in f:
+                    try:
+                        journal.append(json.loads(line))
+                    except ValueError:
+                        break  # Çökme sırasında yarım kalmış son satır
+    except Exception as e:
+        print(f"❌ Alarm journal okuma hatası: {e}")
+
+    store_stats['journal_entries'] = len(journal)
+    store_stats['last_load_seconds'] = time.perf_counter() - start
+    return snapshot, journal
+
+def build_snapshot(alarms, coin_ids=(), coins=()):
+    """
+    [(user_id, coin_id, coin, target_price, direction)] listesinden kolon dizileri oluştur
+    coin_ids/coins verilirse coin tablosu bunlarla başlar (mevcut snapshot ile birleştirmek için)
+    """
+    coin_table = {key: i for i, key in enumerate(zip(coin_ids, coins))}
+    coin_idx = []
+    user_ids = []
+    targets = []
+    directions = []
+
+    for user_id, coin_id, coin, target_price, direction in alarms:
+        key = (coin_id, coin)
+        idx = coin_table.get(key)
+        if idx is None:
+            idx = coin_table[key] = len(coin_table)
+        coin_idx.append(idx)
+        user_ids.append(user_id)
+        targets.append(target_price)
+        directions.append(1 if direction == 'below' else 0)
+
+    return {
+        'user_ids': np.array(user_ids, dtype=np.int64),
+        'coin_idx': np.array(coin_idx, dtype=np.int32),
+        'targets': np.array(targets, dtype=np.float64),
+        'directions': np.array(directions, dtype=np.int8),
+        'coin_ids': [coin_id for coin_id, _ in coin_table],
+        'coins': [coin for _, coin in coin_table]
+    }
+
+def write_snapshot(snapshot):
+    """Snapshot'ı atomik olarak diske yaz (geçici dosya + fsync + rename)"""
+    tmp_file = ALARM_SNAPSHOT_FILE + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        np.savez(f,
+                 user_ids=snapshot['user_ids'],
+                 coin_idx=snapshot['coin_idx'],
+                 targets=snapshot['targets'],
+                 directions=snapshot['directions'],
+                 coin_ids=np.array(snapshot['coin_ids'], dtype=str),
+                 coins=np.array(snapshot['coins'], dtype=str))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, ALARM_SNAPSHOT_FILE)
+
+def store_save_alarm(user_id, alarm):
+    """Alarmı kalıcı depoya yaz (asenkron)"""
+    write_queue.put({'op': 'save', 'user_id': user_id, 'coin_id': alarm['coin_id'],
+                     'coin': alarm['coin'], 'target_price': alarm['target_price'],
+                     'direction': alarm['direction'], 'created_at': alarm.get('created_at', 0)})
+
+def store_delete_alarm(user_id, coin_id):
+    """Alarmı kalıcı depodan sil (asenkron)"""
+    write_queue.put({'op': 'delete', 'user_id': user_id, 'coin_id': coin_id})
+
+def compact_alarm_store(journal_file, snapshot_fn, lock):
+    """
+    Güncel durumu snapshot'a yaz ve journal'ı sıfırla
+    Kilit altında alınan durum, o ana kadar kuyruğa düşen tüm yazmaları zaten içerir
+    """
+    with lock:
+        snapshot = snapshot_fn()
+        while True:
+            try:
+                item = write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is STOP_SIGNAL:
+                write_queue.put(STOP_SIGNAL)
+                break
+
+    write_snapshot(snapshot)
+    journal_file.seek(0)
+    journal_file.truncate()
+    store_stats['journal_entries'] = 0
+    store_stats['compactions'] += 1
+    print(f"💾 Alarm deposu sıkıştırıldı ({len(snapshot['user_ids'])} alarm)")
+
+def alarm_writer_loop(snapshot_fn, lock):
+    """Kuyruktaki yazmaları journal'a ekle, gerektiğinde sıkıştır"""
+    journal_file = open(ALARM_JOURNAL_FILE, 'a')
+
+    while True:
+        item = write_queue.get()
+        stop = item is STOP_SIGNAL
+        batch = [] if stop else [item]
+
+        # Kuyrukta bekleyen her şeyi tek yazmada topla
+        while not stop:
+            try:
+                item = write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is STOP_SIGNAL:
+                stop = True
+            else:
+                batch.append(item)
+
+        try:
+            if batch:
+                journal_file.write(''.join(json.dumps(entry) + '\n' for entry in batch))
+                # Sadece işletim sistemine bırak - fsync yok
+                journal_file.flush()
+                store_stats['writes'] += len(batch)
+                store_stats['journal_entries'] += len(batch)
+
+            if store_stats['journal_entries'] >= ALARM_JOURNAL_COMPACT_EVERY:
+                compact_alarm_store(journal_file, snapshot_fn, lock)
+        except Exception as e:
+            print(f"❌ Alarm deposu yazma hatası: {e}")
+
+        if stop:
+            break
+
+    try:
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+    except Exception as e:
+        print(f"❌ Alarm journal kapatma hatası: {e}")
+    journal_file.close()
+
+def start_alarm_store(snapshot_fn, lock):
+    """
+    Alarm deposu yazma thread'ini başlat
+    snapshot_fn: kilit altında çağrılır, build_snapshot() çıktısı döndürmeli
+    """
+    global writer_thread, store_running
+
+    if store_running:
+        return False
+
+    store_running = True
+    writer_thread = threading.Thread(target=alarm_writer_loop, args=(snapshot_fn, lock), daemon=True)
+    writer_thread.start()
+    return True
+
+def stop_alarm_store():
+    """Bekleyen yazmaları diske aktar ve thread'i durdur"""
+    global store_running
+
+    if not store_running:
+        return
+
+    write_queue.put(STOP_SIGNAL)
+    writer_thread.join(timeout=10)
+    store_running = False
+    print("💾 Alarm deposu kapatıldı")
+
+def get_store_stats():
+    """Depo istatistikleri"""
+    return {
+        'pending_writes': write_queue.qsize(),
+        'writes': store_stats['writes'],
+        'journal_entries': store_stats['journal_entries'],
+        'compactions': store_stats['compactions'],
+        'last_load_seconds': store_stats['last_load_seconds']
+    }
+
+if DEBUG_MODE:
+    print("💾 Alarm store utils yüklendi!")
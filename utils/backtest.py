@@ -0,0 +1,284 @@
+"""
+Backtest Utils
+Botun sinyal kurallarını (generate_trading_signals, calculate_basic_signals, calculate_signal_strength)
+uzun bir geçmişin her mumuna vektörel olarak uygular - sinyal tipi başına isabet oranı,
+ortalama ileri getiri ve sinyali takip eden stratejinin maksimum düşüşü (drawdown).
+Veri diskteki kline arşivinden kopyasız okunur; eksik kısım bir kez indirilip arşive yazılır.
+"""
+
+import time
+import numpy as np
+from config import *
+from utils.binance_rate import PRIORITY_INTERACTIVE
+from utils.kline_cache import INTERVAL_MS
+from utils.kline_archive import read_archive
+from utils.kline_backfill import backfill_klines, archive_complete
+from utils.kline_resample import can_resample, resample_ohlc_arrays
+from utils.binance_api import decode_klines
+from utils.indicators import get_indicators, shift
+
+# Sinyal tipleri - {ad: (yön, etiket)}; ilk dört al/sat çifti tekil kurallar, son iki çift /analiz'in toplu kararları
+BACKTEST_SIGNALS = {
+    'rsi_oversold': ('BUY', "RSI aşırı satım"),
+    'rsi_overbought': ('SELL', "RSI aşırı alım"),
+    'macd_cross_up': ('BUY', "MACD pozitif kesişim"),
+    'macd_cross_down': ('SELL', "MACD negatif kesişim"),
+    'below_bb': ('BUY', "Bollinger alt band altında"),
+    'above_bb': ('SELL', "Bollinger üst band üzerinde"),
+    'stoch_oversold': ('BUY', "Stochastic aşırı satım"),
+    'stoch_overbought': ('SELL', "Stochastic aşırı alım"),
+    'basic_buy': ('BUY', "Temel skor AL"),
+    'basic_sell': ('SELL', "Temel skor SAT"),
+    'strength_buy': ('BUY', "Sinyal gücü BUY"),
+    'strength_sell': ('SELL', "Sinyal gücü SELL")
+}
+
+# =============================================================================
+# SİNYAL MASKELERİ
+# =============================================================================
+
+def signal_masks(arrays):
+    """
+    Her mum için sinyal maskeleri - skaler fonksiyonların son mum için verdiği kararın
+    tüm seri boyunca vektörel karşılığı. Dönüş: ({ad: bool dizi}, geçerli mum maskesi)
+    """
+    indicators = get_indicators(arrays, ('rsi', 'macd', 'bb', 'stochastic', 'sma_20'))
+    close = np.asarray(arrays['close'], dtype=np.float64)
+    rsi = indicators['rsi']
+    macd_line = indicators['macd']['macd']
+    signal_line = indicators['macd']['signal']
+    macd_prev = shift(macd_line, 1)
+    signal_prev = shift(signal_line, 1)
+    upper, middle, lower = indicators['bb']['upper'], indicators['bb']['middle'], indicators['bb']['lower']
+    k_percent, d_percent = indicators['stochastic']['k_percent'], indicators['stochastic']['d_percent']
+    sma_20 = indicators['sma_20']
+
+    # Isınma süresi (NaN indikatörler) hariç tutulur
+    valid = np.isfinite(rsi) & np.isfinite(signal_prev) & np.isfinite(upper) & np.isfinite(d_percent)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi_buy = rsi < 30
+        rsi_sell = rsi > 70
+        cross_up = (macd_line > signal_line) & (macd_prev <= signal_prev)
+        cross_down = (macd_line < signal_line) & (macd_prev >= signal_prev)
+        touch_lower = close <= lower
+        touch_upper = (close >= upper) & ~touch_lower
+        stoch_buy = (k_percent < 20) & (d_percent < 20)
+        stoch_sell = (k_percent > 80) & (d_percent > 80) & ~stoch_buy
+
+        # calculate_basic_signals + calculate_basic_score
+        signal_score = (8 * rsi_buy - 8 * rsi_sell + np.where(macd_line > signal_line, 6, -6)
+                        + 5 * touch_lower - 5 * touch_upper)
+        trend_score = np.where(close > sma_20, 2, -2)
+        rsi_score = 3 * rsi_buy - 3 * rsi_sell
+        basic_score = np.clip((signal_score + trend_score + rsi_score + 15) / 3, 0, 10)
+
+        # calculate_signal_strength -> calculate_entry_exit_points kararı (güç toplamları)
+        macd_strength = np.maximum(5, np.round(np.minimum(10, np.abs(macd_line - signal_line) * 1000)))
+        buy_strength = (np.where(rsi_buy, np.round(np.minimum(10, (30 - rsi) / 3)), 0)
+                        + np.where(cross_up, macd_strength, 0)
+                        + np.where(touch_lower, np.maximum(4, np.round(np.minimum(
+                            10, (middle - close) / middle * 100 * 2))), 0)
+                        + np.where(stoch_buy, np.maximum(3, np.round(np.minimum(
+                            10, (20 - np.minimum(k_percent, d_percent)) / 2))), 0))
+        sell_strength = (np.where(rsi_sell, np.round(np.minimum(10, (rsi - 70) / 3)), 0)
+                         + np.where(cross_down, macd_strength, 0)
+                         + np.where(touch_upper, np.maximum(4, np.round(np.minimum(
+                             10, (close - middle) / middle * 100 * 2))), 0)
+                         + np.where(stoch_sell, np.maximum(3, np.round(np.minimum(
+                             10, (np.minimum(k_percent, d_percent) - 80) / 2))), 0))
+
+        masks = {
+            'rsi_oversold': rsi_buy,
+            'rsi_overbought': rsi_sell,
+            'macd_cross_up': cross_up,
+            'macd_cross_down': cross_down,
+            'below_bb': close < lower,
+            'above_bb': close > upper,
+            'stoch_oversold': stoch_buy,
+            'stoch_overbought': stoch_sell,
+            'basic_buy': basic_score >= 6,   # "AL" / "DİKKATLİ AL"
+            'basic_sell': basic_score < 4,   # "DİKKATLİ SAT" / "SAT"
+            'strength_buy': buy_strength > sell_strength,
+            'strength_sell': sell_strength > buy_strength
+        }
+    return {name: mask & valid for name, mask in masks.items()}, valid
+
+# =============================================================================
+# İSTATİSTİKLER
+# =============================================================================
+
+def forward_returns(close, horizon):
+    """Her mumdan `horizon` mum sonrasına getiri (son `horizon` mum NaN)"""
+    out = np.full(close.shape[0], np.nan)
+    if horizon < close.shape[0]:
+        out[:-horizon] = close[horizon:] / close[:-horizon] - 1
+    return out
+
+def max_drawdown(mask, close, horizon, direction):
+    """
+    Sinyali takip eden stratejinin maksimum düşüşü (%) - her sinyalden sonra `horizon` mum
+    boyunca pozisyonda kalınır (yeni sinyal süreyi uzatır), mum mum getiri bileşik işlenir
+    """
+    count = np.cumsum(mask)
+    held = (count - np.concatenate((np.zeros(min(horizon, count.shape[0])), count[:-horizon]))) > 0
+    bar_returns = close[1:] / close[:-1] - 1
+    equity = np.cumprod(1 + direction * bar_returns * held[:-1])
+    if equity.size == 0:
+        return 0.0
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0))
+    return float(np.max(1 - equity / peak) * 100)
+
+def run_backtest(arrays, horizon):
+    """
+    Dizilerdeki (decode_klines / arşiv kolonları) tüm mumlara sinyal kurallarını uygula
+    Dönüş: {'bars', 'valid_bars', 'horizon', 'baseline_return', 'signals': {ad: {'type', 'label',
+            'count', 'hit_rate', 'avg_return', 'max_drawdown'}}} - getiriler % ve sinyal yönünde
+    """
+    close = np.asarray(arrays['close'], dtype=np.float64)
+    masks, valid = signal_masks(arrays)
+    forward = forward_returns(close, horizon)
+    measurable = valid & np.isfinite(forward)
+
+    signals = {}
+    for name, (signal_type, label) in BACKTEST_SIGNALS.items():
+        direction = 1 if signal_type == 'BUY' else -1
+        returns = direction * forward[masks[name] & measurable]
+        signals[name] = {
+            'type': signal_type,
+            'label': label,
+            'count': int(returns.size),
+            'hit_rate': float(np.mean(returns > 0) * 100) if returns.size else None,
+            'avg_return': float(np.mean(returns) * 100) if returns.size else None,
+            'max_drawdown': max_drawdown(masks[name], close, horizon, direction)
+        }
+
+    return {
+        'bars': int(close.shape[0]),
+        'valid_bars': int(measurable.sum()),
+        'horizon': horizon,
+        'baseline_return': float(np.mean(forward[measurable]) * 100) if measurable.any() else None,
+        'signals': signals
+    }
+
+# =============================================================================
+# VERİ
+# =============================================================================
+
+def load_backtest_arrays(symbol, interval, days=BACKTEST_DAYS, priority=PRIORITY_INTERACTIVE):
+    """
+    Son `days` günün kapanmış mumları - arşivden kopyasız okunur, eksikse bir kez backfill edilir
+    Eksiklik listeleme başlangıcı ve borsayla doğrulanmış aralıklara göre ölçülür (yeni listelenen ya da
+    bakım boşluklu pariteler her seferinde yeniden indirilmez)
+    Taban seriden (RESAMPLE_BASE_INTERVAL) türetilebilen interval'lar yerelde üretilir
+    Dönüş: {'open_time', 'open', 'high', 'low', 'close', 'volume', ...} ya da None
+    """
+    base = RESAMPLE_BASE_INTERVAL if can_resample(RESAMPLE_BASE_INTERVAL, interval) else interval
+    step = INTERVAL_MS.get(base)
+    if step is None:
+        return None
+
+    now_ms = int(time.time() * 1000)
+    last_closed = now_ms - now_ms % step - step
+    start_time = now_ms - days * 86_400_000
+    start_time -= start_time % step
+
+    columns = read_archive(symbol, base, start_time, last_closed)
+    if columns is None or not archive_complete(symbol, base, start_time, last_closed + step - 1):
+        rows = backfill_klines(symbol, base, start_time, last_closed + step - 1, priority=priority, store=False)
+        columns = read_archive(symbol, base, start_time, last_closed)
+        if columns is None and rows:
+            columns = decode_klines(rows)  # Arşiv kapalıysa indirilen satırlardan
+    if columns is None or len(columns['open_time']) == 0:
+        return None
+
+    if base != interval:
+        return resample_ohlc_arrays(columns, base, interval)
+    return columns
+
+def backtest_symbol(symbol, interval="1h", days=BACKTEST_DAYS, priority=PRIORITY_INTERACTIVE):
+    """Sembol için veri yükle ve backtest çalıştır - sonuç dict'ine 'start', 'end', süreler eklenir"""
+    try:
+        started = time.perf_counter()
+        arrays = load_backtest_arrays(symbol, interval, days, priority)
+        if arrays is None or len(arrays['close']) < BACKTEST_MIN_BARS:
+            return None
+        loaded = time.perf_counter()
+        result = run_backtest(arrays, BACKTEST_HORIZONS.get(interval, 10))
+        result.update({
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'start': int(arrays['open_time'][0]),
+            'end': int(arrays['open_time'][-1]),
+            'load_ms': (loaded - started) * 1000,
+            'compute_ms': (time.perf_counter() - loaded) * 1000
+        })
+        return result
+    except Exception as e:
+        print(f"❌ Backtest hatası ({symbol} {interval}): {e}")
+        return None
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark_backtest(years=3, samples=300, seed=11):
+    """
+    Sentetik 1h seride vektörel kuralları skaler fonksiyonlarla (son mum) rastgele mumlarda
+    karşılaştır ve backtest süresini ölç
+    """
+    import pandas as pd
+    from utils.technical_analysis import generate_trading_signals
+    from utils.advanced_technical_analysis import calculate_signal_strength, calculate_entry_exit_points
+    from commands.analysis_commands import calculate_basic_signals, calculate_basic_score
+
+    rng = np.random.default_rng(seed)
+    size = years * 365 * 24
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size)))
+    arrays = {'open_time': np.arange(size, dtype=np.int64) * 3_600_000, 'open': close,
+              'high': close * (1 + rng.random(size) * 0.01), 'low': close * (1 - rng.random(size) * 0.01),
+              'close': close, 'volume': rng.random(size) * 1000}
+
+    start = time.perf_counter()
+    result = run_backtest(arrays, BACKTEST_HORIZONS["1h"])
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"⚡ {size} mum ({years} yıl 1h) backtest: {elapsed_ms:.1f} ms")
+
+    masks, valid = signal_masks(arrays)
+    df = pd.DataFrame({c: arrays[c] for c in ('open', 'high', 'low', 'close', 'volume')})
+    mismatches = 0
+    for bar in rng.choice(np.flatnonzero(valid), size=samples, replace=False):
+        window = df.iloc[:bar + 1]
+        indicators = get_indicators(window, ('rsi', 'macd', 'bb', 'stochastic'))
+        rsi = indicators['rsi'].iloc[-1]
+        price = window['close'].iloc[-1]
+
+        reasons = {s['reason'] for s in generate_trading_signals(window)}
+        expected = {
+            'rsi_oversold': "RSI aşırı satım" in reasons, 'rsi_overbought': "RSI aşırı alım" in reasons,
+            'macd_cross_up': "MACD pozitif kesişim" in reasons, 'macd_cross_down': "MACD negatif kesişim" in reasons,
+            'below_bb': "Bollinger alt band altında" in reasons, 'above_bb': "Bollinger üst band üzerinde" in reasons
+        }
+        basic = calculate_basic_score(calculate_basic_signals(window, rsi, indicators['macd'], indicators['bb']),
+                                      rsi, price, window)
+        expected.update({'basic_buy': basic >= 6, 'basic_sell': basic < 4})
+        strength = calculate_signal_strength(window, rsi, indicators['macd'], indicators['bb'],
+                                             indicators['stochastic'])
+        action = calculate_entry_exit_points(window, price, indicators['bb'], strength)['action']
+        stochastic = {s['type'] for s in strength if s['indicator'] == 'Stochastic'}
+        expected.update({'strength_buy': action == 'BUY', 'strength_sell': action == 'SELL',
+                         'stoch_oversold': 'BUY' in stochastic, 'stoch_overbought': 'SELL' in stochastic})
+        mismatches += sum(bool(masks[name][bar]) != value for name, value in expected.items())
+
+    print(f"{'✅' if mismatches == 0 else '❌'} {samples} rastgele mumda skaler kurallarla fark: {mismatches}")
+    for name, stats in result['signals'].items():
+        if stats['count']:
+            print(f"📊 {stats['label']:<28} {stats['count']:>5} sinyal | isabet %{stats['hit_rate']:.1f} | "
+                  f"ort. %{stats['avg_return']:+.2f} | maks. düşüş %{stats['max_drawdown']:.1f}")
+    return elapsed_ms, mismatches
+
+if DEBUG_MODE:
+    print("🧪 Backtest utils yüklendi!")
+
+if __name__ == "__main__":
+    benchmark_backtest()
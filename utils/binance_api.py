@@ -3,103 +3,264 @@ Binance API Utils
 Binance API ile işlemler ve coin sembolleri
 """
 
-import requests
+import json
+import os
+import threading
+import time
+from functools import partial
+import numpy as np
 import pandas as pd
 from config import *
+from utils.binance_rate import binance_get, klines_weight, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from utils.json_stream import stream_json_items
+from utils.singleflight import singleflight_call
+from utils.kline_cache import get_cached_klines, INTERVAL_MS, KLINES_MAX_LIMIT
+from utils.symbol_index import build_symbol_index, lookup_symbol, suggest_symbols
+from utils.binance_stream import touch_stream_symbol, get_stream_ticker
+from utils.ticker_snapshot import get_snapshot_price, get_snapshot_stats
 
-# Global değişken
+# Global değişken - apply_symbol_table ile tek atamada değiştirilir
 BINANCE_SYMBOLS = {}
+symbols_refresh_thread = None
+symbols_refresh_running = False
 
-def load_all_binance_symbols():
-    """Binance'dan tüm USDT paritelerini yükle"""
-    global BINANCE_SYMBOLS
+# Yaygın coin alias'ları
+SYMBOL_ALIASES = {
+    "bitcoin": "btc", "ethereum": "eth", "solana": "sol",
+    "dogecoin": "doge", "cardano": "ada", "polygon": "matic",
+    "binance": "bnb", "ripple": "xrp", "litecoin": "ltc",
+    "avalanche": "avax", "chainlink": "link", "uniswap": "uni",
+    "shiba": "shib", "optimism": "op", "arbitrum": "arb",
+    "render": "rndr", "polkadot": "dot", "cosmos": "atom"
+}
+
+def download_symbol_table():
+    """/exchangeInfo'dan işlemdeki USDT paritelerini indir - {base_asset: SYMBOL} ya da None"""
     try:
-        print("🔄 Binance'dan coin listesi yükleniyor...")
+        # Birkaç MB'lık cevap akış halinde okunur, sembol başına sadece 3 alan tutulur
         url = f"{BINANCE_BASE_URL}/exchangeInfo"
-        response = requests.get(url, timeout=BINANCE_TIMEOUT)
+        symbols = stream_json_items(url, key='symbols', fields=('symbol', 'status', 'baseAsset'),
+                                    timeout=BINANCE_TIMEOUT,
+                                    get_fn=partial(binance_get, weight=20, priority=PRIORITY_BACKGROUND))
+        if symbols is None:
+            return None
         
-        if response.status_code == 200:
-            data = response.json()
-            for symbol_info in data['symbols']:
-                symbol = symbol_info['symbol']
-                if symbol.endswith('USDT') and symbol_info['status'] == 'TRADING':
-                    base_asset = symbol_info['baseAsset'].lower()
-                    BINANCE_SYMBOLS[base_asset] = symbol
-            
-            print(f"✅ Binance'dan {len(BINANCE_SYMBOLS)} USDT pariti yüklendi!")
-            
-            # Yaygın coin alias'ları ekle
-            aliases = {
-                "bitcoin": "btc", "ethereum": "eth", "solana": "sol",
-                "dogecoin": "doge", "cardano": "ada", "polygon": "matic",
-                "binance": "bnb", "ripple": "xrp", "litecoin": "ltc",
-                "avalanche": "avax", "chainlink": "link", "uniswap": "uni",
-                "shiba": "shib", "optimism": "op", "arbitrum": "arb",
-                "render": "rndr", "polkadot": "dot", "cosmos": "atom"
-            }
-            
-            for alias, symbol in aliases.items():
-                if symbol in BINANCE_SYMBOLS:
-                    BINANCE_SYMBOLS[alias] = BINANCE_SYMBOLS[symbol]
-                    
-            return True
-        else:
-            print(f"❌ Binance API hatası: {response.status_code}")
-            return False
+        table = {}
+        for symbol_info in symbols:
+            symbol = symbol_info['symbol']
+            if symbol.endswith('USDT') and symbol_info['status'] == 'TRADING':
+                table[symbol_info['baseAsset'].lower()] = symbol
+        return table
     except Exception as e:
         print(f"❌ Binance yükleme hatası: {e}")
+        return None
+
+def apply_symbol_table(table):
+    """
+    Sembol tablosunu alias'larla birlikte yeni bir sözlük olarak kur ve BINANCE_SYMBOLS'ü tek atamayla değiştir
+    Okuyan thread'ler eski ya da yeni tabloyu bütün halde görür (yerinde değişiklik yok);
+    bu yüzden diğer modüller sözlüğü import etmez, binance_api.BINANCE_SYMBOLS üzerinden okur
+    Dönüş: (yeni listelenenler, kaldırılanlar)
+    """
+    global BINANCE_SYMBOLS
+    new_symbols = dict(table)
+    for alias, base_asset in SYMBOL_ALIASES.items():
+        if base_asset in table:
+            new_symbols[alias] = table[base_asset]
+    
+    old_pairs = set(BINANCE_SYMBOLS.values())
+    new_pairs = set(table.values())
+    BINANCE_SYMBOLS = new_symbols
+    
+    # Arama indeksini yeniden kur
+    build_symbol_index(new_symbols)
+    return sorted(new_pairs - old_pairs), sorted(old_pairs - new_pairs)
+
+def load_symbol_snapshot():
+    """Diskteki sembol tablosunu yükle - {base_asset: SYMBOL} ya da None"""
+    try:
+        if os.path.exists(BINANCE_SYMBOLS_FILE):
+            with open(BINANCE_SYMBOLS_FILE, 'r') as f:
+                return json.load(f)['symbols']
+    except Exception as e:
+        print(f"❌ Sembol snapshot okuma hatası: {e}")
+    return None
+
+def save_symbol_snapshot(table):
+    """Sembol tablosunu diske yaz (atomik)"""
+    try:
+        tmp_file = BINANCE_SYMBOLS_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'updated': time.time(), 'symbols': table}, f, separators=(',', ':'))
+        os.replace(tmp_file, BINANCE_SYMBOLS_FILE)
+    except Exception as e:
+        print(f"❌ Sembol snapshot kaydetme hatası: {e}")
+
+def refresh_binance_symbols():
+    """Tabloyu Binance'dan yenile, yeni listelenen / kaldırılan pariteleri uygula"""
+    table = download_symbol_table()
+    if not table:
         return False
+    
+    listed, delisted = apply_symbol_table(table)
+    save_symbol_snapshot(table)
+    if listed:
+        print(f"🆕 Yeni listelenen pariteler: {', '.join(listed[:20])}")
+    if delisted:
+        print(f"🗑️ Kaldırılan pariteler: {', '.join(delisted[:20])}")
+    return True
 
-def find_binance_symbol(coin_input):
-    """Coin input'u için Binance sembolü bul"""
-    coin_input = coin_input.lower().strip()
+def symbols_refresh_loop(refresh_now):
+    """Tabloyu periyodik olarak yenile (refresh_now: ilk yenilemeyi beklemeden yap)"""
+    while symbols_refresh_running:
+        if refresh_now:
+            refresh_binance_symbols()
+        refresh_now = True
+        for _ in range(int(BINANCE_SYMBOLS_REFRESH_HOURS * 3600)):
+            if not symbols_refresh_running:
+                return
+            time.sleep(1)
+
+def start_symbols_refresh(refresh_now=True):
+    """Arka plan sembol yenileme thread'ini başlat"""
+    global symbols_refresh_thread, symbols_refresh_running
     
-    # Direkt arama
-    if coin_input in BINANCE_SYMBOLS:
-        return BINANCE_SYMBOLS[coin_input]
+    if symbols_refresh_running:
+        return False
     
-    # Kısmi eşleşme ara
-    for symbol_key, symbol_value in BINANCE_SYMBOLS.items():
-        if coin_input in symbol_key or symbol_key.startswith(coin_input):
-            return symbol_value
+    symbols_refresh_running = True
+    symbols_refresh_thread = threading.Thread(target=symbols_refresh_loop, args=(refresh_now,), daemon=True)
+    symbols_refresh_thread.start()
+    return True
+
+def stop_symbols_refresh():
+    """Arka plan sembol yenilemesini durdur"""
+    global symbols_refresh_running
+    symbols_refresh_running = False
+
+def load_all_binance_symbols():
+    """
+    Tüm USDT paritelerini yükle
+    Diskte snapshot varsa milisaniyeler içinde ondan açılır ve Binance'dan yenileme arka planda yapılır;
+    yoksa (ilk kurulum) /exchangeInfo beklenir
+    """
+    table = load_symbol_snapshot()
+    if table:
+        apply_symbol_table(table)
+        print(f"⚡ {len(table)} USDT pariti diskten yüklendi (arka planda güncellenecek)")
+        start_symbols_refresh()
+        return True
     
-    # USDT ekleyerek dene
-    potential_symbol = f"{coin_input.upper()}USDT"
-    for symbol_value in BINANCE_SYMBOLS.values():
-        if symbol_value == potential_symbol:
-            return potential_symbol
+    print("🔄 Binance'dan coin listesi yükleniyor...")
+    table = download_symbol_table()
+    if not table:
+        return False
     
-    return None
+    apply_symbol_table(table)
+    save_symbol_snapshot(table)
+    print(f"✅ Binance'dan {len(table)} USDT pariti yüklendi!")
+    start_symbols_refresh(refresh_now=False)
+    return True
+
+def find_binance_symbol(coin_input):
+    """Coin input'u için Binance sembolü bul (tam eşleşme, alias, önek - indeks üzerinden)"""
+    return lookup_symbol(coin_input)
+
+def suggest_binance_symbols(coin_input, count=3):
+    """Bulunamayan coin için "bunu mu demek istediniz" önerileri - [(anahtar, SYMBOL)]"""
+    return suggest_symbols(coin_input, count)
+
+def fetch_binance_json(url, weight, priority):
+    """Ağırlık zamanlayıcılı Binance GET - 200 ise JSON, değilse None"""
+    response = binance_get(url, weight=weight, priority=priority)
+    if response is None or response.status_code != 200:
+        return None
+    return response.json()
 
-def get_binance_ohlc(symbol, interval="1d", limit=100):
-    """Binance'dan OHLCV verisi al"""
+def binance_get_json(url, weight=1, priority=PRIORITY_INTERACTIVE):
+    """
+    Binance GET -> JSON; aynı anda gelen özdeş istekler tek istekte birleştirilir
+    Öncelik anahtarın parçası - etkileşimli istek, ağırlık beklerken atılabilen düşük öncelikli
+    bir liderin sonucuna bağlanmaz
+    """
+    source = 'klines' if '/klines?' in url else 'binance'
+    return singleflight_call((source, url, priority), fetch_binance_json, url, weight, priority)
+
+def fetch_binance_klines(symbol, interval="1d", limit=100, start_time=None, end_time=None,
+                         priority=PRIORITY_INTERACTIVE):
+    """Binance /klines ham satırlarını indir (önbelleksiz) - start_time/end_time milisaniye"""
     try:
         url = f"{BINANCE_BASE_URL}/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}"
-        res = requests.get(url, timeout=BINANCE_TIMEOUT)
-        if res.status_code != 200:
+        if start_time is not None:
+            url += f"&startTime={int(start_time)}"
+        if end_time is not None:
+            url += f"&endTime={int(end_time)}"
+        return binance_get_json(url, weight=klines_weight(limit), priority=priority)
+    except Exception as e:
+        print(f"Binance kline hatası: {e}")
+        return None
+
+# Kline satırındaki fiyat/hacim kolonları (REST /klines sırası)
+KLINE_FIELDS = ("open", "high", "low", "close", "volume")
+
+def decode_klines(rows):
+    """
+    Ham kline satırlarını doğrudan bitişik NumPy dizilerine çevir (object DataFrame yok)
+    Dönüş: {'open_time': int64 ms, 'open', 'high', 'low', 'close', 'volume': float64}
+    """
+    arrays = {'open_time': np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))}
+    for column, field in enumerate(KLINE_FIELDS, start=1):
+        arrays[field] = np.array([row[column] for row in rows], dtype=np.float64)
+    return arrays
+
+def klines_to_dataframe(arrays):
+    """Dizilerden mevcut çağıranlar için ince DataFrame görünümü (timestamp index, 5 float kolon)"""
+    index = pd.DatetimeIndex(pd.to_datetime(arrays['open_time'], unit="ms"), name="timestamp")
+    return pd.DataFrame({field: arrays[field] for field in KLINE_FIELDS}, index=index, copy=False)
+
+def get_binance_ohlc_arrays(symbol, interval="1d", limit=100, priority=PRIORITY_INTERACTIVE):
+    """
+    Binance'dan OHLCV verisini NumPy dizileri olarak al (artımlı kline deposu üzerinden)
+    priority: eksik mumlar indirilirken ağırlık zamanlayıcısına bildirilen öncelik
+    Tek istek sınırından (1000) uzun pencereler depoya sığmaz - arşiv + paralel backfill sonucundan döner
+    """
+    try:
+        # Akış modu açıksa mumlar WebSocket ile güncel tutulur
+        touch_stream_symbol(symbol, interval)
+        step = INTERVAL_MS.get(interval)
+        if step and limit > KLINES_MAX_LIMIT:
+            from utils.kline_backfill import backfill_klines
+            now_ms = int(time.time() * 1000)
+            rows = backfill_klines(symbol, interval, now_ms - (limit - 1) * step, now_ms, priority=priority)
+            return decode_klines(rows[-limit:]) if rows else None
+        data = get_cached_klines(symbol, interval, limit, partial(fetch_binance_klines, priority=priority))
+        if data is None:
             return None
-        data = res.json()
-        
-        df = pd.DataFrame(data, columns=[
-            "timestamp", "open", "high", "low", "close", "volume",
-            "close_time", "quote_asset_volume", "number_of_trades", 
-            "taker_buy_base", "taker_buy_quote", "ignore"
-        ])
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df.set_index("timestamp", inplace=True)
-        df = df[["open", "high", "low", "close", "volume"]].astype(float)
-        return df
+        return decode_klines(data)
     except Exception as e:
         print(f"Binance OHLC hatası: {e}")
         return None
 
+def get_binance_ohlc(symbol, interval="1d", limit=100, priority=PRIORITY_INTERACTIVE):
+    """Binance'dan OHLCV verisi al (DataFrame)"""
+    arrays = get_binance_ohlc_arrays(symbol, interval, limit, priority)
+    if arrays is None:
+        return None
+    return klines_to_dataframe(arrays)
+
 def get_binance_price(symbol):
     """Binance'dan anlık fiyat al"""
+    touch_stream_symbol(symbol)
+    ticker = get_stream_ticker(symbol)
+    if ticker:
+        return ticker['price']
+    price = get_snapshot_price(symbol)
+    if price is not None:
+        return price
     try:
         url = f"{BINANCE_BASE_URL}/ticker/price?symbol={symbol.upper()}"
-        response = requests.get(url, timeout=BINANCE_TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
+        data = binance_get_json(url, weight=2)
+        if data is not None:
             return float(data['price'])
     except Exception as e:
         print(f"Binance fiyat hatası: {e}")
@@ -107,11 +268,23 @@ def get_binance_price(symbol):
 
 def get_binance_24h_stats(symbol):
     """Binance'dan 24 saatlik istatistikler al"""
+    touch_stream_symbol(symbol)
+    ticker = get_stream_ticker(symbol)
+    if ticker:
+        return {
+            'price': ticker['price'],
+            'change_24h': (ticker['price'] - ticker['open']) / ticker['open'] * 100 if ticker['open'] else 0.0,
+            'volume_24h': ticker['volume'],
+            'high_24h': ticker['high'],
+            'low_24h': ticker['low']
+        }
+    stats = get_snapshot_stats(symbol)
+    if stats is not None:
+        return stats
     try:
         url = f"{BINANCE_BASE_URL}/ticker/24hr?symbol={symbol.upper()}"
-        response = requests.get(url, timeout=BINANCE_TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
+        data = binance_get_json(url, weight=2)
+        if data is not None:
             return {
                 'price': float(data['lastPrice']),
                 'change_24h': float(data['priceChangePercent']),
@@ -123,6 +296,51 @@ def get_binance_24h_stats(symbol):
         print(f"Binance 24h stats hatası: {e}")
     return None
 
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark_kline_decoding(sizes=(100, 1000, 10000), repeat=50):
+    """decode_klines + DataFrame görünümünü eski 12 kolonlu DataFrame yolu ile karşılaştır"""
+    def legacy_ohlc(data):
+        df = pd.DataFrame(data, columns=[
+            "timestamp", "open", "high", "low", "close", "volume",
+            "close_time", "quote_asset_volume", "number_of_trades", 
+            "taker_buy_base", "taker_buy_quote", "ignore"
+        ])
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+        df.set_index("timestamp", inplace=True)
+        return df[["open", "high", "low", "close", "volume"]].astype(float)
+
+    def timed(fn, data):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(data)
+        return (time.perf_counter() - start) / repeat * 1000
+
+    print(f"🧪 Kline decode benchmark ({repeat} tekrar)")
+    results = {}
+    for size in sizes:
+        base = 1_700_000_000_000
+        data = [[base + i * 60_000, f"{100 + i * 0.01:.8f}", f"{101 + i * 0.01:.8f}",
+                 f"{99 + i * 0.01:.8f}", f"{100.5 + i * 0.01:.8f}", f"{1000 + i:.8f}",
+                 base + i * 60_000 + 59_999, "100500.0", 42, "500.0", "50250.0", "0"]
+                for i in range(size)]
+        assert legacy_ohlc(data).equals(klines_to_dataframe(decode_klines(data)))
+
+        legacy_ms = timed(legacy_ohlc, data)
+        arrays_ms = timed(decode_klines, data)
+        frame_ms = timed(lambda d: klines_to_dataframe(decode_klines(d)), data)
+        results[size] = (legacy_ms, arrays_ms, frame_ms)
+        print(f"📊 {size:>6} mum: eski {legacy_ms:.3f} ms | diziler {arrays_ms:.3f} ms "
+              f"({legacy_ms / arrays_ms:.1f}x) | diziler+DataFrame {frame_ms:.3f} ms "
+              f"({legacy_ms / frame_ms:.1f}x)")
+    return results
+
 # Bot başlatılırken Binance coinlerini yükle
 if DEBUG_MODE:
     print("🔧 Binance API utils yüklendi!")
+
+if __name__ == "__main__":
+    benchmark_kline_decoding()
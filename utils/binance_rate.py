@@ -0,0 +1,143 @@
+"""
+Binance Rate Utils
+Tüm Binance REST istekleri için merkezi ağırlık (request weight) zamanlayıcısı
+X-MBX-USED-WEIGHT-1M başlığını izler, 418/429 cevaplarında Retry-After'a uyar,
+düşük öncelikli işleri (ön ısıtma, tarayıcı) etkileşimli komutlardan önce bekletir ya da düşürür
+"""
+
+import threading
+import time
+from config import *
+from utils.http_client import http_get
+
+# Öncelikler - küçük sayı daha önemli
+PRIORITY_INTERACTIVE = 0  # Kullanıcı komutları (/analiz, /likidite, /fiyat)
+PRIORITY_BACKGROUND = 1   # Alarm kontrolü, ticker/sembol yenileme
+PRIORITY_LOW = 2          # Ön ısıtma, tarayıcılar, backfill
+
+# Öncelik başına kullanılabilecek dakikalık ağırlık oranı - kalan pay üst önceliklere ayrılır
+PRIORITY_WEIGHT_SHARE = {PRIORITY_INTERACTIVE: 0.95, PRIORITY_BACKGROUND: 0.80, PRIORITY_LOW: 0.60}
+# Öncelik başına ağırlık açılmasını en fazla bekleme süresi (saniye) - 0: bekleme, hemen düşür
+PRIORITY_MAX_WAIT = {PRIORITY_INTERACTIVE: 10, PRIORITY_BACKGROUND: 30, PRIORITY_LOW: 0}
+
+# Global durum
+rate_lock = threading.Condition()
+rate_state = {'window': 0, 'used_weight': 0, 'banned_until': 0.0}
+rate_stats = {'requests': 0, 'shed': 0, 'waited': 0, 'rate_limited': 0, 'banned': 0}
+
+def klines_weight(limit):
+    """/klines istek ağırlığı (limit'e göre)"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+def current_window():
+    """Binance ağırlık penceresi - dakika başında sıfırlanır"""
+    return int(time.time() // 60)
+
+def roll_window():
+    """Yeni dakikaya geçildiyse kullanılan ağırlığı sıfırla (kilit altında çağrılır)"""
+    window = current_window()
+    if window != rate_state['window']:
+        rate_state['window'] = window
+        rate_state['used_weight'] = 0
+
+def seconds_until_next_window():
+    """Yeni ağırlık penceresine (yasak varsa yasağın bitimine) kalan saniye - tekrar denemeler için"""
+    with rate_lock:
+        now = time.time()
+        retry_at = max(rate_state['banned_until'], (current_window() + 1) * 60)
+        return max(0.0, retry_at - now)
+
+def acquire_weight(weight, priority):
+    """
+    İstek için ağırlık ayır - önceliğin payı dolmuşsa pencere açılana kadar bekle
+    Dönüş: True (gönderilebilir) ya da False (düşürüldü)
+    """
+    limit = BINANCE_WEIGHT_LIMIT * PRIORITY_WEIGHT_SHARE[priority]
+    deadline = time.time() + PRIORITY_MAX_WAIT[priority]
+    waited = False
+
+    with rate_lock:
+        while True:
+            roll_window()
+            now = time.time()
+            if now >= rate_state['banned_until'] and rate_state['used_weight'] + weight <= limit:
+                rate_state['used_weight'] += weight
+                rate_stats['requests'] += 1
+                if waited:
+                    rate_stats['waited'] += 1
+                return True
+
+            # Ne zaman tekrar denenebilir: yasak bitince ya da yeni dakikada
+            if now < rate_state['banned_until']:
+                retry_at = rate_state['banned_until']
+            else:
+                retry_at = (rate_state['window'] + 1) * 60
+            if retry_at > deadline:
+                rate_stats['shed'] += 1
+                return False
+
+            waited = True
+            rate_lock.wait(max(0.05, retry_at - now))
+
+def record_response(response):
+    """Cevap başlıklarından gerçek kullanılan ağırlığı ve olası yasakları işle"""
+    used = response.headers.get('X-MBX-USED-WEIGHT-1M')
+    with rate_lock:
+        roll_window()
+        if used is not None:
+            try:
+                rate_state['used_weight'] = max(rate_state['used_weight'], int(used))
+            except ValueError:
+                pass
+
+        if response.status_code in (418, 429):
+            try:
+                retry_after = float(response.headers.get('Retry-After', 60))
+            except ValueError:
+                retry_after = 60
+            rate_state['banned_until'] = max(rate_state['banned_until'], time.time() + retry_after)
+            if response.status_code == 418:
+                rate_stats['banned'] += 1
+                print(f"🚫 Binance IP yasağı (418) - {retry_after:.0f}s bekleniyor")
+            else:
+                rate_stats['rate_limited'] += 1
+                print(f"⚠️ Binance rate limit (429) - {retry_after:.0f}s bekleniyor")
+        rate_lock.notify_all()
+
+def binance_get(url, params=None, weight=1, priority=PRIORITY_INTERACTIVE, timeout=BINANCE_TIMEOUT, **kwargs):
+    """
+    Ağırlık zamanlayıcısından geçen Binance GET isteği
+    Ağırlık açılmazsa (düşük öncelik / yasak) istek gönderilmez ve None döner
+    """
+    if not acquire_weight(weight, priority):
+        return None
+    response = http_get(url, params=params, timeout=timeout, **kwargs)
+    record_response(response)
+    return response
+
+def get_rate_stats():
+    """Zamanlayıcı metrikleri - dakikalık kalan ağırlık (headroom) dahil"""
+    with rate_lock:
+        roll_window()
+        used = rate_state['used_weight']
+        return {
+            'used_weight': used,
+            'weight_limit': BINANCE_WEIGHT_LIMIT,
+            'headroom': max(0, BINANCE_WEIGHT_LIMIT - used),
+            'headroom_pct': max(0.0, 1 - used / BINANCE_WEIGHT_LIMIT) * 100,
+            'banned_for': max(0.0, rate_state['banned_until'] - time.time()),
+            'requests': rate_stats['requests'],
+            'waited': rate_stats['waited'],
+            'shed': rate_stats['shed'],
+            'rate_limited': rate_stats['rate_limited'],
+            'banned': rate_stats['banned']
+        }
+
+if DEBUG_MODE:
+    print("⚖️ Binance rate utils yüklendi!")
@@ -0,0 +1,212 @@
+"""
+Binance Stream Utils
+Opsiyonel WebSocket modu - combined miniTicker ve kline_<interval> akışları
+Semboller ilk istendiklerinde abone olunur, kullanılmayınca abonelik bırakılır.
+Canlı fiyatlar bellekte, mumlar kline deposunda (utils/kline_cache.py) tutulur.
+"""
+
+import json
+import threading
+import time
+from config import *
+from utils.kline_cache import INTERVAL_MS, apply_stream_kline
+
+try:
+    import websocket  # websocket-client
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+
+# Global değişkenler
+stream_thread = None
+stream_running = False
+stream_lock = threading.Lock()
+stream_requests = {}      # {akış adı: son istenme zamanı (monotonic)}
+active_streams = set()    # Sunucuya SUBSCRIBE gönderilmiş akışlar
+live_tickers = {}         # {SYMBOL: {'price','open','high','low','volume','quote_volume','ts'}}
+stream_stats = {'messages': 0, 'tickers': 0, 'klines': 0, 'subscribes': 0,
+                'unsubscribes': 0, 'reconnects': 0, 'last_message': None}
+
+SUBSCRIBE_BATCH = 200  # Tek SUBSCRIBE mesajındaki maksimum akış
+
+def is_stream_active():
+    """Akış modu açık ve bağlantı thread'i çalışıyor mu"""
+    return stream_running
+
+def touch_stream_symbol(symbol, interval=None):
+    """
+    Sembolün canlı akışını iste (yoksa bir sonraki senkronda abone olunur)
+    interval verilirse kline_<interval> akışı da istenir
+    """
+    if not stream_running:
+        return
+    name = symbol.lower()
+    now = time.monotonic()
+    with stream_lock:
+        stream_requests[f"{name}@miniTicker"] = now
+        if interval in INTERVAL_MS:
+            stream_requests[f"{name}@kline_{interval}"] = now
+
+def get_stream_ticker(symbol, max_age=BINANCE_STREAM_MAX_AGE):
+    """Akıştan gelen son miniTicker verisi (yoksa ya da eskiyse None)"""
+    ticker = live_tickers.get(symbol.upper())
+    if ticker and time.time() - ticker['ts'] <= max_age:
+        return ticker
+    return None
+
+def get_stream_price(symbol, max_age=BINANCE_STREAM_MAX_AGE):
+    """Akıştan gelen son fiyat (yoksa ya da eskiyse None)"""
+    ticker = get_stream_ticker(symbol, max_age)
+    return ticker['price'] if ticker else None
+
+def kline_event_to_row(k):
+    """WebSocket kline nesnesini REST /klines satır formatına çevir"""
+    return [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'],
+            k['q'], k['n'], k['V'], k['Q'], "0"]
+
+def handle_stream_message(raw):
+    """Combined stream mesajını işle"""
+    message = json.loads(raw)
+    data = message.get('data')
+    if data is None:
+        return  # SUBSCRIBE/UNSUBSCRIBE cevabı
+
+    stream_stats['messages'] += 1
+    stream_stats['last_message'] = time.time()
+    event = data.get('e')
+
+    if event == '24hrMiniTicker':
+        live_tickers[data['s']] = {
+            'price': float(data['c']),
+            'open': float(data['o']),
+            'high': float(data['h']),
+            'low': float(data['l']),
+            'volume': float(data['v']),
+            'quote_volume': float(data['q']),
+            'ts': time.time()
+        }
+        stream_stats['tickers'] += 1
+    elif event == 'kline':
+        k = data['k']
+        apply_stream_kline(data['s'], k['i'], kline_event_to_row(k), k['x'])
+        stream_stats['klines'] += 1
+
+def sync_subscriptions(ws, request_id):
+    """İstenen akışlara abone ol, boşta kalanları bırak"""
+    now = time.monotonic()
+    with stream_lock:
+        for name, last_used in list(stream_requests.items()):
+            if now - last_used > BINANCE_STREAM_IDLE_SECONDS:
+                del stream_requests[name]
+        wanted = set(stream_requests)
+    to_add = sorted(wanted - active_streams)
+    to_remove = sorted(active_streams - wanted)
+
+    for method, names in (("SUBSCRIBE", to_add), ("UNSUBSCRIBE", to_remove)):
+        for i in range(0, len(names), SUBSCRIBE_BATCH):
+            batch = names[i:i + SUBSCRIBE_BATCH]
+            request_id += 1
+            ws.send(json.dumps({"method": method, "params": batch, "id": request_id}))
+            if method == "SUBSCRIBE":
+                active_streams.update(batch)
+                stream_stats['subscribes'] += len(batch)
+            else:
+                active_streams.difference_update(batch)
+                stream_stats['unsubscribes'] += len(batch)
+            time.sleep(0.25)  # Binance: bağlantı başına saniyede en fazla 5 mesaj
+
+    return request_id
+
+def binance_stream_loop():
+    """WebSocket bağlantısını aç, mesajları işle, koparsa yeniden bağlan"""
+    retry_delay = 1
+    record_file = open(BINANCE_STREAM_RECORD_FILE, 'a') if BINANCE_STREAM_RECORD_FILE else None
+
+    while stream_running:
+        ws = None
+        try:
+            ws = websocket.create_connection(BINANCE_WS_URL, timeout=BINANCE_TIMEOUT)
+            ws.settimeout(1)
+            active_streams.clear()
+            request_id = 0
+            retry_delay = 1
+            print(f"📡 Binance akışına bağlanıldı: {BINANCE_WS_URL}")
+
+            last_sync = 0
+            while stream_running:
+                if time.monotonic() - last_sync >= 1:
+                    request_id = sync_subscriptions(ws, request_id)
+                    last_sync = time.monotonic()
+                try:
+                    raw = ws.recv()
+                except websocket.WebSocketTimeoutException:
+                    continue
+                if not raw:
+                    raise ConnectionError("Bağlantı kapandı")
+                if record_file:
+                    record_file.write(raw + "\n")
+                handle_stream_message(raw)
+
+        except Exception as e:
+            if stream_running:
+                stream_stats['reconnects'] += 1
+                print(f"❌ Binance akış hatası: {e} - {retry_delay}s sonra yeniden bağlanılacak")
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 60)
+        finally:
+            if ws is not None:
+                try:
+                    ws.close()
+                except Exception:
+                    pass
+
+    if record_file:
+        record_file.close()
+
+def start_binance_stream():
+    """Akış modunu başlat (config'de kapalıysa ya da paket yoksa REST ile devam edilir)"""
+    global stream_thread, stream_running
+
+    if not BINANCE_STREAM_ENABLED:
+        return False
+    if not WEBSOCKET_AVAILABLE:
+        print("⚠️ websocket-client kurulu değil - Binance akış modu devre dışı")
+        return False
+    if stream_running:
+        return False
+
+    stream_running = True
+    stream_thread = threading.Thread(target=binance_stream_loop, daemon=True)
+    stream_thread.start()
+    print("📡 Binance akış modu başlatıldı")
+    return True
+
+def stop_binance_stream():
+    """Akış modunu durdur"""
+    global stream_running
+
+    if not stream_running:
+        return
+    stream_running = False
+    stream_thread.join(timeout=5)
+    with stream_lock:
+        stream_requests.clear()
+    print("📡 Binance akış modu durduruldu")
+
+def get_stream_stats():
+    """Akış istatistikleri"""
+    return {
+        'running': stream_running,
+        'active_streams': len(active_streams),
+        'live_symbols': len(live_tickers),
+        'messages': stream_stats['messages'],
+        'tickers': stream_stats['tickers'],
+        'klines': stream_stats['klines'],
+        'subscribes': stream_stats['subscribes'],
+        'unsubscribes': stream_stats['unsubscribes'],
+        'reconnects': stream_stats['reconnects'],
+        'last_message': stream_stats['last_message']
+    }
+
+if DEBUG_MODE:
+    print("📡 Binance stream utils yüklendi!")
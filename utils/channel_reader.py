@@ -3,7 +3,6 @@ Kanal Haber Okuyucu - Bot ile çakışmayan sistem
 RSS veya Telegram API ile kanal takibi
 """
 
-import requests
 import time
 import threading
 import json
@@ -11,6 +10,7 @@ import os
 import hashlib
 from datetime import datetime
 from config import TELEGRAM_TOKEN
+from utils.http_client import http_get, http_post
 
 # Kanal bilgileri
 CHANNEL_USERNAME = "primecrypto_tr"
@@ -92,7 +92,7 @@ def fetch_channel_messages():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         
         if response.status_code == 200:
             # HTML'den mesajları parse et (basit yöntem)
@@ -144,7 +144,7 @@ def send_to_users(message_text):
                 "disable_web_page_preview": False
             }
             
-            response = requests.post(url, json=data, timeout=5)
+            response = http_post(url, json=data, timeout=5)
             
             if response.status_code == 200:
                 result = response.json()
@@ -174,7 +174,7 @@ def alternative_channel_check():
         url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getChat"
         params = {"chat_id": f"@{CHANNEL_USERNAME}"}
         
-        response = requests.get(url, params=params, timeout=5)
+        response = http_get(url, params=params, timeout=5)
         
         if response.status_code == 200:
             # Sadece kanal bilgisini alabiliyoruz, mesajları alamıyoruz
@@ -11,6 +11,7 @@ import pandas as pd
 import numpy as np
 from config import *
 from utils.technical_analysis import *
+from utils.indicators import get_indicators
 
 # Matplotlib ayarları
 plt.style.use('dark_background')
@@ -106,10 +107,11 @@ def create_candlestick_chart(ax, df, symbol, timeframe):
 def add_technical_indicators(ax, df, analysis_data):
     """Teknik indikatörleri grafiğe ekle"""
     try:
-        # Hareketli ortalamalar
-        sma20 = df['close'].rolling(20).mean()
-        sma50 = df['close'].rolling(50).mean()
-        ema12 = df['close'].ewm(span=12).mean()
+        # Hareketli ortalamalar - analizde hesaplanan paketten
+        indicators = get_indicators(df, ('sma_20', 'sma_50', 'ema_12', 'bb'))
+        sma20 = indicators['sma_20']
+        sma50 = indicators['sma_50']
+        ema12 = indicators['ema_12']
         
         ax.plot(df.index, sma20, color='#ffeb3b', linestyle='--', linewidth=2, 
                 label='SMA20', alpha=0.8)
@@ -119,7 +121,7 @@ def add_technical_indicators(ax, df, analysis_data):
                 label='EMA12', alpha=0.7)
         
         # Bollinger Bands
-        bb_data = calculate_bollinger_bands(df['close'])
+        bb_data = indicators['bb']
         ax.fill_between(df.index, bb_data['upper'], bb_data['lower'], 
                        color='#9c27b0', alpha=0.1, label='Bollinger Bands')
         ax.plot(df.index, bb_data['upper'], color='#9c27b0', linestyle=':', 
@@ -183,7 +185,7 @@ def create_rsi_chart(ax, df, analysis_data):
     try:
         ax.set_facecolor('#1a1d29')
         
-        rsi = calculate_rsi(df['close'])
+        rsi = get_indicators(df, ('rsi',))['rsi']
         current_rsi = rsi.iloc[-1]
         
         # RSI çizgisi
@@ -216,7 +218,7 @@ def create_macd_chart(ax, df, analysis_data):
     try:
         ax.set_facecolor('#1a1d29')
         
-        macd_data = calculate_macd(df['close'])
+        macd_data = get_indicators(df, ('macd',))['macd']
         
         # MACD çizgileri
         ax.plot(df.index, macd_data['macd'], color='#2196f3', linewidth=2, label='MACD')
@@ -265,7 +267,7 @@ def create_volume_chart(ax, df):
         ax.bar(df.index, df['volume'], color=colors, alpha=0.7, width=0.8)
         
         # Volume ortalaması
-        volume_sma = df['volume'].rolling(20).mean()
+        volume_sma = get_indicators(df, ('volume_sma_20',))['volume_sma_20']
         ax.plot(df.index, volume_sma, color='#ffeb3b', linewidth=2, alpha=0.8, label='Volume SMA')
         
         # Mevcut volume bilgisi
@@ -647,32 +649,3 @@ def create_simple_price_chart(symbol, price_data):
 
 if DEBUG_MODE:
     print("📊 Advanced chart generator utils yüklendi!")
-# utils/chart_generator.py dosyasının sonuna eklenecek kodlar
-
-def find_support_levels(df, current_price, window=5):
-    """Destek seviyelerini bul"""
-    try:
-        lows = []
-        for i in range(window, len(df) - window):
-            if all(df['low'].iloc[i] <= df['low'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['low'].iloc[i] <= df['low'].iloc[i+j] for j in range(1, window+1)):
-                if df['low'].iloc[i] < current_price:
-                    lows.append(df['low'].iloc[i])
-        
-        return sorted(lows, reverse=True)[:3]
-    except:
-        return []
-
-def find_resistance_levels(df, current_price, window=5):
-    """Direnç seviyelerini bul"""
-    try:
-        highs = []
-        for i in range(window, len(df) - window):
-            if all(df['high'].iloc[i] >= df['high'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['high'].iloc[i] >= df['high'].iloc[i+j] for j in range(1, window+1)):
-                if df['high'].iloc[i] > current_price:
-                    highs.append(df['high'].iloc[i])
-        
-        return sorted(highs)[:3]
-    except:
-        return []
@@ -0,0 +1,184 @@
+"""
+CoinGecko API Utils
+/coins/list kataloğu diskte saklanır, coin ID çözümü bellekteki indeksten yapılır
+Sadece aynı sembolü paylaşan coinler için bir kez /search sorulur ve sonuç hatırlanır
+"""
+
+import json
+import os
+import threading
+import time
+from config import *
+from utils.http_client import http_get
+from utils.json_stream import stream_json_items
+from utils.singleflight import singleflight_call
+
+# Global indeks - her yüklemede yeni dict oluşturulup tek atamayla değişir
+# {'coins': [ham katalog], 'ids': set, 'symbols': {sembol: [id]}, 'names': {isim: id}, 'updated': zaman}
+COIN_INDEX = {'coins': [], 'ids': set(), 'symbols': {}, 'names': {}, 'updated': 0}
+resolved_cache = {}  # Yerelde tutmayan girdi -> /search ile seçilen id (diskte de saklanır)
+coin_list_thread = None
+coin_list_running = False
+coin_list_lock = threading.Lock()
+coin_list_stats = {'local_hits': 0, 'search_calls': 0, 'refreshes': 0, 'resolved_dirty': False}
+
+def fetch_coingecko_json(url, params=None):
+    """CoinGecko GET isteği - 200 ise JSON, değilse None"""
+    response = http_get(url, params=params, timeout=COINGECKO_TIMEOUT)
+    if response.status_code != 200:
+        return None
+    return response.json()
+
+def coingecko_get(url, params=None):
+    """CoinGecko GET -> JSON; aynı anda gelen özdeş istekler tek istekte birleştirilir"""
+    key = ('coingecko', url, tuple(sorted(params.items())) if params else None)
+    return singleflight_call(key, fetch_coingecko_json, url, params)
+
+def build_coin_index(coins):
+    """/coins/list cevabından (id, symbol, name) indeksini kur"""
+    global COIN_INDEX
+    symbols = {}
+    names = {}
+    for coin in coins:
+        symbols.setdefault(coin['symbol'].lower(), []).append(coin['id'])
+        names.setdefault(coin['name'].lower(), coin['id'])
+    COIN_INDEX = {'coins': coins, 'ids': {coin['id'] for coin in coins}, 'symbols': symbols,
+                  'names': names, 'updated': time.time()}
+    return len(coins)
+
+def save_coin_list(coins, updated):
+    """Kataloğu ve çözülmüş belirsiz sembolleri diske yaz (atomik)"""
+    try:
+        tmp_file = COIN_LIST_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'updated': updated, 'coins': coins, 'resolved': resolved_cache}, f)
+        os.replace(tmp_file, COIN_LIST_FILE)
+    except Exception as e:
+        print(f"❌ Coin listesi kaydetme hatası: {e}")
+
+def download_coin_list():
+    """CoinGecko /coins/list kataloğunu indir ve indeksi yenile"""
+    try:
+        coins = stream_json_items(f"{COINGECKO_BASE_URL}/coins/list", fields=('id', 'symbol', 'name'),
+                                  timeout=COINGECKO_TIMEOUT)
+        if coins is None:
+            return False
+        with coin_list_lock:
+            build_coin_index(coins)
+            save_coin_list(coins, COIN_INDEX['updated'])
+            coin_list_stats['resolved_dirty'] = False
+        coin_list_stats['refreshes'] += 1
+        print(f"✅ CoinGecko coin listesi güncellendi ({len(coins)} coin)")
+        return True
+    except Exception as e:
+        print(f"❌ CoinGecko coin listesi hatası: {e}")
+        return False
+
+def load_coin_list():
+    """Kataloğu diskten yükle, yoksa ya da eskiyse indir"""
+    try:
+        if os.path.exists(COIN_LIST_FILE):
+            with open(COIN_LIST_FILE, 'r') as f:
+                data = json.load(f)
+            with coin_list_lock:
+                build_coin_index(data['coins'])
+                COIN_INDEX['updated'] = data.get('updated', 0)
+                resolved_cache.update(data.get('resolved', {}))
+            print(f"📚 CoinGecko coin listesi diskten yüklendi ({len(data['coins'])} coin)")
+    except Exception as e:
+        print(f"❌ Coin listesi okuma hatası: {e}")
+
+    if time.time() - COIN_INDEX['updated'] > COIN_LIST_REFRESH_HOURS * 3600:
+        return download_coin_list()
+    return True
+
+def search_coingecko(query):
+    """CoinGecko /search ile en alakalı coin ID'si (ağ isteği)"""
+    try:
+        coin_list_stats['search_calls'] += 1
+        search_data = coingecko_get(f"{COINGECKO_BASE_URL}/search", params={'query': query})
+        if search_data and search_data.get('coins'):
+            return search_data['coins'][0]['id']
+    except Exception as e:
+        print(f"CoinGecko arama hatası: {e}")
+    return None
+
+def resolve_coin_id(query):
+    """
+    Kullanıcı girdisini CoinGecko coin ID'sine çevir
+    Sıra: POPULAR_COINS, tam ID, tek sahipli sembol, tam isim, önceden /search ile çözülmüş girdi;
+    sadece hiçbiri tutmazsa /search sorulur (bulunan sonuç hatırlanır, tekrar ağa çıkılmaz)
+    """
+    query = query.lower().strip()
+    if not query:
+        return None
+    if query in POPULAR_COINS:
+        return POPULAR_COINS[query]
+
+    index = COIN_INDEX
+    candidates = index['symbols'].get(query, [])
+    coin_id = None
+    if query in index['ids']:
+        coin_id = query
+    elif len(candidates) == 1:
+        coin_id = candidates[0]
+    elif query in index['names']:
+        coin_id = index['names'][query]
+    elif query in resolved_cache:
+        coin_id = resolved_cache[query]
+
+    if coin_id:
+        coin_list_stats['local_hits'] += 1
+        return coin_id
+
+    # Yerelde tutmayan girdiler (belirsiz sembol, 'shiba' gibi kısmi adlar) bir kez /search'e sorulur
+    coin_id = search_coingecko(query)
+    if coin_id:
+        with coin_list_lock:
+            resolved_cache[query] = coin_id
+            coin_list_stats['resolved_dirty'] = True
+    return coin_id
+
+def coin_list_refresh_loop():
+    """Kataloğu periyodik olarak yenile"""
+    while coin_list_running:
+        time.sleep(60)
+        if coin_list_running and time.time() - COIN_INDEX['updated'] > COIN_LIST_REFRESH_HOURS * 3600:
+            download_coin_list()
+
+def start_coin_list():
+    """Kataloğu yükle ve yenileme thread'ini başlat"""
+    global coin_list_thread, coin_list_running
+
+    if coin_list_running:
+        return False
+
+    load_coin_list()
+    coin_list_running = True
+    coin_list_thread = threading.Thread(target=coin_list_refresh_loop, daemon=True)
+    coin_list_thread.start()
+    return True
+
+def stop_coin_list():
+    """Yenileme thread'ini durdur, çözülmüş belirsiz sembolleri kaydet"""
+    global coin_list_running
+    coin_list_running = False
+    with coin_list_lock:
+        if coin_list_stats['resolved_dirty'] and COIN_INDEX['coins']:
+            save_coin_list(COIN_INDEX['coins'], COIN_INDEX['updated'])
+            coin_list_stats['resolved_dirty'] = False
+
+def get_coin_list_stats():
+    """Katalog istatistikleri"""
+    index = COIN_INDEX
+    return {
+        'coins': len(index['ids']),
+        'age_hours': (time.time() - index['updated']) / 3600 if index['updated'] else None,
+        'resolved_ambiguous': len(resolved_cache),
+        'local_hits': coin_list_stats['local_hits'],
+        'search_calls': coin_list_stats['search_calls'],
+        'refreshes': coin_list_stats['refreshes']
+    }
+
+if DEBUG_MODE:
+    print("🦎 CoinGecko API utils yüklendi!")
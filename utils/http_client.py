@@ -0,0 +1,49 @@
+"""
+HTTP Client Utils
+Tüm dış API istekleri için ortak, keep-alive bağlantı havuzlu HTTP katmanı
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config import *
+
+# Global oturum - host başına bağlantı havuzu, TCP+TLS el sıkışması tekrar kullanılır
+http_session = None
+session_lock = threading.Lock()
+
+def get_http_session():
+    """Ortak requests oturumunu oluştur veya döndür"""
+    global http_session
+    if http_session is None:
+        with session_lock:
+            if http_session is None:
+                session = requests.Session()
+                # pool_connections: kaç farklı host için havuz tutulacak
+                # pool_maxsize: host başına eşzamanlı açık bağlantı (telebot worker'ları + arka plan thread'leri)
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                                      pool_maxsize=HTTP_POOL_MAXSIZE,
+                                      pool_block=False)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                http_session = session
+    return http_session
+
+def http_get(url, params=None, timeout=API_TIMEOUT, **kwargs):
+    """Havuzlu GET isteği"""
+    return get_http_session().get(url, params=params, timeout=timeout, **kwargs)
+
+def http_post(url, json=None, data=None, timeout=API_TIMEOUT, **kwargs):
+    """Havuzlu POST isteği"""
+    return get_http_session().post(url, json=json, data=data, timeout=timeout, **kwargs)
+
+def close_http_session():
+    """Havuzdaki bağlantıları kapat"""
+    global http_session
+    with session_lock:
+        if http_session is not None:
+            http_session.close()
+            http_session = None
+
+if DEBUG_MODE:
+    print("🌐 HTTP client utils yüklendi!")
@@ -0,0 +1,408 @@
+"""
+Indicators Utils
+Tek indikatör motoru - OHLCV dizilerinden istenen indikatör setini tek geçişte hesaplar.
+Ortak ara sonuçlar (kayan pencereler, EMA'lar) bir kez hesaplanır, sonuçlar seri başına
+önbelleklenir; analiz, grafik ve sinyal kodu aynı paketi okur.
+"""
+
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from config import *
+
+# Kısa adlar -> varsayılan parametreli adlar
+INDICATOR_ALIASES = {
+    'rsi': 'rsi_14', 'macd': 'macd_12_26_9', 'bb': 'bb_20_2', 'stochastic': 'stoch_14_3',
+    'fibonacci': 'fib_50', 'ichimoku': 'ichimoku_9_26_52'
+}
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Global önbellek - {parmak izi: paket}, LRU
+# paket: {'columns': {kolon: np.ndarray}, 'index': pd.Index ya da None,
+#         'shared': {ara sonuç anahtarı: np.ndarray}, 'results': {ad: sonuç}}
+indicator_cache = OrderedDict()
+indicator_lock = threading.Lock()
+indicator_stats = {'hits': 0, 'computed': 0, 'shared_hits': 0}
+
+# =============================================================================
+# TEMEL HESAPLAR (NumPy)
+# =============================================================================
+
+def rolling_reduce(values, window, op):
+    """
+    Kayan pencere indirgemesi (pandas rolling ile aynı: ilk window-1 eleman NaN)
+    2D dizilerde (zaman x sembol) her kolon ayrı seri olarak, zaman ekseninde hesaplanır
+    """
+    out = np.full(values.shape, np.nan)
+    if window < 1 or values.shape[0] < window:
+        return out
+    windows = sliding_window_view(values, window, axis=0)
+    if op == 'mean':
+        out[window - 1:] = windows.mean(axis=-1)
+    elif op == 'std':
+        out[window - 1:] = windows.std(axis=-1, ddof=1)
+    elif op == 'max':
+        out[window - 1:] = windows.max(axis=-1)
+    elif op == 'min':
+        out[window - 1:] = windows.min(axis=-1)
+    else:
+        raise ValueError(f"Bilinmeyen pencere işlemi: {op}")
+    return out
+
+def linear_filter(values, decay, gain=1.0, initial=0.0):
+    """
+    y[t] = decay * y[t-1] + gain * x[t] özyinelemesi (y[-1] = initial) - NaN içermeyen seri için
+    Bloklar halinde kümülatif toplamla vektörelleştirilir (blok boyu decay^-k taşmasın diye sınırlı)
+    2D dizilerde özyineleme zaman ekseninde (axis=0), kolonlar birlikte ilerler
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[0]
+    out = np.empty(values.shape)
+    if n == 0:
+        return out
+    if decay <= 0.0:
+        out[:] = gain * values
+        return out
+
+    block = max(1, min(n, int(np.log(1e6) / -np.log(decay))))
+    steps = np.arange(block).reshape((-1,) + (1,) * (values.ndim - 1))
+    powers = decay ** steps
+    inverse = decay ** -steps
+    carry_powers = decay ** (steps + 1)
+
+    carry = initial
+    for start in range(0, n, block):
+        chunk = values[start:start + block]
+        k = chunk.shape[0]
+        y = gain * np.cumsum(chunk * inverse[:k], axis=0) * powers[:k] + carry * carry_powers[:k]
+        out[start:start + k] = y
+        carry = y[-1]
+    return out
+
+def ewm_mean(values, span):
+    """
+    pandas ewm(span=span).mean() (adjust=True, ignore_na=False) karşılığı - ağırlıklı toplam / ağırlık toplamı
+    NaN gözlemler ağırlık almaz ama sönüm sürer; NaN konumunda önceki değer taşınır, baştaki NaN'lar NaN kalır
+    """
+    decay = 1.0 - 2.0 / (span + 1.0)
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    if not missing.any():
+        return linear_filter(values, decay) / linear_filter(np.ones_like(values), decay)
+    weights = linear_filter((~missing).astype(np.float64), decay)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return linear_filter(np.where(missing, 0.0, values), decay) / np.where(weights > 0, weights, np.nan)
+
+def wilder_mean(values, window):
+    """
+    Wilder ortalaması - ilk değer ilk `window` elemanın basit ortalaması, sonra
+    avg = (önceki * (window - 1) + x) / window. İlk window-1 eleman NaN
+    """
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] < window:
+        return out
+    seed = values[:window].mean(axis=0)
+    out[window - 1] = seed
+    out[window:] = linear_filter(values[window:], (window - 1) / window, 1 / window, seed)
+    return out
+
+def shift(values, periods):
+    """pandas shift karşılığı (boşalan yerler NaN)"""
+    out = np.full(values.shape, np.nan)
+    if periods >= 0:
+        if periods < values.shape[0]:
+            out[periods:] = values[:values.shape[0] - periods]
+    elif -periods < values.shape[0]:
+        out[:periods] = values[-periods:]
+    return out
+
+# =============================================================================
+# PAKET VE ORTAK ARA SONUÇLAR
+# =============================================================================
+
+def to_columns(data):
+    """DataFrame / Series / dizi sözlüğünü (kolonlar, index) olarak ayır"""
+    if isinstance(data, pd.Series):
+        return {'close': data.to_numpy(dtype=np.float64)}, data.index
+    if isinstance(data, pd.DataFrame):
+        columns = {c: data[c].to_numpy(dtype=np.float64) for c in OHLCV_COLUMNS if c in data.columns}
+        return columns, data.index
+    columns = {c: np.asarray(data[c], dtype=np.float64) for c in OHLCV_COLUMNS if c in data}
+    return columns, None
+
+def fingerprint(columns, index):
+    """Seri parmak izi - uzunluk, zaman aralığı ve kolon içeriklerinin özeti"""
+    length = len(next(iter(columns.values()))) if columns else 0
+    bounds = (index[0], index[-1]) if index is not None and length else None
+    return (length, bounds) + tuple((name, hash(columns[name].tobytes())) for name in sorted(columns))
+
+def get_bundle(data):
+    """Serinin indikatör paketini döndür (yoksa oluştur)"""
+    columns, index = to_columns(data)
+    key = fingerprint(columns, index)
+    with indicator_lock:
+        bundle = indicator_cache.get(key)
+        if bundle is not None:
+            indicator_cache.move_to_end(key)
+            return bundle
+        bundle = {'columns': columns, 'index': index, 'shared': {}, 'results': {}}
+        indicator_cache[key] = bundle
+        while len(indicator_cache) > INDICATOR_CACHE_MAX_ENTRIES:
+            indicator_cache.popitem(last=False)
+        return bundle
+
+def shared(bundle, key, compute):
+    """
+    Ortak ara sonucu bir kez hesapla (örn. ('rolling', 'close', 20, 'mean'), ('ema', 'close', 12))
+    Hesap kilit dışında; eşzamanlı çağrılarda ilk yazılan sonuç paylaşılır
+    """
+    cache = bundle['shared']
+    with indicator_lock:
+        if key in cache:
+            indicator_stats['shared_hits'] += 1
+            return cache[key]
+    value = compute()
+    with indicator_lock:
+        return cache.setdefault(key, value)
+
+def series(bundle, name):
+    """Kolon ya da türetilmiş seri (gain/loss gibi) - türetilmişler shared içinde tutulur"""
+    if name in bundle['columns']:
+        return bundle['columns'][name]
+    return bundle['shared'][('series', name)]
+
+def rolling(bundle, name, window, op):
+    return shared(bundle, ('rolling', name, window, op),
+                  lambda: rolling_reduce(series(bundle, name), window, op))
+
+def ema(bundle, name, span):
+    return shared(bundle, ('ema', name, span), lambda: ewm_mean(series(bundle, name), span))
+
+# =============================================================================
+# İNDİKATÖRLER
+# =============================================================================
+
+def compute_rsi(bundle, window):
+    """RSI - kazanç/kayıpların basit hareketli ortalaması ile (mevcut davranış)"""
+    def gains():
+        # İlk fark NaN - pandas where() ile aynı şekilde 0 sayılır
+        delta = np.diff(series(bundle, 'close'), axis=0, prepend=np.nan)
+        with np.errstate(invalid='ignore'):
+            bundle['shared'][('series', 'loss')] = np.where(delta < 0, -delta, 0.0)
+            return np.where(delta > 0, delta, 0.0)
+    shared(bundle, ('series', 'gain'), gains)
+    gain = rolling(bundle, 'gain', window, 'mean')
+    loss = rolling(bundle, 'loss', window, 'mean')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + gain / loss)
+
+def compute_rsi_wilder(bundle, window):
+    """RSI - Wilder yumuşatması ile (ilk değer `window`. mumda, akış versiyonu ile aynı)"""
+    close = series(bundle, 'close')
+    out = np.full(close.shape, np.nan)
+    if close.shape[0] <= window:
+        return out
+    delta = np.diff(close, axis=0)
+    gain = wilder_mean(np.where(delta > 0, delta, 0.0), window)
+    loss = wilder_mean(np.where(delta < 0, -delta, 0.0), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = 100 - 100 / (1 + gain / loss)
+    return out
+
+def compute_macd(bundle, fast, slow, signal):
+    macd_line = shared(bundle, ('series', f'macd_{fast}_{slow}'),
+                       lambda: ema(bundle, 'close', fast) - ema(bundle, 'close', slow))
+    signal_line = ema(bundle, f'macd_{fast}_{slow}', signal)
+    return {'macd': macd_line, 'signal': signal_line, 'histogram': macd_line - signal_line}
+
+def compute_bollinger(bundle, window, num_std):
+    middle = rolling(bundle, 'close', window, 'mean')
+    std = rolling(bundle, 'close', window, 'std')
+    return {'upper': middle + std * num_std, 'middle': middle, 'lower': middle - std * num_std}
+
+def compute_stochastic(bundle, k_period, d_period):
+    high_max = rolling(bundle, 'high', k_period, 'max')
+    low_min = rolling(bundle, 'low', k_period, 'min')
+    def k_line():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (series(bundle, 'close') - low_min) / (high_max - low_min) * 100
+    k_percent = shared(bundle, ('series', f'stoch_k_{k_period}'), k_line)
+    return {'k_percent': k_percent, 'd_percent': rolling(bundle, f'stoch_k_{k_period}', d_period, 'mean')}
+
+def compute_ichimoku(bundle, conversion, base, span_b):
+    def midpoint(window):
+        return (rolling(bundle, 'high', window, 'max') + rolling(bundle, 'low', window, 'min')) / 2
+    conversion_line = midpoint(conversion)
+    base_line = midpoint(base)
+    return {
+        'conversion_line': conversion_line,
+        'base_line': base_line,
+        'leading_span_a': shift((conversion_line + base_line) / 2, base),
+        'leading_span_b': shift(midpoint(span_b), base),
+        'lagging_span': shift(series(bundle, 'close'), -base)
+    }
+
+def compute_fibonacci(bundle, lookback):
+    high_price = float(np.max(series(bundle, 'high')[-lookback:]))
+    low_price = float(np.min(series(bundle, 'low')[-lookback:]))
+    diff = high_price - low_price
+    return {
+        '0%': high_price,
+        '23.6%': high_price - (diff * 0.236),
+        '38.2%': high_price - (diff * 0.382),
+        '50%': high_price - (diff * 0.5),
+        '61.8%': high_price - (diff * 0.618),
+        '78.6%': high_price - (diff * 0.786),
+        '100%': low_price
+    }
+
+def compute_pivots(bundle, window):
+    """
+    Pivot (yerel tepe/dip) fiyatları - i. mum, her iki yanındaki `window` mumun hepsinden
+    yüksek/düşük ya da eşitse pivottur. Merkezli pencere max/min'i, 2*window+1 uzunluğundaki
+    geriye bakan pencerenin `window` kaydırılmış halidir (kayan pencereler paylaşılır)
+    Dönüş: {'highs': tepe fiyatları, 'lows': dip fiyatları} - zaman sırasıyla
+    """
+    high = series(bundle, 'high')
+    low = series(bundle, 'low')
+    n = high.shape[0]
+    if n < 2 * window + 1:
+        return {'highs': high[:0], 'lows': low[:0]}
+    span = 2 * window + 1
+    centered_max = rolling(bundle, 'high', span, 'max')[span - 1:]
+    centered_min = rolling(bundle, 'low', span, 'min')[span - 1:]
+    inner_high = high[window:n - window]
+    inner_low = low[window:n - window]
+    return {'highs': inner_high[inner_high >= centered_max], 'lows': inner_low[inner_low <= centered_min]}
+
+def compute_indicator(bundle, name):
+    """Parametreli adı çözüp indikatörü hesapla (örn. 'sma_50', 'ema_12', 'bb_20_2', 'volume_sma_20')"""
+    kind, *params = INDICATOR_ALIASES.get(name, name).split('_')
+    if kind == 'volume' and params[:1] == ['sma']:
+        return rolling(bundle, 'volume', int(params[1]), 'mean')
+    params = [float(p) if '.' in p else int(p) for p in params]
+    if kind == 'rsi':
+        return compute_rsi(bundle, *params)
+    if kind == 'rsiw':
+        return compute_rsi_wilder(bundle, *params)
+    if kind == 'macd':
+        return compute_macd(bundle, *params)
+    if kind == 'bb':
+        return compute_bollinger(bundle, *params)
+    if kind == 'sma':
+        return rolling(bundle, 'close', params[0], 'mean')
+    if kind == 'ema':
+        return ema(bundle, 'close', params[0])
+    if kind == 'stoch':
+        return compute_stochastic(bundle, *params)
+    if kind == 'ichimoku':
+        return compute_ichimoku(bundle, *params)
+    if kind == 'fib':
+        return compute_fibonacci(bundle, *params)
+    if kind == 'pivots':
+        return compute_pivots(bundle, *params)
+    raise ValueError(f"Bilinmeyen indikatör: {name}")
+
+def freeze(value):
+    """Önbelleğe giren dizileri salt okunur yap - sonucu değiştiren çağıran önbelleği bozamaz"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    return value
+
+def wrap(value, index):
+    """Dizileri (index varsa) pd.Series görünümüne sar - kopya yok"""
+    if index is None:
+        return value
+    if isinstance(value, np.ndarray):
+        if value.shape[0] != len(index):
+            return value
+        return pd.Series(value, index=index, copy=False)
+    if isinstance(value, dict):
+        return {key: wrap(item, index) for key, item in value.items()}
+    return value
+
+def get_indicators(data, names):
+    """
+    İstenen indikatörleri tek paketten döndür - {ad: sonuç}
+    data: OHLCV DataFrame'i, kapanış Series'i ya da decode_klines dizileri
+    names: 'rsi', 'macd', 'bb', 'stochastic', 'ichimoku', 'fibonacci', 'sma_20', 'ema_12',
+           'volume_sma_20', 'rsi_7', 'rsiw_14' (Wilder), 'pivots_5' gibi parametreli adlar
+    DataFrame/Series girişinde sonuçlar aynı index'li Series'tir, dizilerde np.ndarray
+    Sonuçlar önbellekle paylaşılır ve salt okunurdur - değiştirmek için kopyalayın
+    2D dizilerde (zaman x sembol matrisi) serisel indikatörler kolon bazında hesaplanır
+    """
+    bundle = get_bundle(data)
+    results = bundle['results']
+    out = {}
+    for name in names:
+        with indicator_lock:
+            result = results.get(name)
+            indicator_stats['hits' if result is not None else 'computed'] += 1
+        if result is None:
+            # Kilit dışında hesaplanır - yarışta aynı sonuç iki kez hesaplanabilir, ilk yazılan kalır
+            computed = wrap(freeze(compute_indicator(bundle, name)), bundle['index'])
+            with indicator_lock:
+                result = results.setdefault(name, computed)
+        out[name] = result
+    return out
+
+def get_indicator(data, name):
+    """Tek indikatör - get_indicators kısayolu"""
+    return get_indicators(data, (name,))[name]
+
+def clear_indicator_cache():
+    """Önbelleği temizle"""
+    with indicator_lock:
+        indicator_cache.clear()
+
+def get_indicator_stats():
+    """Önbellek istatistikleri"""
+    with indicator_lock:
+        return {'bundles': len(indicator_cache), **indicator_stats}
+
+# =============================================================================
+# DOĞRULAMA
+# =============================================================================
+
+def check_pandas_equivalence(size=2000, seed=5, tolerance=1e-9):
+    """
+    Motoru pandas rolling/ewm formülleriyle karşılaştır - NaN boşluklu seri dahil
+    Dönüş: {durum: en büyük mutlak fark}
+    """
+    rng = np.random.default_rng(seed)
+    clean = pd.Series(100 + np.cumsum(rng.normal(0, 1, size)),
+                      index=pd.date_range('2024-01-01', periods=size, freq='h'))
+    gappy = clean.copy()
+    gappy.iloc[:3] = np.nan
+    gappy.iloc[rng.choice(np.arange(3, size), size // 50, replace=False)] = np.nan
+
+    diffs = {}
+    for label, close in (('temiz', clean), ('NaN boşluklu', gappy)):
+        result = get_indicators(close, ('sma_20', 'ema_12', 'macd'))
+        ema_fast = close.ewm(span=12).mean()
+        macd_line = ema_fast - close.ewm(span=26).mean()
+        expected = {'sma_20': close.rolling(20).mean(), 'ema_12': ema_fast,
+                    'macd': macd_line, 'signal': macd_line.ewm(span=9).mean()}
+        got = {'sma_20': result['sma_20'], 'ema_12': result['ema_12'],
+               'macd': result['macd']['macd'], 'signal': result['macd']['signal']}
+        worst = 0.0
+        for key, series in expected.items():
+            want, have = series.to_numpy(), np.asarray(got[key])
+            assert np.array_equal(np.isnan(want), np.isnan(have)), f"{label} {key} NaN konumları farklı"
+            finite = ~np.isnan(want)
+            worst = max(worst, float(np.max(np.abs(want[finite] - have[finite]))))
+        diffs[label] = worst
+        status = "✅" if worst <= tolerance else "❌"
+        print(f"{status} {label:<13} en büyük fark: {worst:.2e}")
+    return diffs
+
+if DEBUG_MODE:
+    print("🧠 Indicators utils yüklendi!")
+
+if __name__ == "__main__":
+    check_pandas_equivalence()
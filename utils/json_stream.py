@@ -0,0 +1,101 @@
+"""
+JSON Stream Utils
+Büyük JSON cevaplarını tamamını belleğe almadan parça parça okuma (sadece standart kütüphane)
+Hedef dizinin elemanları tek tek çözülür, sadece istenen alanlar tutulur
+"""
+
+import codecs
+import json
+import re
+from config import *
+from utils.http_client import http_get
+
+STREAM_CHUNK_SIZE = 64 * 1024
+decoder = json.JSONDecoder()
+WHITESPACE = re.compile(r'[\s,]*')
+
+def find_array_start(buffer, key):
+    """
+    Tampondaki hedef dizinin '[' konumundan sonrasını bul
+    key None ise en üst seviye dizi, değilse '"key": [' aranır. Bulunamazsa -1
+    """
+    if key is None:
+        pos = buffer.find('[')
+        return pos + 1 if pos != -1 else -1
+    match = re.search(r'"%s"\s*:\s*\[' % re.escape(key), buffer)
+    return match.end() if match else -1
+
+def iter_json_array(chunks, key=None, fields=None):
+    """
+    Metin parçalarından (str) dizi elemanlarını sırayla üret
+    key: en üst seviye nesnede dizinin anahtarı (None: cevabın kendisi dizi)
+    fields: verilirse her elemandan sadece bu alanlar tutulur
+    Elemanlar nesne ya da dizi olmalıdır (yarım kalan sayı tam sanılmasın diye)
+    """
+    buffer = ''
+    pos = -1
+    chunks = iter(chunks)
+
+    # Dizinin başlangıcına kadar oku - öncesi atılır
+    for chunk in chunks:
+        buffer += chunk
+        pos = find_array_start(buffer, key)
+        if pos != -1:
+            break
+        # Anahtar parça sınırına denk gelebilir - sadece kuyruğu tut
+        buffer = buffer[-(len(key or '') + 16):]
+    if pos == -1:
+        return
+
+    exhausted = False
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            if exhausted:
+                raise
+            # Eleman henüz tamamlanmadı - işlenmiş kısmı at, yeni parça ekle
+            buffer = buffer[pos:]
+            pos = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+            else:
+                buffer += chunk
+            continue
+
+        pos = end
+        if fields is not None:
+            item = {field: item.get(field) for field in fields}
+        yield item
+
+def iter_response_text(response, chunk_size=STREAM_CHUNK_SIZE):
+    """HTTP cevabını UTF-8 metin parçaları olarak oku (çok baytlı karakterler bölünmez)"""
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if chunk:
+            yield utf8.decode(chunk)
+    tail = utf8.decode(b'', final=True)
+    if tail:
+        yield tail
+
+def stream_json_items(url, key=None, fields=None, params=None, timeout=API_TIMEOUT, get_fn=http_get):
+    """
+    URL'deki JSON dizisinin elemanlarını akış halinde oku
+    get_fn: isteği atan fonksiyon (Binance için ağırlık zamanlayıcılı binance_get)
+    Dönüş: eleman listesi (sadece `fields` alanları) ya da HTTP hatasında None
+    """
+    response = get_fn(url, params=params, timeout=timeout, stream=True)
+    if response is None:
+        return None
+    with response:
+        if response.status_code != 200:
+            print(f"❌ Akış isteği hatası ({url}): {response.status_code}")
+            return None
+        return list(iter_json_array(iter_response_text(response), key, fields))
+
+if DEBUG_MODE:
+    print("🧵 JSON stream utils yüklendi!")
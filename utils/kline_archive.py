@@ -0,0 +1,343 @@
+"""
+Kline Archive Utils
+Kapanmış mumlar için diskte kolon bazlı, sadece sona eklenen arşiv - (sembol, interval) başına
+her kolon ayrı ham ikili dosya (little-endian int64/float64), okumalar np.memmap üzerinden
+kopyasız dilimdir. Geçerli satır sayısı ve dosya nesli en son yazılan manifest.json'dadır.
+Yeniden başlatmada ve uzun geçmiş isteklerinde geçmiş tekrar indirilmez.
+"""
+
+import json
+import os
+import shutil
+import threading
+import numpy as np
+from config import *
+
+# Kolonlar (REST /klines sırası; close_time open_time + interval - 1 olarak türetilir)
+ARCHIVE_COLUMNS = (
+    ('open_time', '<i8', 0), ('open', '<f8', 1), ('high', '<f8', 2), ('low', '<f8', 3),
+    ('close', '<f8', 4), ('volume', '<f8', 5), ('quote_volume', '<f8', 7),
+    ('trades', '<i8', 8), ('taker_buy_base', '<f8', 9), ('taker_buy_quote', '<f8', 10)
+)
+CANDLE_BYTES = sum(np.dtype(dtype).itemsize for _, dtype, _ in ARCHIVE_COLUMNS)
+
+# Global durum
+# {(SYMBOL, interval): (satır sayısı, {kolon: np.memmap})} - ekleme/sıkıştırmada geçersizlenir
+archive_maps = {}
+archive_lock = threading.RLock()
+archive_stats = {'reads': 0, 'appended': 0, 'compactions': 0, 'trimmed': 0}
+
+def archive_path(symbol, interval, column=None, generation=0):
+    """Arşiv dizini ya da kolon dosyası yolu (kolon dosyaları nesil numarası taşır)"""
+    path = os.path.join(KLINE_ARCHIVE_DIR, symbol.upper(), interval)
+    return os.path.join(path, f"{column}.{generation}.bin") if column else path
+
+def manifest_path(symbol, interval):
+    """Arşivin manifest dosyası - geçerli satır sayısı ve kolon dosyalarının nesli"""
+    return os.path.join(archive_path(symbol, interval), "manifest.json")
+
+def read_manifest(symbol, interval):
+    """
+    Manifest'i oku - {'rows': satır sayısı, 'generation': nesil, 'first_open_time': borsadaki ilk mum,
+    'confirmed': [[başlangıç, bitiş]] borsayla doğrulanmış aralıklar (ms, kapalı)} ya da arşiv yoksa None
+    """
+    path = manifest_path(symbol, interval)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def write_manifest(symbol, interval, manifest):
+    """Manifest'i atomik yaz (geçici dosya + replace) - yazmanın son adımı"""
+    os.makedirs(archive_path(symbol, interval), exist_ok=True)
+    path = manifest_path(symbol, interval)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f)
+    os.replace(path + '.tmp', path)
+
+def open_archive(symbol, interval):
+    """
+    Kolonların memmap'lerini döndür (boş arşivde None) - kilit altında çağrılır
+    Sadece manifest'teki satırlar okunur; manifest'ten kısa kolon dosyası varsa arşiv reddedilir
+    """
+    key = (symbol.upper(), interval)
+    cached = archive_maps.get(key)
+    if cached is not None:
+        return cached[1]
+
+    manifest = read_manifest(symbol, interval)
+    if manifest is None or manifest['rows'] == 0:
+        return None
+    count, generation = manifest['rows'], manifest['generation']
+    for column, dtype, _ in ARCHIVE_COLUMNS:
+        path = archive_path(symbol, interval, column, generation)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < count * np.dtype(dtype).itemsize:
+            print(f"❌ Kline arşivi manifest ile uyuşmuyor ({symbol} {interval} {column}) - yok sayıldı")
+            return None
+    maps = {column: np.memmap(archive_path(symbol, interval, column, generation), dtype=dtype,
+                              mode='r', shape=(count,))
+            for column, dtype, _ in ARCHIVE_COLUMNS}
+    archive_maps[key] = (count, maps)
+    return maps
+
+def rows_to_columns(rows):
+    """Ham kline satırlarını arşiv kolonlarına çevir"""
+    return {column: np.array([row[index] for row in rows], dtype=dtype)
+            for column, dtype, index in ARCHIVE_COLUMNS}
+
+def write_columns(symbol, interval, columns, mode):
+    """
+    Kolonları dosyalara yaz, manifest'i en son güncelle (kilit altında)
+    'ab': sona ekle - manifest'ten sonra kalmış yarım ekleme önce kesilir
+    'wb': yeniden yaz - yeni nesil dosyalarına yazılır, manifest tek replace ile yeni nesle geçer;
+    yazma yarıda kalırsa manifest eski, tutarlı nesli göstermeye devam eder
+    """
+    os.makedirs(archive_path(symbol, interval), exist_ok=True)
+    manifest = read_manifest(symbol, interval) or {'rows': 0, 'generation': 0}
+    rows, generation = manifest['rows'], manifest['generation']
+    added = len(columns['open_time'])
+    if mode == 'ab':
+        for column, dtype, _ in ARCHIVE_COLUMNS:
+            data = np.ascontiguousarray(columns[column], dtype=dtype)
+            with open(archive_path(symbol, interval, column, generation), 'ab') as f:
+                f.truncate(rows * data.itemsize)
+                f.write(data.tobytes())
+        write_manifest(symbol, interval, {**manifest, 'rows': rows + added})
+    else:
+        for column, dtype, _ in ARCHIVE_COLUMNS:
+            data = np.ascontiguousarray(columns[column], dtype=dtype)
+            with open(archive_path(symbol, interval, column, generation + 1), 'wb') as f:
+                f.write(data.tobytes())
+        write_manifest(symbol, interval, {**manifest, 'rows': added, 'generation': generation + 1})
+        remove_stale_generations(symbol, interval, generation + 1)
+    archive_maps.pop((symbol.upper(), interval), None)
+
+def remove_stale_generations(symbol, interval, generation):
+    """Manifest'in göstermediği eski/yarım nesil kolon dosyalarını sil"""
+    path = archive_path(symbol, interval)
+    current = f".{generation}.bin"
+    for name in os.listdir(path):
+        if name.endswith(".bin") and not name.endswith(current):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass  # Hâlâ açık bir memmap tutuyor olabilir - sonraki yeniden yazmada silinir
+
+def write_new_rows(symbol, interval, closed):
+    """Arşivde olmayan kapanmış mumları yaz - sona ekleme ya da sıkıştırma (kilit altında); dönüş: eklenen"""
+    maps = open_archive(symbol, interval)
+    new = rows_to_columns(closed)
+    if maps is None:
+        order = np.argsort(new['open_time'], kind='stable')
+        _, first = np.unique(new['open_time'][order], return_index=True)
+        write_columns(symbol, interval, {c: a[order][first] for c, a in new.items()}, 'wb')
+        return len(first)
+
+    times = maps['open_time']
+    tail = new['open_time'] > times[-1]
+    tail &= np.concatenate(([True], np.diff(new['open_time']) > 0))
+    rest = ~tail
+    if rest.any():
+        # Aradaki/eski mumlar: sadece arşivde olmayanlar sayılır
+        positions = np.searchsorted(times, new['open_time'][rest])
+        positions = np.minimum(positions, len(times) - 1)
+        rest[rest] = times[positions] != new['open_time'][rest]
+    if rest.any():
+        merged = {c: np.concatenate((np.asarray(maps[c]), new[c][tail | rest])) for c, _, _ in ARCHIVE_COLUMNS}
+        compact_columns(symbol, interval, merged)
+    elif tail.any():
+        write_columns(symbol, interval, {c: a[tail] for c, a in new.items()}, 'ab')
+    return int(tail.sum() + rest.sum())
+
+def append_klines(symbol, interval, rows, now_ms, confirmed=()):
+    """
+    Kapanmış mumları arşive ekle - close_time (satır[6]) geçmemiş mumlar atlanır
+    Son arşivlenen mumdan yeni olanlar doğrudan sona eklenir; daha eski ya da aradaki
+    boşlukları dolduran mumlar varsa arşiv sıkıştırılarak sıralı yeniden yazılır
+    confirmed: borsadan eksiksiz indirilen [(başlangıç, bitiş)] aralıkları - mumlar yazıldıktan sonra
+    manifest'e işlenir (bakım boşluklu ya da boş aralıklar da tam sayılır)
+    Dönüş: eklenen mum sayısı
+    """
+    if not KLINE_ARCHIVE_ENABLED:
+        return 0
+    closed = [row for row in rows or () if row[6] < now_ms]
+    if not closed and not confirmed:
+        return 0
+
+    try:
+        with archive_lock:
+            added = write_new_rows(symbol, interval, closed) if closed else 0
+            if confirmed:
+                confirm_ranges(symbol, interval, confirmed)
+            archive_stats['appended'] += added
+            enforce_symbol_cap(symbol)
+            return added
+    except Exception as e:
+        print(f"❌ Kline arşiv yazma hatası ({symbol} {interval}): {e}")
+        return 0
+
+def compact_columns(symbol, interval, columns):
+    """Kolonları open_time'a göre sırala, tekrarları at ve yeniden yaz (kilit altında)"""
+    order = np.argsort(columns['open_time'], kind='stable')
+    _, first = np.unique(columns['open_time'][order], return_index=True)
+    keep = order[first]
+    write_columns(symbol, interval, {c: a[keep] for c, a in columns.items()}, 'wb')
+    archive_stats['compactions'] += 1
+    return len(keep)
+
+def compact_archive(symbol, interval):
+    """Arşivi sıralı ve tekrarsız olarak yeniden yaz - dönüş: mum sayısı"""
+    with archive_lock:
+        maps = open_archive(symbol, interval)
+        if maps is None:
+            return 0
+        return compact_columns(symbol, interval, {c: np.asarray(m) for c, m in maps.items()})
+
+def symbol_archive_bytes(symbol):
+    """Sembolün tüm interval'lardaki arşiv boyutu - {interval: bayt}"""
+    root = os.path.join(KLINE_ARCHIVE_DIR, symbol.upper())
+    if not os.path.isdir(root):
+        return {}
+    sizes = {}
+    for interval in os.listdir(root):
+        manifest = read_manifest(symbol, interval)
+        if manifest is not None:
+            sizes[interval] = manifest['rows'] * CANDLE_BYTES
+    return sizes
+
+def enforce_symbol_cap(symbol):
+    """
+    Sembol başına boyut sınırı (KLINE_ARCHIVE_SYMBOL_MAX_MB) - aşılırsa en büyük
+    interval'ın en eski mumları atılır (kilit altında çağrılır)
+    """
+    cap = int(KLINE_ARCHIVE_SYMBOL_MAX_MB * 1024 * 1024)
+    sizes = symbol_archive_bytes(symbol)
+    total = sum(sizes.values())
+    while total > cap and sizes:
+        interval = max(sizes, key=sizes.get)
+        maps = open_archive(symbol, interval)
+        if maps is None:
+            sizes.pop(interval)
+            continue
+        drop = min(len(maps['open_time']), -(-(total - cap) // CANDLE_BYTES))
+        write_columns(symbol, interval, {c: np.asarray(m[drop:]) for c, m in maps.items()}, 'wb')
+        clip_confirmed(symbol, interval, int(maps['open_time'][drop]) if drop < len(maps['open_time']) else None)
+        archive_stats['trimmed'] += drop
+        total -= drop * CANDLE_BYTES
+        sizes[interval] -= drop * CANDLE_BYTES
+
+# =============================================================================
+# KAPSAM (borsayla doğrulanmış aralıklar)
+# =============================================================================
+
+def merge_ranges(ranges):
+    """Çakışan ya da bitişik [başlangıç, bitiş] aralıklarını birleştir"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def confirm_ranges(symbol, interval, ranges):
+    """Aralıkları manifest'e doğrulanmış olarak ekle (kilit altında)"""
+    manifest = read_manifest(symbol, interval) or {'rows': 0, 'generation': 0}
+    confirmed = merge_ranges(manifest.get('confirmed', []) + [list(r) for r in ranges])
+    write_manifest(symbol, interval, {**manifest, 'confirmed': confirmed})
+
+def clip_confirmed(symbol, interval, first_open_time):
+    """Baştan mum atıldıktan sonra doğrulanmış aralıkları arşivde kalan kısma kırp (kilit altında)"""
+    manifest = read_manifest(symbol, interval)
+    if manifest is None or not manifest.get('confirmed'):
+        return
+    if first_open_time is None:
+        confirmed = []
+    else:
+        confirmed = [[max(start, first_open_time), end] for start, end in manifest['confirmed']
+                     if end >= first_open_time]
+    write_manifest(symbol, interval, {**manifest, 'confirmed': confirmed})
+
+def set_first_open_time(symbol, interval, open_time):
+    """Borsadaki ilk mumun open_time'ını (listeleme başlangıcı) manifest'e yaz"""
+    if not KLINE_ARCHIVE_ENABLED:
+        return
+    with archive_lock:
+        manifest = read_manifest(symbol, interval) or {'rows': 0, 'generation': 0}
+        write_manifest(symbol, interval, {**manifest, 'first_open_time': int(open_time)})
+
+def get_archive_coverage(symbol, interval):
+    """Arşivin kapsamı - {'first_open_time': ms ya da None, 'confirmed': [[başlangıç, bitiş]]}"""
+    if not KLINE_ARCHIVE_ENABLED:
+        return {'first_open_time': None, 'confirmed': []}
+    with archive_lock:
+        manifest = read_manifest(symbol, interval) or {}
+    return {'first_open_time': manifest.get('first_open_time'), 'confirmed': manifest.get('confirmed', [])}
+
+def read_archive(symbol, interval, start_time=None, end_time=None, limit=None):
+    """
+    Arşivden kolon dilimleri (kopyasız memmap görünümleri)
+    start_time/end_time: milisaniye, open_time'a göre kapalı aralık; limit: son `limit` mum
+    Dönüş: {'open_time', 'open', 'high', 'low', 'close', 'volume', ...} ya da None
+    """
+    if not KLINE_ARCHIVE_ENABLED:
+        return None
+    with archive_lock:
+        maps = open_archive(symbol, interval)
+        archive_stats['reads'] += 1
+    if maps is None:
+        return None
+    times = maps['open_time']
+    lo = 0 if start_time is None else int(np.searchsorted(times, start_time, side='left'))
+    hi = len(times) if end_time is None else int(np.searchsorted(times, end_time, side='right'))
+    if limit is not None:
+        lo = max(lo, hi - limit)
+    return {column: data[lo:hi] for column, data in maps.items()}
+
+def columns_to_rows(columns, step):
+    """Arşiv kolonlarını REST /klines satır formatına çevir (kline deposu için)"""
+    times = columns['open_time'].tolist()
+    return [[t, o, h, l, c, v, t + step - 1, qv, n, tb, tq, "0"]
+            for t, o, h, l, c, v, qv, n, tb, tq in zip(
+                times, columns['open'].tolist(), columns['high'].tolist(), columns['low'].tolist(),
+                columns['close'].tolist(), columns['volume'].tolist(), columns['quote_volume'].tolist(),
+                columns['trades'].tolist(), columns['taker_buy_base'].tolist(),
+                columns['taker_buy_quote'].tolist())]
+
+def load_recent_rows(symbol, interval, count, step):
+    """
+    Arşivin sonundaki kesintisiz en fazla `count` mumu ham satır olarak döndür
+    Arada boşluk varsa sadece boşluktan sonraki kısım alınır (depo tamponu boşluksuz olmalı)
+    """
+    columns = read_archive(symbol, interval, limit=count)
+    if columns is None:
+        return []
+    gaps = np.flatnonzero(np.diff(columns['open_time']) != step)
+    if gaps.size:
+        columns = {c: a[gaps[-1] + 1:] for c, a in columns.items()}
+    return columns_to_rows(columns, step)
+
+def clear_kline_archive(symbol=None):
+    """Arşivi sil (symbol verilirse sadece o sembol)"""
+    with archive_lock:
+        path = os.path.join(KLINE_ARCHIVE_DIR, symbol.upper()) if symbol else KLINE_ARCHIVE_DIR
+        shutil.rmtree(path, ignore_errors=True)
+        archive_maps.clear()
+
+def get_kline_archive_stats():
+    """Arşiv istatistikleri"""
+    with archive_lock:
+        symbols = os.listdir(KLINE_ARCHIVE_DIR) if os.path.isdir(KLINE_ARCHIVE_DIR) else []
+        return {
+            'symbols': len(symbols),
+            'bytes': sum(sum(symbol_archive_bytes(symbol).values()) for symbol in symbols),
+            'open_maps': len(archive_maps),
+            'reads': archive_stats['reads'],
+            'appended': archive_stats['appended'],
+            'compactions': archive_stats['compactions'],
+            'trimmed': archive_stats['trimmed']
+        }
+
+if DEBUG_MODE:
+    print("🗄️ Kline archive utils yüklendi!")
@@ -0,0 +1,187 @@
+"""
+Kline Backfill Utils
+İstenen tarih aralığını 1000 mumluk sayfalara bölüp paralel indirme - sayfalar ağırlık
+zamanlayıcısından geçer, sonra birleştirilip tekrarsız hale getirilir ve kline deposuna eklenir
+Disk arşivinde (utils/kline_archive.py) tam olan sayfalar indirilmez, indirilenler arşivlenir
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import *
+from utils.binance_rate import PRIORITY_BACKGROUND, seconds_until_next_window
+from utils.kline_cache import INTERVAL_MS, KLINES_MAX_LIMIT, merge_klines
+from utils.kline_archive import read_archive, append_klines, columns_to_rows, get_archive_coverage, set_first_open_time
+from utils.binance_api import fetch_binance_klines, decode_klines, klines_to_dataframe
+
+# Global istatistikler
+backfill_lock = threading.Lock()
+backfill_stats = {'runs': 0, 'pages': 0, 'archived_pages': 0, 'retried_pages': 0, 'failed_runs': 0,
+                  'candles': 0, 'merged_runs': 0, 'last_run_seconds': None}
+
+def split_pages(interval, start_time, end_time):
+    """
+    [start_time, end_time] aralığını Binance sayfalarına böl
+    Dönüş: [(sayfa başı, sayfa sonu)] - her sayfa en fazla KLINES_MAX_LIMIT mum
+    """
+    step = INTERVAL_MS[interval]
+    start_time = start_time - start_time % step
+    page_span = KLINES_MAX_LIMIT * step
+    return [(page_start, min(page_start + page_span - 1, end_time))
+            for page_start in range(start_time, end_time + 1, page_span)]
+
+def fetch_page(symbol, interval, page, priority):
+    """Tek sayfayı indir - hata ya da düşürülme durumunda None"""
+    page_start, page_end = page
+    return fetch_binance_klines(symbol, interval, KLINES_MAX_LIMIT, start_time=page_start,
+                                end_time=page_end, priority=priority)
+
+def get_listing_start(symbol, interval, priority=PRIORITY_BACKGROUND):
+    """
+    Borsadaki ilk mumun open_time'ı - arşiv manifest'inde yoksa tek hafif istekle (limit=1,
+    startTime=0) öğrenilip kaydedilir. Bilinmiyorsa None
+    """
+    coverage = get_archive_coverage(symbol, interval)
+    if coverage['first_open_time'] is not None or not KLINE_ARCHIVE_ENABLED:
+        return coverage['first_open_time']
+    rows = fetch_binance_klines(symbol, interval, 1, start_time=0, priority=priority)
+    if not rows:
+        return None
+    set_first_open_time(symbol, interval, rows[0][0])
+    return rows[0][0]
+
+def archive_complete(symbol, interval, start_time, end_time, coverage=None):
+    """
+    [start_time, end_time] aralığı arşivde eksiksiz mi - listeleme öncesi kısım sayılmaz;
+    borsayla doğrulanmış aralıklar (bakım boşlukları dahil) ya da tam mum sayısı yeterli
+    """
+    step = INTERVAL_MS[interval]
+    coverage = coverage or get_archive_coverage(symbol, interval)
+    if coverage['first_open_time'] is not None:
+        start_time = max(start_time, coverage['first_open_time'])
+    if start_time > end_time:
+        return True
+    if any(start <= start_time and end >= end_time for start, end in coverage['confirmed']):
+        return True
+    columns = read_archive(symbol, interval, start_time, end_time)
+    return columns is not None and len(columns['open_time']) == (end_time - start_time) // step + 1
+
+def archived_page(symbol, interval, page, now_ms, coverage=None):
+    """Sayfanın tüm mumları kapanmış ve arşivde eksiksizse ham satırları, değilse None"""
+    step = INTERVAL_MS[interval]
+    page_start, page_end = page
+    if page_end >= now_ms - now_ms % step:
+        return None
+    if not archive_complete(symbol, interval, page_start, page_end, coverage):
+        return None
+    columns = read_archive(symbol, interval, page_start, page_end)
+    return columns_to_rows(columns, step) if columns is not None else []
+
+def backfill_klines(symbol, interval, start_time, end_time=None, priority=PRIORITY_BACKGROUND,
+                    max_workers=BACKFILL_WORKERS, store=True):
+    """
+    Tarih aralığındaki ham kline satırlarını paralel sayfalarla indir
+    start_time/end_time: milisaniye (end_time None ise şimdi)
+    store: True ise sonuç kline deposuna birleştirilir (boşluk oluşturmuyorsa)
+    Dönüş: open_time'a göre sıralı, tekrarsız ham satırlar ya da bir sayfa alınamadıysa None
+    """
+    symbol = symbol.upper()
+    if interval not in INTERVAL_MS:
+        print(f"❌ Backfill desteklenmeyen interval: {interval}")
+        return None
+
+    if end_time is None:
+        end_time = int(time.time() * 1000)
+    step = INTERVAL_MS[interval]
+    # Listeleme öncesi sayfalar istenmez (yeni listelenen paritelerde boş sayfa indirilmez)
+    listing_start = get_listing_start(symbol, interval, priority)
+    if listing_start is not None:
+        start_time = max(start_time, listing_start)
+    start_time -= start_time % step
+    if start_time > end_time:
+        return []
+
+    started = time.perf_counter()
+    now_ms = int(time.time() * 1000)
+    last_closed_end = now_ms - now_ms % step - 1
+    pages = split_pages(interval, start_time, end_time)
+    coverage = get_archive_coverage(symbol, interval)
+    results = {page: archived_page(symbol, interval, page, now_ms, coverage) for page in pages}
+    archived = sum(1 for rows in results.values() if rows is not None)
+    to_fetch = [page for page in pages if results[page] is None]
+    retried = 0
+
+    try:
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_fetch)))) as pool:
+                fetched = pool.map(lambda p: fetch_page(symbol, interval, p, priority), to_fetch)
+                for page, rows in zip(to_fetch, fetched):
+                    results[page] = rows
+
+        # Alınamayan (hata / düşürülen) sayfaları sırayla tekrar dene - düşürülen sayfalar aynı
+        # pencerede yine düşürüleceği için her tur yeni ağırlık penceresini bekler
+        for _ in range(BACKFILL_RETRIES):
+            failed = [page for page in pages if results[page] is None]
+            if not failed:
+                break
+            time.sleep(seconds_until_next_window())
+            for page in failed:
+                retried += 1
+                results[page] = fetch_page(symbol, interval, page, priority)
+        # İndirilen sayfaları tek seferde arşivle (eski sayfalar tek sıkıştırmaya yol açar); alınan
+        # sayfaların kapanmış kısmı borsayla doğrulanmış sayılır - boşluklu sayfalar tekrar indirilmez
+        confirmed = [(page[0], min(page[1], last_closed_end)) for page in to_fetch
+                     if results[page] is not None and page[0] <= last_closed_end]
+        append_klines(symbol, interval, [row for page in to_fetch for row in results[page] or ()], now_ms,
+                      confirmed=confirmed)
+    except Exception as e:
+        print(f"❌ Backfill hatası ({symbol} {interval}): {e}")
+        return None
+
+    failed = sum(1 for page in pages if results[page] is None)
+    with backfill_lock:
+        backfill_stats['runs'] += 1
+        backfill_stats['pages'] += len(pages)
+        backfill_stats['archived_pages'] += archived
+        backfill_stats['retried_pages'] += retried
+        if failed:
+            backfill_stats['failed_runs'] += 1
+    if failed:
+        print(f"❌ Backfill eksik kaldı ({symbol} {interval}): {failed}/{len(pages)} sayfa alınamadı")
+        return None
+
+    # Sayfaları birleştir - sınırlarda çakışan mumlar open_time ile tekilleştirilir
+    unique = {}
+    for page in pages:
+        for row in results[page]:
+            if start_time <= row[0] <= end_time:
+                unique.setdefault(row[0], row)
+    rows = [unique[open_time] for open_time in sorted(unique)]
+
+    merged = store and merge_klines(symbol, interval, rows)
+    with backfill_lock:
+        backfill_stats['candles'] += len(rows)
+        if merged:
+            backfill_stats['merged_runs'] += 1
+        backfill_stats['last_run_seconds'] = time.perf_counter() - started
+    return rows
+
+def get_binance_history(symbol, interval="1d", days=365, end_time=None, priority=PRIORITY_BACKGROUND):
+    """
+    Son `days` günlük (ya da end_time'a kadar) OHLCV verisi - DataFrame
+    Tek istekle alınabilen 1000 mum sınırı yok; uzun pencereler backfill ile indirilir
+    """
+    if end_time is None:
+        end_time = int(time.time() * 1000)
+    rows = backfill_klines(symbol, interval, end_time - days * 86_400_000, end_time, priority=priority)
+    if not rows:
+        return None
+    return klines_to_dataframe(decode_klines(rows))
+
+def get_backfill_stats():
+    """Backfill istatistikleri"""
+    with backfill_lock:
+        return dict(backfill_stats)
+
+if DEBUG_MODE:
+    print("🧱 Kline backfill utils yüklendi!")
@@ -0,0 +1,324 @@
+"""
+Kline Cache Utils
+(sembol, interval) bazlı artımlı kline deposu - kapanmış mumlar halka tamponda (deque) tutulur,
+sadece eksik kuyruk startTime ile indirilir, her limit dilimlenerek servis edilir.
+Açık mum kısa bir TTL ile yenilenir. Bellek LRU ile sınırlı.
+Kapanmış mumlar diskteki kolon arşivine (utils/kline_archive.py) yazılır, yeniden başlatmada oradan yüklenir.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from config import *
+from utils.kline_archive import append_klines, load_recent_rows
+from utils.streaming_indicators import live_open_time, update_live_indicators
+
+# Interval -> milisaniye (sabit uzunluklu interval'lar; 1M gibi değişkenler depolanmaz)
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000, "3d": 259_200_000,
+    "1w": 604_800_000
+}
+
+KLINES_MAX_LIMIT = 1000  # Binance /klines tek istek üst sınırı
+
+# Global depo
+# {(SYMBOL, interval): {'closed': deque(kapanmış ham kline satırları, maxlen=kapasite),
+#                       'open': açık mum satırı ya da None, 'open_fetched': monotonic zaman,
+#                       'history_complete': daha eski mum yoksa True}}
+kline_cache = OrderedDict()
+cache_lock = threading.Lock()
+cache_stats = {'hits': 0, 'refreshes': 0, 'tail_fetches': 0, 'head_fetches': 0,
+               'misses': 0, 'evictions': 0, 'candles_downloaded': 0, 'archive_loads': 0}
+
+def split_klines(rows, now_ms):
+    """Ham kline satırlarını (kapanmış, açık) olarak ayır - close_time (satır[6]) geçtiyse kapanmıştır"""
+    if rows and rows[-1][6] >= now_ms:
+        return rows[:-1], rows[-1]
+    return rows, None
+
+def window_from_entry(entry, limit):
+    """Girişten son `limit` mumu döndür (açık mum dahil, Binance'ın döndürdüğü pencere ile aynı)"""
+    closed = entry['closed']
+    has_open = entry['open'] is not None
+    take = min(len(closed), limit - 1 if has_open else limit)
+    rows = [closed[i] for i in range(len(closed) - take, len(closed))]
+    if has_open:
+        rows.append(entry['open'])
+    return rows
+
+def entry_size(entry):
+    """Girişteki toplam mum sayısı (açık mum dahil)"""
+    return len(entry['closed']) + (1 if entry['open'] is not None else 0)
+
+def new_entry(capacity):
+    """Boş depo girişi oluştur"""
+    return {'closed': deque(maxlen=capacity), 'open': None, 'open_fetched': 0.0,
+            'history_complete': False}
+
+def count_download(rows):
+    """İndirilen mum sayısını istatistiğe ekle"""
+    if rows:
+        with cache_lock:
+            cache_stats['candles_downloaded'] += len(rows)
+
+def extend_tail(entry, rows, now_ms):
+    """Yeni indirilen kuyruğu girişe ekle - zaten olan kapanmış mumlar atlanır"""
+    closed, open_row = split_klines(rows, now_ms)
+    last_open_time = entry['closed'][-1][0] if entry['closed'] else -1
+    for row in closed:
+        if row[0] > last_open_time:
+            entry['closed'].append(row)
+    entry['open'] = open_row
+    entry['open_fetched'] = time.monotonic()
+
+def insert_entry(key, entry):
+    """Girişi depoya ekle, gerekiyorsa en eski girişi at (kilit altında çağrılır)"""
+    kline_cache[key] = entry
+    kline_cache.move_to_end(key)
+    while len(kline_cache) > KLINE_CACHE_MAX_ENTRIES:
+        kline_cache.popitem(last=False)
+        cache_stats['evictions'] += 1
+
+def get_cached_klines(symbol, interval, limit, fetch_fn):
+    """
+    Depodan ham kline satırları döndür, eksikleri fetch_fn ile indir
+    fetch_fn(symbol, interval, limit, start_time=None, end_time=None) -> ham satırlar ya da None
+    - Açık mum TTL içindeyse: istek atılmaz
+    - Açık mum eskidiyse / yeni mumlar başladıysa: sadece eksik kuyruk startTime ile indirilir
+    - Depodakinden uzun pencere istenirse: sadece eksik baş kısım endTime ile indirilir
+    """
+    symbol = symbol.upper()
+    key = (symbol, interval)
+    step = INTERVAL_MS.get(interval)
+
+    if step is None:
+        with cache_lock:
+            cache_stats['misses'] += 1
+        rows = fetch_fn(symbol, interval, limit)
+        count_download(rows)
+        return rows
+
+    now_ms = int(time.time() * 1000)
+    with cache_lock:
+        entry = kline_cache.get(key)
+        if entry is not None:
+            kline_cache.move_to_end(key)
+            open_row = entry['open']
+            enough = entry_size(entry) >= limit or entry['history_complete']
+            if (enough and open_row is not None and open_row[6] >= now_ms
+                    and time.monotonic() - entry['open_fetched'] <= KLINE_OPEN_CANDLE_TTL):
+                cache_stats['hits'] += 1
+                return window_from_entry(entry, limit)
+
+    if entry is None or entry_size(entry) == 0:
+        capacity = max(KLINE_STORE_CAPACITY, limit)
+        # Disk arşivinde güncele yakın geçmiş varsa oradan yükle - sadece eksik kuyruk indirilir
+        seed = load_recent_rows(symbol, interval, capacity, step)
+        gap = (now_ms - seed[-1][0]) // step if seed else None
+        if seed and gap <= capacity and gap < KLINES_MAX_LIMIT:
+            entry = new_entry(capacity)
+            entry['closed'].extend(seed)
+            with cache_lock:
+                cache_stats['archive_loads'] += 1
+                insert_entry(key, entry)
+
+    if entry is None or entry_size(entry) == 0:
+        # İlk istek: pencereyi tek seferde indir
+        rows = fetch_fn(symbol, interval, min(limit, KLINES_MAX_LIMIT))
+        if rows is None:
+            return None
+        count_download(rows)
+        append_klines(symbol, interval, rows, now_ms)
+        entry = new_entry(capacity)
+        extend_tail(entry, rows, now_ms)
+        entry['history_complete'] = len(rows) < min(limit, KLINES_MAX_LIMIT)
+        with cache_lock:
+            cache_stats['misses'] += 1
+            insert_entry(key, entry)
+            return window_from_entry(entry, limit)
+
+    # Kuyruk: bilinen son mumdan (açık mum ya da son kapanmış mumun ardılı) itibaren
+    if entry['open'] is not None:
+        start_time = entry['open'][0]
+    else:
+        start_time = entry['closed'][-1][0] + step
+    missing = (now_ms - start_time) // step + 1
+    if missing > entry['closed'].maxlen or missing >= KLINES_MAX_LIMIT:
+        # Boşluk tamponun tamamından ya da tek istekten büyük - sıfırdan indir
+        with cache_lock:
+            kline_cache.pop(key, None)
+        return get_cached_klines(symbol, interval, limit, fetch_fn)
+
+    rows = fetch_fn(symbol, interval, missing + 1, start_time=start_time)
+    if rows is None:
+        return None
+    count_download(rows)
+    append_klines(symbol, interval, rows, now_ms)
+
+    with cache_lock:
+        if missing <= 1:
+            cache_stats['refreshes'] += 1
+        else:
+            cache_stats['tail_fetches'] += 1
+        extend_tail(entry, rows, now_ms)
+
+    # Baş: istenen pencere depodakinden uzunsa daha eski mumları endTime ile tamamla
+    if entry_size(entry) < limit and not entry['history_complete'] and entry['closed']:
+        extend_head(entry, symbol, interval, limit, fetch_fn)
+
+    with cache_lock:
+        return window_from_entry(entry, limit)
+
+def extend_head(entry, symbol, interval, limit, fetch_fn):
+    """Tamponun başına eksik eski mumları ekle, gerekirse kapasiteyi büyüt"""
+    need = limit - entry_size(entry)
+    rows = fetch_fn(symbol, interval, min(need, KLINES_MAX_LIMIT),
+                    end_time=entry['closed'][0][0] - 1)
+    if rows is None:
+        return
+    count_download(rows)
+    append_klines(symbol, interval, rows, int(time.time() * 1000))
+
+    with cache_lock:
+        cache_stats['head_fetches'] += 1
+        closed = entry['closed']
+        first_open_time = closed[0][0]
+        older = [row for row in rows if row[0] < first_open_time]
+        if len(older) < min(need, KLINES_MAX_LIMIT):
+            entry['history_complete'] = True
+        capacity = max(closed.maxlen, len(closed) + len(older))
+        if capacity != closed.maxlen:
+            closed = entry['closed'] = deque(closed, maxlen=capacity)
+        closed.extendleft(reversed(older))
+
+def merge_klines(symbol, interval, rows):
+    """
+    Backfill ile indirilen satırları depoya birleştir (sıralı, tekrarsız)
+    Depodaki tamponla arada boşluk kalacaksa birleştirilmez - tampon her zaman günümüze kadar
+    kesintisiz olmalı. Giriş yoksa sadece günümüze ulaşan aralıklar için yeni giriş açılır.
+    Tampon kapasitesi büyütülmez, sadece en yeni mumlar tutulur - uzun aralıklar arşivden / backfill
+    sonucundan servis edilir.
+    Dönüş: birleştirildiyse True
+    """
+    key = (symbol.upper(), interval)
+    step = INTERVAL_MS.get(interval)
+    if step is None or not rows:
+        return False
+
+    now_ms = int(time.time() * 1000)
+    closed_rows, open_row = split_klines(rows, now_ms)
+    first_open_time = rows[0][0]
+    last_open_time = rows[-1][0]
+
+    with cache_lock:
+        entry = kline_cache.get(key)
+        if entry is None or entry_size(entry) == 0:
+            if last_open_time < now_ms - 2 * step:
+                return False
+            entry = new_entry(KLINE_STORE_CAPACITY)
+            entry['closed'].extend(closed_rows)
+            entry['open'] = open_row
+            entry['open_fetched'] = time.monotonic() if open_row is not None else 0.0
+            insert_entry(key, entry)
+            return True
+
+        closed = entry['closed']
+        known_first = closed[0][0] if closed else entry['open'][0]
+        known_last = entry['open'][0] if entry['open'] is not None else closed[-1][0]
+        if last_open_time + step < known_first or first_open_time > known_last + step:
+            return False
+
+        merged = {row[0]: row for row in closed}
+        for row in closed_rows:
+            merged.setdefault(row[0], row)
+        ordered = [merged[open_time] for open_time in sorted(merged)]
+        entry['closed'] = deque(ordered, maxlen=closed.maxlen)
+
+        # Açık mum artık kapanmış olabilir ya da backfill daha yeni bir açık mum getirmiş olabilir
+        if open_row is not None and (entry['open'] is None or open_row[0] >= entry['open'][0]):
+            entry['open'] = open_row
+            entry['open_fetched'] = time.monotonic()
+        elif entry['open'] is not None and ordered and entry['open'][0] <= ordered[-1][0]:
+            entry['open'] = None
+        return True
+
+def apply_stream_kline(symbol, interval, row, is_closed):
+    """
+    WebSocket kline olayını depoya uygula (utils/binance_stream.py)
+    Sadece REST ile doldurulmuş ve boşluksuz devam eden girişler güncellenir;
+    boşluk varsa bir sonraki istek eksik kuyruğu REST ile tamamlar
+    """
+    key = (symbol.upper(), interval)
+    step = INTERVAL_MS.get(interval)
+    with cache_lock:
+        entry = kline_cache.get(key)
+        if entry is None or step is None:
+            return False
+
+        open_row = entry['open']
+        closed = entry['closed']
+        if open_row is not None:
+            expected = open_row[0]
+        elif closed:
+            expected = closed[-1][0] + step
+        else:
+            return False
+
+        if row[0] == expected + step and open_row is not None and open_row[6] < row[0]:
+            # Önceki mumun kapanış olayı kaçmış - son bilinen hali kesin değil, atılır;
+            # boşluk bir sonraki istekte REST ile kapanmış haliyle doldurulur
+            entry['open'] = None
+            return False
+        if row[0] != expected:
+            return False
+
+        history = None
+        if is_closed:
+            closed.append(row)
+            entry['open'] = None
+            # Canlı indikatörler ardışık değilse depodaki geçmişle tamamlanır
+            if live_open_time(symbol, interval) != row[0] - step:
+                history = list(closed)
+        else:
+            entry['open'] = row
+        entry['open_fetched'] = time.monotonic()
+
+    if is_closed:
+        append_klines(symbol, interval, [row], row[6] + 1)
+        update_live_indicators(symbol, interval, row, step, history)
+    return True
+
+def cached_kline_count(symbol, interval):
+    """Depodaki (sembol, interval) mum sayısı (açık mum dahil, giriş yoksa 0)"""
+    with cache_lock:
+        entry = kline_cache.get((symbol.upper(), interval))
+        return entry_size(entry) if entry is not None else 0
+
+def clear_kline_cache():
+    """Depoyu temizle"""
+    with cache_lock:
+        kline_cache.clear()
+
+def get_kline_cache_stats():
+    """Depo istatistikleri"""
+    with cache_lock:
+        served = cache_stats['hits'] + cache_stats['refreshes'] + cache_stats['tail_fetches']
+        total = served + cache_stats['misses']
+        return {
+            'entries': len(kline_cache),
+            'candles': sum(entry_size(entry) for entry in kline_cache.values()),
+            'hits': cache_stats['hits'],
+            'refreshes': cache_stats['refreshes'],
+            'tail_fetches': cache_stats['tail_fetches'],
+            'head_fetches': cache_stats['head_fetches'],
+            'misses': cache_stats['misses'],
+            'evictions': cache_stats['evictions'],
+            'candles_downloaded': cache_stats['candles_downloaded'],
+            'archive_loads': cache_stats['archive_loads'],
+            'hit_rate': served / total if total else 0.0
+        }
+
+if DEBUG_MODE:
+    print("🗃️ Kline cache utils yüklendi!")
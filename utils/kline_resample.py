@@ -0,0 +1,183 @@
+"""
+Kline Resample Utils
+Depodaki taban interval'dan (varsayılan 1h) daha yüksek timeframe'leri yerelde üretme - vektörel
+OHLCV birleştirme (ilk açılış, en yüksek, en düşük, son kapanış, toplam hacim), UTC hizalı kovalar.
+Çoklu timeframe analizi dört ayrı seri yerine tek upstream seriye mal olur.
+"""
+
+import threading
+import time
+import numpy as np
+from config import *
+from utils.binance_rate import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from utils.kline_cache import INTERVAL_MS, KLINES_MAX_LIMIT
+from utils.kline_archive import read_archive
+from utils.kline_backfill import backfill_klines, archive_complete
+from utils.binance_api import get_binance_ohlc_arrays, get_binance_ohlc, klines_to_dataframe
+
+# Binance haftalık mumları Pazartesi 00:00 UTC'de açılır - epoch (1970-01-01) Perşembe olduğu için 4 gün kaydırılır
+BUCKET_OFFSET_MS = {"1w": 4 * 86_400_000}
+
+# Arka planda arşivi ısıtılan (sembol, interval) çiftleri
+archive_warming = set()
+warming_lock = threading.Lock()
+
+def can_resample(base_interval, target_interval):
+    """target_interval, base_interval'ın tam katı mı (1M gibi değişken interval'lar hariç)"""
+    base_step = INTERVAL_MS.get(base_interval)
+    target_step = INTERVAL_MS.get(target_interval)
+    return bool(base_step and target_step and target_step > base_step and target_step % base_step == 0)
+
+def resample_ohlc_arrays(arrays, base_interval, target_interval):
+    """
+    decode_klines formatındaki taban diziden üst timeframe dizileri üret
+    Kovalar UTC'ye (haftalıkta Pazartesi'ye) hizalıdır; seri bir kovanın ortasında başlıyorsa
+    eksik ilk kova atılır. Son kova güncel (açık) mum gibi kısmi olabilir.
+    Dönüş: {'open_time', 'open', 'high', 'low', 'close', 'volume'}
+    """
+    base_step = INTERVAL_MS[base_interval]
+    target_step = INTERVAL_MS[target_interval]
+    offset = BUCKET_OFFSET_MS.get(target_interval, 0)
+
+    open_time = arrays['open_time']
+    if open_time.size == 0:
+        return {field: arrays[field][:0] for field in arrays}
+
+    bucket = (open_time - offset) // target_step
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], open_time.size]
+
+    # Seri kovanın ilk mumundan başlamıyorsa ilk kova eksiktir
+    if open_time[0] != bucket[0] * target_step + offset and starts.size > 1:
+        starts, ends = starts[1:], ends[1:]
+        first = starts[0]
+        arrays = {field: values[first:] for field, values in arrays.items()}
+        bucket = bucket[first:]
+        starts, ends = starts - first, ends - first
+
+    return {
+        'open_time': bucket[starts] * target_step + offset,
+        'open': arrays['open'][starts],
+        'high': np.maximum.reduceat(arrays['high'], starts),
+        'low': np.minimum.reduceat(arrays['low'], starts),
+        'close': arrays['close'][ends - 1],
+        'volume': np.add.reduceat(arrays['volume'], starts)
+    }
+
+def base_limit(base_interval, target_interval, limit):
+    """`limit` üst mum için gereken taban mum sayısı (kısmi ilk kova payı dahil)"""
+    return (limit + 1) * (INTERVAL_MS[target_interval] // INTERVAL_MS[base_interval])
+
+def should_resample(base_interval, target_interval, limit):
+    """
+    Üst timeframe taban seriden mi üretilsin - tek sayfayı aşan taban pencereler (örn. 52 haftalık
+    mum için 8.9 bin saatlik mum) ancak disk arşivinden okunabiliyorsa
+    """
+    return (can_resample(base_interval, target_interval)
+            and (KLINE_ARCHIVE_ENABLED or base_limit(base_interval, target_interval, limit) <= KLINES_MAX_LIMIT))
+
+def warm_archive(symbol, interval, start_time):
+    """Arşivi arka planda backfill ile doldur (çift başına tek thread) - sonraki istekler arşivden okur"""
+    key = (symbol.upper(), interval)
+    with warming_lock:
+        if key in archive_warming:
+            return
+        archive_warming.add(key)
+
+    def run():
+        try:
+            backfill_klines(symbol, interval, start_time, priority=PRIORITY_BACKGROUND, store=False)
+        finally:
+            with warming_lock:
+                archive_warming.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+def get_base_arrays(symbol, base_interval, count, priority=PRIORITY_INTERACTIVE):
+    """
+    Taban serinin son `count` mumu (açık mum dahil)
+    Tek sayfalık pencereler kline deposundan; daha uzunları arşivden kopyasız okunur ve sadece
+    arşivin son mumundan sonraki kuyruk depodan alınır. Arşiv soğuksa (eksik) None döner ve
+    arşiv arka planda ısıtılır - çağıran bu ilk seferde doğrudan indirmeye düşer
+    """
+    if count <= KLINES_MAX_LIMIT or not KLINE_ARCHIVE_ENABLED:
+        return get_binance_ohlc_arrays(symbol, base_interval, count, priority)
+
+    step = INTERVAL_MS[base_interval]
+    now_ms = int(time.time() * 1000)
+    current = now_ms - now_ms % step
+    start_time = current - (count - 1) * step
+    archived = read_archive(symbol, base_interval, start_time, current - step)
+    if (archived is None or len(archived['open_time']) == 0
+            or not archive_complete(symbol, base_interval, start_time, int(archived['open_time'][-1]) + step - 1)
+            or (current - archived['open_time'][-1]) // step >= KLINES_MAX_LIMIT):
+        warm_archive(symbol, base_interval, start_time)
+        return None
+
+    last_archived = int(archived['open_time'][-1])
+    tail = get_binance_ohlc_arrays(symbol, base_interval, (current - last_archived) // step + 1, priority)
+    if tail is None:
+        return None
+    newer = tail['open_time'] > last_archived
+    return {field: np.concatenate((np.asarray(archived[field]), values[newer])) for field, values in tail.items()}
+
+def take_last(arrays, limit):
+    """Dizilerin son `limit` elemanı"""
+    return {field: values[-limit:] for field, values in arrays.items()}
+
+def get_resampled_ohlc_arrays(symbol, interval="1d", limit=100, base_interval=RESAMPLE_BASE_INTERVAL,
+                              priority=PRIORITY_INTERACTIVE):
+    """
+    Üst timeframe OHLCV'yi depodaki taban seriden üret (NumPy dizileri)
+    Taban seriden türetilemeyen interval'lar (taban ile aynı, 1M vb.) ve arşivi henüz soğuk uzun
+    pencereler doğrudan indirilir
+    """
+    if not should_resample(base_interval, interval, limit):
+        return get_binance_ohlc_arrays(symbol, interval, limit, priority)
+    need = base_limit(base_interval, interval, limit)
+    base = get_base_arrays(symbol, base_interval, need, priority)
+    if base is None:
+        return get_binance_ohlc_arrays(symbol, interval, limit, priority) if need > KLINES_MAX_LIMIT else None
+    return take_last(resample_ohlc_arrays(base, base_interval, interval), limit)
+
+def get_resampled_ohlc(symbol, interval="1d", limit=100, base_interval=RESAMPLE_BASE_INTERVAL,
+                       priority=PRIORITY_INTERACTIVE):
+    """Üst timeframe OHLCV (DataFrame) - get_binance_ohlc ile aynı format"""
+    arrays = get_resampled_ohlc_arrays(symbol, interval, limit, base_interval, priority)
+    if arrays is None:
+        return None
+    return klines_to_dataframe(arrays)
+
+def get_multi_timeframe_ohlc(symbol, limits, base_interval=RESAMPLE_BASE_INTERVAL, priority=PRIORITY_INTERACTIVE):
+    """
+    Birden fazla timeframe için OHLCV - taban seri sadece bir kez (en uzun pencereyle) alınır;
+    uzun pencere arşivden okunur, arşiv soğuksa türetilen timeframe'ler bu sefer doğrudan indirilir
+    limits: {interval: mum sayısı}. Dönüş: {interval: DataFrame}, alınamayanlar atlanır
+    """
+    derived = [tf for tf in limits if should_resample(base_interval, tf, limits[tf])]
+    need = max([base_limit(base_interval, tf, limits[tf]) for tf in derived] +
+               [limits.get(base_interval, 0)])
+
+    frames = {}
+    base = get_base_arrays(symbol, base_interval, need, priority) if need else None
+    if base is None and need > KLINES_MAX_LIMIT:
+        # Arşiv soğuk - sadece tek sayfalık taban pencereye sığanlar türetilir, kalanlar doğrudan indirilir
+        derived = [tf for tf in derived if base_limit(base_interval, tf, limits[tf]) <= KLINES_MAX_LIMIT]
+        need = max([base_limit(base_interval, tf, limits[tf]) for tf in derived] +
+                   [limits.get(base_interval, 0)])
+        base = get_binance_ohlc_arrays(symbol, base_interval, need, priority) if need else None
+    for tf, limit in limits.items():
+        if tf in derived:
+            if base is not None:
+                frames[tf] = klines_to_dataframe(take_last(resample_ohlc_arrays(base, base_interval, tf), limit))
+        elif tf == base_interval:
+            if base is not None:
+                frames[tf] = klines_to_dataframe(take_last(base, limit))
+        else:
+            df = get_binance_ohlc(symbol, interval=tf, limit=limit, priority=priority)
+            if df is not None:
+                frames[tf] = df
+    return frames
+
+if DEBUG_MODE:
+    print("🧮 Kline resample utils yüklendi!")
@@ -613,12 +613,15 @@ def add_liquidity_command_to_bot(bot):
             coin_input = parts[1].lower()
             
             # Binance sembolü bul
-            from utils.binance_api import find_binance_symbol
+            from utils.binance_api import find_binance_symbol, suggest_binance_symbols
             binance_symbol = find_binance_symbol(coin_input)
             
             if not binance_symbol:
+                suggestions = suggest_binance_symbols(coin_input)
+                hint = ", ".join(f"/likidite {key}" for key, _ in suggestions)
                 bot.send_message(message.chat.id, 
-                    f"❌ '{coin_input.upper()}' bulunamadı!")
+                    f"❌ '{coin_input.upper()}' bulunamadı!" +
+                    (f"\n🤔 Bunu mu demek istediniz: {hint}" if hint else ""))
                 return
 
             bot.send_message(message.chat.id, 
@@ -0,0 +1,265 @@
+"""
+Market Scanner Utils
+Tüm USDT pariteleri için arka planda yenilenen, önceden hesaplanmış indikatör tablosu -
+kapanışlar (zaman x sembol) matrisine dizilir, indikatörler utils/indicators.py motorunda
+kolon bazında tek seferde hesaplanır. /tara sorguları ağa çıkmadan milisaniyede cevaplanır.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config import *
+from utils.binance_rate import PRIORITY_LOW
+from utils import binance_api
+from utils.binance_api import fetch_binance_klines, decode_klines, KLINE_FIELDS
+from utils.indicators import get_indicators
+
+# Sorgu metrikleri (rsi<30, degisim>5 ...) -> tablo kolonu
+SCAN_METRICS = {'rsi': 'rsi', 'degisim': 'change', 'hacim': 'volume_ratio', 'fiyat': 'price',
+                'macd': 'histogram'}
+# Sinyal anahtar kelimeleri -> (tablo sinyali, sıralama kolonu); kurallar generate_trading_signals ile aynı
+SCAN_SIGNALS = {
+    'al': ('buy', 'buy_count'), 'sat': ('sell', 'sell_count'),
+    'rsi_al': ('rsi_oversold', 'buy_count'), 'rsi_sat': ('rsi_overbought', 'sell_count'),
+    'macd_al': ('macd_cross_up', 'buy_count'), 'macd_sat': ('macd_cross_down', 'sell_count'),
+    'bb_alt': ('below_bb', 'buy_count'), 'bb_ust': ('above_bb', 'sell_count')
+}
+# Tek tek kural sinyalleri (sonuçlarda gösterilir)
+RULE_SIGNALS = ('rsi_oversold', 'rsi_overbought', 'macd_cross_up', 'macd_cross_down', 'below_bb', 'above_bb')
+SCAN_CONDITION = re.compile(r'^([a-z_]+)(<=|>=|<|>)(-?\d+(?:\.\d+)?)$')
+
+# Global durum - her interval için tablo, her yenilemede yeni dict oluşturulup tek atamayla değiştirilir
+# {interval: {'symbols': [SYMBOL], 'index': {SYMBOL: kolon}, 'updated': zaman, 'price', 'change', 'rsi',
+#             'macd', 'macd_signal', 'histogram', 'bb_upper', 'bb_lower', 'volume_ratio',
+#             'buy_count', 'sell_count': np.ndarray, 'signals': {sinyal: bool np.ndarray}}}
+scanner_tables = {}
+scanner_thread = None
+scanner_running = False
+scanner_stats = {'refreshes': 0, 'errors': 0, 'skipped_symbols': 0, 'queries': 0,
+                 'last_refresh_seconds': None}
+
+def scanner_symbols():
+    """Taranacak USDT pariteleri (sembol tablosundan, tekrarsız)"""
+    return sorted({symbol for symbol in binance_api.BINANCE_SYMBOLS.values() if symbol.endswith("USDT")})
+
+def fetch_scanner_klines(symbol, interval):
+    """Sembolün son SCANNER_CANDLES mumu (düşük öncelik - ağırlık doluysa None)"""
+    rows = fetch_binance_klines(symbol, interval, SCANNER_CANDLES, priority=PRIORITY_LOW)
+    if not rows or len(rows) < SCANNER_CANDLES:
+        return None  # Alınamadı ya da yeterli geçmişi yok
+    return decode_klines(rows)
+
+def stack_columns(fetched):
+    """
+    Sembol dizilerini (zaman x sembol) matrislerine diz - son mumu çoğunluktan farklı
+    (işlemi durmuş vb.) semboller atlanır ki satırlar aynı zamana denk gelsin
+    Dönüş: (semboller, {'open', 'high', 'low', 'close', 'volume': 2D np.ndarray})
+    """
+    current = Counter(int(arrays['open_time'][-1]) for _, arrays in fetched).most_common(1)[0][0]
+    aligned = [(symbol, arrays) for symbol, arrays in fetched if arrays['open_time'][-1] == current]
+    symbols = [symbol for symbol, _ in aligned]
+    matrices = {field: np.column_stack([arrays[field] for _, arrays in aligned]) for field in KLINE_FIELDS}
+    return symbols, matrices
+
+def build_scanner_table(symbols, matrices):
+    """Matrislerden son muma ait indikatör ve sinyal kolonlarını hesapla"""
+    indicators = get_indicators(matrices, ('rsi', 'macd', 'bb', 'volume_sma_20'))
+    close = matrices['close']
+    macd_line = indicators['macd']['macd']
+    signal_line = indicators['macd']['signal']
+    average_volume = indicators['volume_sma_20'][-1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (close[-1] / close[-2] - 1) * 100
+        volume_ratio = np.where(average_volume > 0, matrices['volume'][-1] / average_volume, 1.0)
+
+    rsi = indicators['rsi'][-1]
+    price = close[-1]
+    bb_upper = indicators['bb']['upper'][-1]
+    bb_lower = indicators['bb']['lower'][-1]
+    signals = {
+        'rsi_oversold': rsi < 30,
+        'rsi_overbought': rsi > 70,
+        'macd_cross_up': (macd_line[-1] > signal_line[-1]) & (macd_line[-2] <= signal_line[-2]),
+        'macd_cross_down': (macd_line[-1] < signal_line[-1]) & (macd_line[-2] >= signal_line[-2]),
+        'below_bb': price < bb_lower,
+        'above_bb': price > bb_upper
+    }
+    buy_count = (signals['rsi_oversold'].astype(np.int64) + signals['macd_cross_up'] + signals['below_bb'])
+    sell_count = (signals['rsi_overbought'].astype(np.int64) + signals['macd_cross_down'] + signals['above_bb'])
+    signals['buy'] = buy_count > 0
+    signals['sell'] = sell_count > 0
+
+    return {
+        'symbols': symbols,
+        'index': {symbol: i for i, symbol in enumerate(symbols)},
+        'updated': time.time(),
+        'price': price,
+        'change': change,
+        'rsi': rsi,
+        'macd': macd_line[-1],
+        'macd_signal': signal_line[-1],
+        'histogram': indicators['macd']['histogram'][-1],
+        'bb_upper': bb_upper,
+        'bb_lower': bb_lower,
+        'volume_ratio': volume_ratio,
+        'buy_count': buy_count,
+        'sell_count': sell_count,
+        'signals': signals
+    }
+
+def refresh_scanner_table(interval):
+    """Tüm USDT pariteleri için mumları paralel indir ve interval tablosunu değiştir"""
+    try:
+        start = time.perf_counter()
+        symbols = scanner_symbols()
+        if not symbols:
+            return False
+        with ThreadPoolExecutor(max_workers=SCANNER_WORKERS) as pool:
+            results = list(pool.map(lambda s: fetch_scanner_klines(s, interval), symbols))
+        fetched = [(symbol, arrays) for symbol, arrays in zip(symbols, results) if arrays is not None]
+        scanner_stats['skipped_symbols'] += len(symbols) - len(fetched)
+        if not fetched:
+            scanner_stats['errors'] += 1
+            return False
+
+        scanner_tables[interval] = build_scanner_table(*stack_columns(fetched))
+        scanner_stats['refreshes'] += 1
+        scanner_stats['last_refresh_seconds'] = time.perf_counter() - start
+        return True
+    except Exception as e:
+        scanner_stats['errors'] += 1
+        print(f"❌ Tarayıcı tablosu hatası ({interval}): {e}")
+        return False
+
+def get_scanner_table(interval):
+    """Interval'ın güncel tablosu (henüz oluşmadıysa None)"""
+    return scanner_tables.get(interval)
+
+# =============================================================================
+# SORGULAR
+# =============================================================================
+
+def parse_scan_query(tokens):
+    """
+    /tara argümanlarını çöz - ['rsi<30', 'macd_al', '4h'] gibi
+    Dönüş: (interval, [('metric', kolon, operatör, eşik) | ('signal', sinyal, sıralama kolonu)])
+    Hatalı argümanda ValueError
+    """
+    interval = SCANNER_INTERVALS[0]
+    conditions = []
+    for token in tokens:
+        token = token.lower()
+        if token in SCANNER_INTERVALS:
+            interval = token
+        elif token in SCAN_SIGNALS:
+            conditions.append(('signal',) + SCAN_SIGNALS[token])
+        else:
+            match = SCAN_CONDITION.match(token)
+            if not match or match.group(1) not in SCAN_METRICS:
+                raise ValueError(f"Anlaşılamayan koşul: {token}")
+            name, operator, threshold = match.groups()
+            conditions.append(('metric', SCAN_METRICS[name], operator, float(threshold)))
+    if not conditions:
+        raise ValueError("En az bir koşul gerekli")
+    return interval, conditions
+
+def condition_mask(table, condition):
+    """Koşulun tablo üzerindeki maskesi (NaN değerler eşleşmez)"""
+    if condition[0] == 'signal':
+        return table['signals'][condition[1]]
+    _, column, operator, threshold = condition
+    values = table[column]
+    with np.errstate(invalid='ignore'):
+        if operator == '<':
+            return values < threshold
+        if operator == '<=':
+            return values <= threshold
+        if operator == '>':
+            return values > threshold
+        return values >= threshold
+
+def scan_market(interval, conditions, count=SCANNER_RESULT_COUNT):
+    """
+    Koşulların hepsini sağlayan pariteler - tablo üzerinde vektörel maske, ağ isteği yok
+    Sıralama ilk koşula göre: '<' artan, '>' azalan, sinyallerde sinyal sayısı azalan
+    Dönüş: {'matches': [satır dict], 'total', 'scanned', 'age_seconds', 'elapsed_ms'} ya da tablo yoksa None
+    """
+    table = get_scanner_table(interval)
+    if table is None:
+        return None
+    start = time.perf_counter()
+    scanner_stats['queries'] += 1
+
+    mask = np.ones(len(table['symbols']), dtype=bool)
+    for condition in conditions:
+        mask &= condition_mask(table, condition)
+    rows = np.flatnonzero(mask)
+
+    first = conditions[0]
+    if first[0] == 'signal':
+        key = -table[first[2]][rows]
+    else:
+        key = table[first[1]][rows] if first[2] in ('<', '<=') else -table[first[1]][rows]
+    rows = rows[np.argsort(key, kind='stable')][:count]
+
+    matches = [{
+        'symbol': table['symbols'][row],
+        'price': float(table['price'][row]),
+        'change': float(table['change'][row]),
+        'rsi': float(table['rsi'][row]),
+        'volume_ratio': float(table['volume_ratio'][row]),
+        'signals': [name for name in RULE_SIGNALS if table['signals'][name][row]]
+    } for row in rows]
+
+    return {
+        'matches': matches,
+        'total': int(mask.sum()),
+        'scanned': len(table['symbols']),
+        'age_seconds': time.time() - table['updated'],
+        'elapsed_ms': (time.perf_counter() - start) * 1000
+    }
+
+# =============================================================================
+# ARKA PLAN YENİLEME
+# =============================================================================
+
+def scanner_loop():
+    """Tabloları periyodik olarak yenile (ilk tur hemen)"""
+    while scanner_running:
+        for interval in SCANNER_INTERVALS:
+            if scanner_running:
+                refresh_scanner_table(interval)
+        time.sleep(SCANNER_REFRESH_INTERVAL)
+
+def start_market_scanner():
+    """Tarayıcı yenileme thread'ini başlat (ilk tablo arka planda oluşur, açılışı bekletmez)"""
+    global scanner_thread, scanner_running
+
+    if scanner_running or not SCANNER_ENABLED:
+        return False
+
+    scanner_running = True
+    scanner_thread = threading.Thread(target=scanner_loop, daemon=True)
+    scanner_thread.start()
+    print(f"✅ Piyasa tarayıcı başladı! ({', '.join(SCANNER_INTERVALS)} - her {SCANNER_REFRESH_INTERVAL} saniyede)")
+    return True
+
+def stop_market_scanner():
+    """Yenileme thread'ini durdur"""
+    global scanner_running
+    scanner_running = False
+
+def get_market_scanner_stats():
+    """Tarayıcı istatistikleri"""
+    return {
+        'running': scanner_running,
+        'tables': {interval: len(table['symbols']) for interval, table in scanner_tables.items()},
+        **scanner_stats
+    }
+
+if DEBUG_MODE:
+    print("🔭 Market scanner utils yüklendi!")
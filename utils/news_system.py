@@ -3,13 +3,13 @@ Otomatik Telegram Kanal Haber Sistemi
 @primecrypto_tr kanalından otomatik haber çekme ve kullanıcılara gönderme
 """
 
-import requests
 import time
 import threading
 from datetime import datetime
 import json
 import os
-from config import TELEGRAM_TOKEN
+from config import TELEGRAM_TOKEN, TELEGRAM_TIMEOUT
+from utils.http_client import http_get, http_post
 
 # Global değişkenler
 CHANNEL_USERNAME = "primecrypto_tr"
@@ -67,7 +67,7 @@ def get_channel_info():
         url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getChat"
         params = {"chat_id": f"@{CHANNEL_USERNAME}"}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=TELEGRAM_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             if data['ok']:
@@ -102,7 +102,7 @@ def get_channel_updates():
         if last_message_id:
             params["offset"] = last_message_id + 1
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=TELEGRAM_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             if data['ok']:
@@ -179,7 +179,7 @@ def send_news_to_users(formatted_message):
                 "disable_web_page_preview": False
             }
             
-            response = requests.post(url, json=data, timeout=10)
+            response = http_post(url, json=data, timeout=TELEGRAM_TIMEOUT)
             
             if response.status_code == 200:
                 result = response.json()
@@ -0,0 +1,69 @@
+"""
+Single-Flight Utils
+Aynı anda gelen özdeş upstream çağrılarını birleştirme - ilk gelen isteği atar,
+aynı anahtarla bekleyenler onun sonucunu paylaşır
+"""
+
+import threading
+from config import *
+
+# Global değişkenler
+# {anahtar: {'event': threading.Event, 'result': sonuç, 'error': istisna, 'waiters': sayı}}
+inflight_calls = {}
+inflight_lock = threading.Lock()
+singleflight_stats = {'calls': 0, 'coalesced': 0, 'by_source': {}}
+
+def singleflight_call(key, fn, *args, **kwargs):
+    """
+    fn(*args, **kwargs) çağrısını anahtar bazında tekilleştir
+    key: hashable tuple, ilk elemanı kaynak adı (istatistik için), örn. ('klines', 'BTCUSDT', '1h', 168)
+    Aynı anahtarla süren bir çağrı varsa yeni istek atılmaz, onun sonucu (ya da hatası) döner
+    """
+    source = key[0] if isinstance(key, tuple) else key
+    with inflight_lock:
+        singleflight_stats['calls'] += 1
+        source_stats = singleflight_stats['by_source'].setdefault(source, {'calls': 0, 'coalesced': 0})
+        source_stats['calls'] += 1
+
+        call = inflight_calls.get(key)
+        if call is not None:
+            call['waiters'] += 1
+            singleflight_stats['coalesced'] += 1
+            source_stats['coalesced'] += 1
+            leader = False
+        else:
+            call = inflight_calls[key] = {'event': threading.Event(), 'result': None,
+                                          'error': None, 'waiters': 0}
+            leader = True
+
+    if not leader:
+        call['event'].wait()
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
+
+    try:
+        call['result'] = fn(*args, **kwargs)
+        return call['result']
+    except Exception as e:
+        call['error'] = e
+        raise
+    finally:
+        with inflight_lock:
+            inflight_calls.pop(key, None)
+        call['event'].set()
+
+def get_singleflight_stats():
+    """Birleştirme istatistikleri - coalesced: atılmayan (paylaşılan) istek sayısı"""
+    with inflight_lock:
+        calls = singleflight_stats['calls']
+        return {
+            'calls': calls,
+            'coalesced': singleflight_stats['coalesced'],
+            'saved_pct': singleflight_stats['coalesced'] / calls * 100 if calls else 0.0,
+            'inflight': len(inflight_calls),
+            'by_source': {source: dict(stats) for source, stats in singleflight_stats['by_source'].items()}
+        }
+
+if DEBUG_MODE:
+    print("🛫 Single-flight utils yüklendi!")
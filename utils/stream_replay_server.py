@@ -0,0 +1,251 @@
+"""
+Stream Replay Server
+Binance combined stream'ini taklit eden yerel WebSocket sunucusu (sadece standart kütüphane)
+Akış modunu internetsiz test etmek için:
+    python -m utils.stream_replay_server [kayıt.jsonl] [--port 8765] [--speed 1.0]
+config.py: BINANCE_STREAM_ENABLED = True, BINANCE_WS_URL = "ws://127.0.0.1:8765/stream"
+
+Kayıt dosyası verilirse (BINANCE_STREAM_RECORD_FILE ile alınmış) mesajlar abone olunan akışlar
+için döngüyle tekrar oynatılır; verilmezse abone olunan semboller için rastgele yürüyüş
+fiyatlarıyla miniTicker ve kline olayları üretilir.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import socketserver
+import struct
+import sys
+import threading
+import time
+from utils.kline_cache import INTERVAL_MS
+
+WS_MAGIC = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# =============================================================================
+# WEBSOCKET ÇERÇEVELERİ
+# =============================================================================
+
+def encode_frame(payload, opcode=0x1):
+    """Sunucu -> istemci çerçevesi (maskesiz)"""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+def read_exact(rfile, count):
+    """Soketten tam `count` bayt oku"""
+    data = rfile.read(count)
+    if len(data) < count:
+        raise ConnectionError("Bağlantı kapandı")
+    return data
+
+def read_frame(rfile):
+    """İstemci -> sunucu çerçevesini oku (maskeli) - (opcode, payload) döner"""
+    first, second = read_exact(rfile, 2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", read_exact(rfile, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", read_exact(rfile, 8))[0]
+    mask = read_exact(rfile, 4) if second & 0x80 else None
+    payload = read_exact(rfile, length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+# =============================================================================
+# OLAY KAYNAKLARI
+# =============================================================================
+
+def load_recording(path):
+    """Kayıt dosyasını akış adına göre grupla: {akış adı: [mesaj, ...]}"""
+    recording = {}
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if 'stream' in message:
+                recording.setdefault(message['stream'], []).append(line.strip())
+    return recording
+
+def kline_message(stream, symbol, interval, step, candle, closed, now_ms):
+    """Mum durumundan combined stream kline mesajı oluştur"""
+    k = {"t": candle['t'], "T": candle['t'] + step - 1, "s": symbol, "i": interval,
+         "o": f"{candle['o']:.8f}", "c": f"{candle['c']:.8f}", "h": f"{candle['h']:.8f}",
+         "l": f"{candle['l']:.8f}", "v": "10.0", "n": 100, "x": closed,
+         "q": f"{candle['c'] * 10:.2f}", "V": "5.0", "Q": f"{candle['c'] * 5:.2f}"}
+    return json.dumps({"stream": stream, "data": {"e": "kline", "E": now_ms, "s": symbol, "k": k}})
+
+def synthetic_events(stream, state, now_ms):
+    """Kayıt yoksa akış için sahte olay üret (rastgele yürüyüş)"""
+    symbol = stream.split('@')[0].upper()
+    ticker = state.setdefault(symbol, {'price': random.uniform(1, 50000), 'open': None})
+    ticker['price'] *= 1 + random.gauss(0, 0.0005)
+    last = ticker['price']
+    if ticker['open'] is None:
+        ticker['open'] = last
+
+    if stream.endswith('@miniTicker'):
+        data = {"e": "24hrMiniTicker", "E": now_ms, "s": symbol, "c": f"{last:.8f}",
+                "o": f"{ticker['open']:.8f}", "h": f"{max(last, ticker['open']) * 1.01:.8f}",
+                "l": f"{min(last, ticker['open']) * 0.99:.8f}", "v": "1000.0", "q": f"{last * 1000:.2f}"}
+        return [json.dumps({"stream": stream, "data": data})]
+
+    interval = stream.split('@kline_')[1]
+    step = INTERVAL_MS.get(interval)
+    if step is None:
+        return []
+    start = now_ms // step * step
+    candle = state.get(stream)
+    events = []
+
+    # Önceki mum kapandıysa son halini x=True ile gönder
+    if candle is not None and candle['t'] != start:
+        events.append(kline_message(stream, symbol, interval, step, candle, True, now_ms))
+        candle = None
+    if candle is None:
+        candle = state[stream] = {'t': start, 'o': last, 'h': last, 'l': last, 'c': last}
+
+    candle['h'] = max(candle['h'], last)
+    candle['l'] = min(candle['l'], last)
+    candle['c'] = last
+    events.append(kline_message(stream, symbol, interval, step, candle, False, now_ms))
+    return events
+
+# =============================================================================
+# SUNUCU
+# =============================================================================
+
+class ReplayHandler(socketserver.StreamRequestHandler):
+    """Tek istemci bağlantısı: el sıkışma, abonelik mesajları ve yayın"""
+
+    def handshake(self):
+        request_line = self.rfile.readline()
+        headers = {}
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                break
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        key = headers.get('sec-websocket-key')
+        if not key:
+            self.wfile.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return False
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_MAGIC).encode()).digest()).decode()
+        self.wfile.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                          "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                          f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        return bool(request_line)
+
+    def send(self, payload, opcode=0x1):
+        with self.send_lock:
+            self.wfile.write(encode_frame(payload, opcode))
+            self.wfile.flush()
+
+    def reader(self):
+        """İstemci mesajlarını oku (SUBSCRIBE/UNSUBSCRIBE, ping, close)"""
+        try:
+            while self.open:
+                opcode, payload = read_frame(self.rfile)
+                if opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    self.send(payload, 0xA)
+                    continue
+                if opcode != 0x1:
+                    continue
+                request = json.loads(payload)
+                params = request.get('params', [])
+                with self.streams_lock:
+                    if request.get('method') == 'SUBSCRIBE':
+                        self.streams.update(params)
+                    elif request.get('method') == 'UNSUBSCRIBE':
+                        self.streams.difference_update(params)
+                self.send(json.dumps({"result": None, "id": request.get('id')}))
+                print(f"🔁 {request.get('method')}: {', '.join(params)}")
+        except (ConnectionError, OSError, ValueError):
+            pass
+        self.open = False
+
+    def handle(self):
+        if not self.handshake():
+            return
+
+        self.open = True
+        self.send_lock = threading.Lock()
+        self.streams_lock = threading.Lock()
+        self.streams = set()
+        threading.Thread(target=self.reader, daemon=True).start()
+
+        recording = self.server.recording
+        positions = {}
+        state = {}
+        print(f"🔌 İstemci bağlandı: {self.client_address[0]}")
+
+        try:
+            while self.open:
+                with self.streams_lock:
+                    streams = sorted(self.streams)
+                now_ms = int(time.time() * 1000)
+                for stream in streams:
+                    if recording is not None:
+                        messages = recording.get(stream)
+                        if not messages:
+                            continue
+                        pos = positions.get(stream, 0)
+                        self.send(messages[pos % len(messages)])
+                        positions[stream] = pos + 1
+                    else:
+                        for message in synthetic_events(stream, state, now_ms):
+                            self.send(message)
+                time.sleep(1.0 / self.server.speed)
+        except (ConnectionError, OSError):
+            pass
+        self.open = False
+        print(f"🔌 İstemci ayrıldı: {self.client_address[0]}")
+
+class ReplayServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def run_replay_server(recording_file=None, host="127.0.0.1", port=8765, speed=1.0):
+    """Replay sunucusunu başlat (bloklar)"""
+    server = ReplayServer((host, port), ReplayHandler)
+    server.recording = load_recording(recording_file) if recording_file else None
+    server.speed = speed
+    source = recording_file or "sentetik veri"
+    print(f"📼 Replay sunucusu: ws://{host}:{port}/stream ({source})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {'--port': 8765, '--speed': 1.0, '--host': "127.0.0.1"}
+    recording_file = None
+    i = 0
+    while i < len(args):
+        if args[i] in options:
+            options[args[i]] = type(options[args[i]])(args[i + 1])
+            i += 2
+        else:
+            recording_file = args[i]
+            i += 1
+    run_replay_server(recording_file, options['--host'], options['--port'], options['--speed'])
@@ -0,0 +1,406 @@
+"""
+Streaming Indicators Utils
+Mum kapandıkça O(1) güncellenen durumlu indikatörler - SMA, EMA, MACD, Bollinger, Stochastic,
+RSI (basit ortalama ve Wilder). Durumlar düz dict'tir (JSON'a yazılabilir), yeniden başlatmada
+diskten yüklenip kaldığı yerden devam eder. Gerçek zamanlı sinyal ve indikatör alarmları için temel.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from config import *
+from utils.indicators import INDICATOR_ALIASES
+
+NAN = float('nan')
+
+# Canlı durumlar - kline akışında kapanan her mumla güncellenir, kapanışta diske yazılır
+# {"SYMBOL:interval": {'open_time': son işlenen mumun open_time'ı, 'states': {ad: durum}, 'values': {ad: değer}}}
+live_indicators = {}
+live_lock = threading.Lock()
+live_stats = {'updates': 0, 'catch_ups': 0, 'warm_ups': 0}
+
+# =============================================================================
+# TEMEL DURUMLAR
+# =============================================================================
+
+def new_window(size):
+    """Sabit boyutlu halka tampon (JSON uyumlu liste + yazma konumu)"""
+    return {'size': size, 'values': [], 'pos': 0}
+
+def window_push(window, value):
+    """Tampona ekle - dolu ise en eski değeri döndür (yoksa None)"""
+    values = window['values']
+    if len(values) < window['size']:
+        values.append(value)
+        return None
+    old = values[window['pos']]
+    values[window['pos']] = value
+    window['pos'] = (window['pos'] + 1) % window['size']
+    return old
+
+def new_sma_state(window):
+    return {'kind': 'sma', 'buffer': new_window(window), 'sum': 0.0, 'nans': 0}
+
+def update_sma(state, value):
+    """Basit hareketli ortalama - tampon dolana kadar ve pencerede NaN varken NaN (pandas rolling gibi)"""
+    buffer = state['buffer']
+    old = window_push(buffer, value)
+    for item, sign in ((value, 1), (old, -1)):
+        if item is None:
+            continue
+        if math.isnan(item):
+            state['nans'] += sign
+        else:
+            state['sum'] += sign * item
+    if buffer['pos'] == 0 and len(buffer['values']) == buffer['size']:
+        # Her tam turda toplamı yeniden hesapla (kayan nokta birikimi olmasın) - amortize O(1)
+        state['sum'] = math.fsum(v for v in buffer['values'] if not math.isnan(v))
+    if len(buffer['values']) < buffer['size'] or state['nans']:
+        return NAN
+    return state['sum'] / buffer['size']
+
+def new_ema_state(span):
+    return {'kind': 'ema', 'decay': 1.0 - 2.0 / (span + 1.0), 'num': 0.0, 'den': 0.0}
+
+def update_ema(state, value):
+    """pandas ewm(span).mean() (adjust=True) ile aynı: ağırlıklı toplam / ağırlık toplamı"""
+    state['num'] = value + state['decay'] * state['num']
+    state['den'] = 1.0 + state['decay'] * state['den']
+    return state['num'] / state['den']
+
+def new_extreme_state(window, mode):
+    """Kayan pencere max/min - monoton kuyruk [(sıra, değer)]"""
+    return {'kind': mode, 'window': window, 'queue': [], 'head': 0, 'count': 0}
+
+def update_extreme(state, value):
+    """Kayan max/min - amortize O(1), pencere dolana kadar NaN"""
+    queue = state['queue']
+    index = state['count']
+    state['count'] += 1
+    better = (lambda a, b: a >= b) if state['kind'] == 'max' else (lambda a, b: a <= b)
+    while len(queue) > state['head'] and better(value, queue[-1][1]):
+        queue.pop()
+    queue.append([index, value])
+    while queue[state['head']][0] <= index - state['window']:
+        state['head'] += 1
+    if state['head'] > 64 and state['head'] * 2 > len(queue):
+        # Tüketilmiş baş kısmı ara sıra at (liste sınırsız büyümesin)
+        del queue[:state['head']]
+        state['head'] = 0
+    if state['count'] < state['window']:
+        return NAN
+    return queue[state['head']][1]
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """Ortalama kazanç/kayıptan RSI (NumPy ile aynı: kayıp 0 ise 100, ikisi de 0 ise NaN)"""
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else NAN
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+# =============================================================================
+# İNDİKATÖRLER
+# =============================================================================
+
+def new_indicator_state(name):
+    """
+    Ada göre boş durum - utils/indicators.py ile aynı adlar:
+    'rsi'/'rsi_14' (basit ortalama), 'rsiw_14' (Wilder), 'sma_20', 'ema_12', 'macd', 'bb', 'stochastic'
+    """
+    kind, *params = INDICATOR_ALIASES.get(name, name).split('_')
+    params = [float(p) if '.' in p else int(p) for p in params]
+    state = {'name': name, 'kind': kind, 'params': params, 'prev_close': None}
+    if kind == 'sma':
+        state['sma'] = new_sma_state(params[0])
+    elif kind == 'ema':
+        state['ema'] = new_ema_state(params[0])
+    elif kind == 'rsi':
+        state['gain'] = new_sma_state(params[0])
+        state['loss'] = new_sma_state(params[0])
+    elif kind == 'rsiw':
+        state.update({'seen': 0, 'gain_sum': 0.0, 'loss_sum': 0.0, 'avg_gain': None, 'avg_loss': None})
+    elif kind == 'macd':
+        fast, slow, signal = params
+        state.update({'fast': new_ema_state(fast), 'slow': new_ema_state(slow), 'signal': new_ema_state(signal)})
+    elif kind == 'bb':
+        state.update({'buffer': new_window(params[0]), 'mean': 0.0, 'm2': 0.0})
+    elif kind == 'stoch':
+        k_period, d_period = params
+        state.update({'high': new_extreme_state(k_period, 'max'), 'low': new_extreme_state(k_period, 'min'),
+                      'd': new_sma_state(d_period)})
+    else:
+        raise ValueError(f"Akış versiyonu olmayan indikatör: {name}")
+    return state
+
+def update_bollinger(state, value):
+    """Bollinger - kayan ortalama/varyans (Welford ekle-çıkar), ddof=1"""
+    window, num_std = state['params']
+    buffer = state['buffer']
+    old = window_push(buffer, value)
+    count = len(buffer['values'])
+    if old is None:
+        delta = value - state['mean']
+        state['mean'] += delta / count
+        state['m2'] += delta * (value - state['mean'])
+    else:
+        old_mean = state['mean']
+        state['mean'] += (value - old) / count
+        state['m2'] += (value - old) * (value - state['mean'] + old - old_mean)
+    if buffer['pos'] == 0 and count == window:
+        # Her tam turda tam hesap - birikmiş yuvarlama hatası sıfırlanır
+        values = buffer['values']
+        state['mean'] = math.fsum(values) / count
+        state['m2'] = math.fsum((v - state['mean']) ** 2 for v in values)
+    if count < window:
+        return {'upper': NAN, 'middle': NAN, 'lower': NAN}
+    std = math.sqrt(max(state['m2'], 0.0) / (count - 1)) if count > 1 else NAN
+    return {'upper': state['mean'] + std * num_std, 'middle': state['mean'],
+            'lower': state['mean'] - std * num_std}
+
+def update_indicator(state, close, high=None, low=None):
+    """
+    Kapanan mumu duruma uygula ve güncel değeri döndür - O(1) (Stochastic için high/low gerekli)
+    Isınma süresince NaN (ya da NaN'lı dict) döner
+    """
+    kind = state['kind']
+    prev_close = state['prev_close']
+    state['prev_close'] = close
+
+    if kind == 'sma':
+        return update_sma(state['sma'], close)
+    if kind == 'ema':
+        return update_ema(state['ema'], close)
+    if kind == 'rsi':
+        # İlk mumda fark yok - toplu versiyondaki gibi 0 kazanç/kayıp sayılır
+        delta = close - prev_close if prev_close is not None else 0.0
+        avg_gain = update_sma(state['gain'], max(delta, 0.0))
+        avg_loss = update_sma(state['loss'], max(-delta, 0.0))
+        return NAN if math.isnan(avg_gain) else rsi_from_averages(avg_gain, avg_loss)
+    if kind == 'rsiw':
+        if prev_close is None:
+            return NAN
+        window = state['params'][0]
+        delta = close - prev_close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if state['avg_gain'] is None:
+            state['seen'] += 1
+            state['gain_sum'] += gain
+            state['loss_sum'] += loss
+            if state['seen'] < window:
+                return NAN
+            state['avg_gain'] = state['gain_sum'] / window
+            state['avg_loss'] = state['loss_sum'] / window
+        else:
+            state['avg_gain'] = (state['avg_gain'] * (window - 1) + gain) / window
+            state['avg_loss'] = (state['avg_loss'] * (window - 1) + loss) / window
+        return rsi_from_averages(state['avg_gain'], state['avg_loss'])
+    if kind == 'macd':
+        macd_line = update_ema(state['fast'], close) - update_ema(state['slow'], close)
+        signal_line = update_ema(state['signal'], macd_line)
+        return {'macd': macd_line, 'signal': signal_line, 'histogram': macd_line - signal_line}
+    if kind == 'bb':
+        return update_bollinger(state, close)
+    if kind == 'stoch':
+        high_max = update_extreme(state['high'], high)
+        low_min = update_extreme(state['low'], low)
+        span = high_max - low_min
+        if math.isnan(span):
+            k_percent = NAN
+        elif span == 0:
+            k_percent = NAN if close == low_min else math.copysign(math.inf, close - low_min)
+        else:
+            k_percent = (close - low_min) / span * 100
+        return {'k_percent': k_percent, 'd_percent': update_sma(state['d'], k_percent)}
+    raise ValueError(f"Bilinmeyen indikatör durumu: {kind}")
+
+# =============================================================================
+# İNDİKATÖR SETLERİ VE KALICILIK
+# =============================================================================
+
+def new_indicator_set(names):
+    """Birden fazla indikatör için durumlar - {ad: durum}"""
+    return {name: new_indicator_state(name) for name in names}
+
+def update_indicator_set(states, close, high=None, low=None):
+    """Setteki tüm indikatörleri kapanan mumla güncelle - {ad: değer}"""
+    return {name: update_indicator(state, close, high, low) for name, state in states.items()}
+
+def warm_up_indicator_set(names, arrays):
+    """
+    Geçmiş mumlardan (decode_klines dizileri) ısıtılmış durum seti oluştur - bir kez O(n),
+    sonrasında her yeni mum O(1). Dönüş: (durumlar, son değerler)
+    """
+    states = new_indicator_set(names)
+    values = {}
+    for close, high, low in zip(arrays['close'].tolist(), arrays['high'].tolist(), arrays['low'].tolist()):
+        values = update_indicator_set(states, close, high, low)
+    return states, values
+
+def save_indicator_states(states, path=INDICATOR_STATE_FILE):
+    """Durumları diske yaz (atomik) - {anahtar: {ad: durum}} ya da tek set"""
+    try:
+        tmp_file = path + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'updated': time.time(), 'states': states}, f, separators=(',', ':'))
+        os.replace(tmp_file, path)
+        return True
+    except Exception as e:
+        print(f"❌ İndikatör durumu kaydetme hatası: {e}")
+        return False
+
+def load_indicator_states(path=INDICATOR_STATE_FILE):
+    """Diskteki durumları yükle (yoksa None)"""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)['states']
+    except Exception as e:
+        print(f"❌ İndikatör durumu okuma hatası: {e}")
+    return None
+
+# =============================================================================
+# CANLI İNDİKATÖRLER (kline akışı)
+# =============================================================================
+
+def live_indicator_key(symbol, interval):
+    """Canlı durum anahtarı (JSON uyumlu)"""
+    return f"{symbol.upper()}:{interval}"
+
+def live_open_time(symbol, interval):
+    """Sembolün son işlenen mumunun open_time'ı (durum yoksa None)"""
+    with live_lock:
+        live = live_indicators.get(live_indicator_key(symbol, interval))
+        return live['open_time'] if live is not None else None
+
+def feed_rows(states, rows):
+    """Ham kline satırlarını sırayla duruma uygula - son değerler"""
+    values = {}
+    for row in rows:
+        values = update_indicator_set(states, float(row[4]), float(row[2]), float(row[3]))
+    return values
+
+def update_live_indicators(symbol, interval, row, step, history=None):
+    """
+    Kapanan mumu canlı sete uygula (utils/kline_cache.py apply_stream_kline çağırır)
+    Ardışık mumda O(1); arada mum kaçmışsa history'deki (depodaki kapanmış satırlar, row dahil)
+    eksikler işlenir, durum hiç yoksa ya da boşluk history'den büyükse history ile ısıtılır
+    Dönüş: güncel değerler ya da (history gerekip verilmediyse / kapalıysa) None
+    """
+    if not LIVE_INDICATOR_NAMES:
+        return None
+    key = live_indicator_key(symbol, interval)
+    with live_lock:
+        live = live_indicators.get(key)
+        if live is not None and live['open_time'] >= row[0]:
+            return live['values']  # Zaten işlendi
+        if live is not None and live['open_time'] == row[0] - step:
+            live['values'] = feed_rows(live['states'], [row])
+            live_stats['updates'] += 1
+        elif history is None:
+            return None
+        else:
+            missed = [item for item in history if live is not None and item[0] > live['open_time']]
+            if missed and missed[0][0] == live['open_time'] + step:
+                live['values'] = feed_rows(live['states'], missed)
+                live_stats['catch_ups'] += 1
+            else:
+                states = new_indicator_set(LIVE_INDICATOR_NAMES)
+                live = live_indicators[key] = {'states': states, 'values': feed_rows(states, history)}
+                live_stats['warm_ups'] += 1
+        live['open_time'] = row[0]
+        return live['values']
+
+def get_live_indicators(symbol, interval):
+    """Sembolün canlı indikatör değerleri - {ad: değer} ya da None"""
+    with live_lock:
+        live = live_indicators.get(live_indicator_key(symbol, interval))
+        return dict(live['values']) if live is not None else None
+
+def load_live_indicators():
+    """Açılışta diskteki canlı durumları yükle - kaçan mumlar ilk kapanışta depodan tamamlanır"""
+    states = load_indicator_states()
+    if not states:
+        return 0
+    with live_lock:
+        live_indicators.update(states)
+    print(f"📡 {len(states)} canlı indikatör durumu diskten yüklendi")
+    return len(states)
+
+def save_live_indicators():
+    """Kapanışta canlı durumları diske yaz"""
+    with live_lock:
+        if not live_indicators:
+            return False
+        return save_indicator_states(live_indicators)
+
+def get_live_indicator_stats():
+    """Canlı indikatör istatistikleri"""
+    with live_lock:
+        return {'symbols': len(live_indicators), **live_stats}
+
+# =============================================================================
+# DOĞRULAMA / BENCHMARK
+# =============================================================================
+
+def check_streaming_equivalence(size=2000, seed=7, tolerance=1e-8):
+    """
+    Akış versiyonlarını utils/technical_analysis.py toplu fonksiyonlarıyla karşılaştır
+    Ortada bir kez JSON'a yazılıp geri okunarak yeniden başlatma da sınanır
+    Dönüş: {ad: en büyük mutlak fark}
+    """
+    import numpy as np
+    import pandas as pd
+    from utils.technical_analysis import (calculate_rsi, calculate_sma, calculate_ema,
+                                          calculate_macd, calculate_bollinger_bands)
+    from utils.advanced_technical_analysis import calculate_stochastic
+
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, size))
+    df = pd.DataFrame({'open': close, 'high': close + rng.random(size), 'low': close - rng.random(size),
+                       'close': close, 'volume': rng.random(size)},
+                      index=pd.date_range('2024-01-01', periods=size, freq='h'))
+
+    batch = {
+        'rsi': {'value': calculate_rsi(df['close'])},
+        'rsiw_14': {'value': calculate_rsi(df['close'], method="wilder")},
+        'sma_20': {'value': calculate_sma(df['close'], 20)},
+        'ema_12': {'value': calculate_ema(df['close'], 12)},
+        'macd': calculate_macd(df['close']),
+        'bb': calculate_bollinger_bands(df['close']),
+        'stochastic': calculate_stochastic(df)
+    }
+    states = new_indicator_set(batch)
+    streamed = {name: {key: [] for key in parts} for name, parts in batch.items()}
+
+    start = time.perf_counter()
+    rows = list(zip(close.tolist(), df['high'].tolist(), df['low'].tolist()))
+    for i, (c, h, l) in enumerate(rows):
+        if i == size // 2:
+            states = json.loads(json.dumps(states))  # Yeniden başlatma benzetimi
+        for name, value in update_indicator_set(states, c, h, l).items():
+            for key in streamed[name]:
+                streamed[name][key].append(value[key] if isinstance(value, dict) else value)
+    per_update_us = (time.perf_counter() - start) / size / len(states) * 1e6
+
+    diffs = {}
+    for name, parts in batch.items():
+        worst = 0.0
+        for key, series in parts.items():
+            expected = series.to_numpy()
+            got = np.array(streamed[name][key])
+            assert np.array_equal(np.isnan(expected), np.isnan(got)), f"{name}.{key} NaN konumları farklı"
+            finite = ~np.isnan(expected)
+            if finite.any():
+                worst = max(worst, float(np.max(np.abs(expected[finite] - got[finite]))))
+        diffs[name] = worst
+        status = "✅" if worst <= tolerance else "❌"
+        print(f"{status} {name:<11} en büyük fark: {worst:.2e}")
+    print(f"⚡ Güncelleme başına ortalama {per_update_us:.2f} µs (indikatör başına)")
+    return diffs
+
+if DEBUG_MODE:
+    print("📡 Streaming indicators utils yüklendi!")
+
+if __name__ == "__main__":
+    check_streaming_equivalence()
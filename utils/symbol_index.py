@@ -0,0 +1,69 @@
+"""
+Symbol Index Utils
+Binance sembolleri için önceden kurulan arama indeksi - tam eşleşme, alias ve önek
+tek dict aramasıyla çözülür; bulunamayanlar için sıralı "bunu mu demek istediniz" önerileri
+"""
+
+import difflib
+from config import *
+
+# Global indeks - load_all_binance_symbols() sonrasında bir kez kurulur, tek atamayla değişir
+# {'exact': {anahtar: SYMBOL}, 'prefix': {önek: SYMBOL}, 'keys': [sıralı anahtarlar]}
+SYMBOL_INDEX = {'exact': {}, 'prefix': {}, 'keys': []}
+
+MIN_PREFIX_LENGTH = 2
+QUOTE_SUFFIXES = ("/usdt", "-usdt", "usdt")
+
+def normalize_query(coin_input):
+    """Kullanıcı girdisini indeks anahtarına çevir (küçük harf, 'USDT' eki atılır)"""
+    query = coin_input.lower().strip()
+    for suffix in QUOTE_SUFFIXES:
+        if query.endswith(suffix) and len(query) > len(suffix):
+            return query[:-len(suffix)]
+    return query
+
+def build_symbol_index(symbols):
+    """
+    {anahtar: SYMBOL} sözlüğünden (baseAsset ve alias'lar) indeksi kur
+    Önek eşleşmesi deterministik: aynı öneki paylaşan anahtarlardan en kısası, eşitse alfabetik ilki
+    """
+    global SYMBOL_INDEX
+
+    exact = dict(symbols)
+    for symbol in symbols.values():
+        exact.setdefault(symbol.lower(), symbol)
+
+    keys = sorted(exact)
+    prefix = {}
+    for key in sorted(keys, key=lambda k: (len(k), k)):
+        for length in range(MIN_PREFIX_LENGTH, len(key)):
+            prefix.setdefault(key[:length], exact[key])
+
+    SYMBOL_INDEX = {'exact': exact, 'prefix': prefix, 'keys': keys}
+    return len(exact)
+
+def lookup_symbol(coin_input):
+    """Girdiyi sembole çöz - önce tam/alias eşleşme, sonra önek; bulunamazsa None"""
+    query = normalize_query(coin_input)
+    index = SYMBOL_INDEX
+    return index['exact'].get(query) or index['prefix'].get(query)
+
+def suggest_symbols(coin_input, count=3):
+    """Bulunamayan girdi için benzerliğe göre sıralı öneriler - [(anahtar, SYMBOL)]"""
+    query = normalize_query(coin_input)
+    index = SYMBOL_INDEX
+    matches = difflib.get_close_matches(query, index['keys'], n=count * 3, cutoff=0.6)
+
+    suggestions = []
+    seen = set()
+    for key in matches:
+        symbol = index['exact'][key]
+        if symbol not in seen:
+            seen.add(symbol)
+            suggestions.append((key, symbol))
+        if len(suggestions) == count:
+            break
+    return suggestions
+
+if DEBUG_MODE:
+    print("🔎 Symbol index utils yüklendi!")
@@ -1,39 +1,29 @@
 """
 Technical Analysis Utils
 RSI, MACD, Bollinger Bands ve diğer teknik indikatörler
+Hesaplar utils/indicators.py motorunda yapılır; buradaki fonksiyonlar geriye uyumlu sarmalayıcılardır
 """
 
 import pandas as pd
 import numpy as np
 from config import *
+from utils.indicators import get_indicators, get_indicator
 
-def calculate_rsi(prices, window=14):
-    """RSI (Relative Strength Index) hesapla"""
+def calculate_rsi(prices, window=14, method="sma"):
+    """
+    RSI (Relative Strength Index) hesapla - utils/indicators.py motorundan
+    method: "sma" (kazanç/kayıpların basit ortalaması) ya da "wilder" (Wilder yumuşatması)
+    """
     try:
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return get_indicator(prices, f'rsiw_{window}' if method == "wilder" else f'rsi_{window}')
     except Exception as e:
         print(f"RSI hesaplama hatası: {e}")
         return pd.Series(index=prices.index, dtype=float)
 
 def calculate_macd(prices, fast=12, slow=26, signal=9):
-    """MACD (Moving Average Convergence Divergence) hesapla"""
+    """MACD (Moving Average Convergence Divergence) hesapla - utils/indicators.py motorundan"""
     try:
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
-        
-        return {
-            'macd': macd_line,
-            'signal': signal_line,
-            'histogram': histogram
-        }
+        return get_indicator(prices, f'macd_{fast}_{slow}_{signal}')
     except Exception as e:
         print(f"MACD hesaplama hatası: {e}")
         return {
@@ -43,18 +33,9 @@ def calculate_macd(prices, fast=12, slow=26, signal=9):
         }
 
 def calculate_bollinger_bands(prices, window=20, num_std=2):
-    """Bollinger Bands hesapla"""
+    """Bollinger Bands hesapla - utils/indicators.py motorundan"""
     try:
-        sma = prices.rolling(window=window).mean()
-        std = prices.rolling(window=window).std()
-        upper_band = sma + (std * num_std)
-        lower_band = sma - (std * num_std)
-        
-        return {
-            'upper': upper_band,
-            'middle': sma,
-            'lower': lower_band
-        }
+        return get_indicator(prices, f'bb_{window}_{num_std}')
     except Exception as e:
         print(f"Bollinger Bands hesaplama hatası: {e}")
         return {
@@ -66,7 +47,7 @@ def calculate_bollinger_bands(prices, window=20, num_std=2):
 def calculate_sma(prices, window):
     """Simple Moving Average hesapla"""
     try:
-        return prices.rolling(window=window).mean()
+        return get_indicator(prices, f'sma_{window}')
     except Exception as e:
         print(f"SMA hesaplama hatası: {e}")
         return pd.Series(index=prices.index, dtype=float)
@@ -74,32 +55,22 @@ def calculate_sma(prices, window):
 def calculate_ema(prices, window):
     """Exponential Moving Average hesapla"""
     try:
-        return prices.ewm(span=window).mean()
+        return get_indicator(prices, f'ema_{window}')
     except Exception as e:
         print(f"EMA hesaplama hatası: {e}")
         return pd.Series(index=prices.index, dtype=float)
 
+def find_pivots(df, window=5):
+    """Pivot tepe/dip fiyatları - {'highs', 'lows'} (vektörel, utils/indicators.py motorundan)"""
+    return get_indicator(df, f'pivots_{window}')
+
 def find_support_resistance(df, window=5):
     """Destek ve direnç seviyelerini bul"""
     try:
-        highs = []
-        lows = []
-        
-        # Pivot noktalarını bul
-        for i in range(window, len(df) - window):
-            # Yerel maksimum
-            if all(df['high'].iloc[i] >= df['high'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['high'].iloc[i] >= df['high'].iloc[i+j] for j in range(1, window+1)):
-                highs.append(df['high'].iloc[i])
-            
-            # Yerel minimum
-            if all(df['low'].iloc[i] <= df['low'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['low'].iloc[i] <= df['low'].iloc[i+j] for j in range(1, window+1)):
-                lows.append(df['low'].iloc[i])
-        
+        pivots = find_pivots(df, window)
         return {
-            'resistance_levels': sorted(highs, reverse=True)[:3],  # En yüksek 3 direnç
-            'support_levels': sorted(lows)[:3]  # En düşük 3 destek
+            'resistance_levels': np.sort(pivots['highs'])[::-1][:3].tolist(),  # En yüksek 3 direnç
+            'support_levels': np.sort(pivots['lows'])[:3].tolist()  # En düşük 3 destek
         }
     except Exception as e:
         print(f"Destek/direnç hesaplama hatası: {e}")
@@ -108,10 +79,26 @@ def find_support_resistance(df, window=5):
             'support_levels': []
         }
 
+def find_support_levels(df, current_price, window=5):
+    """Destek seviyelerini bul - mevcut fiyatın altındaki en yakın 3 pivot dip"""
+    try:
+        lows = find_pivots(df, window)['lows']
+        return np.sort(lows[lows < current_price])[::-1][:3].tolist()
+    except:
+        return []
+
+def find_resistance_levels(df, current_price, window=5):
+    """Direnç seviyelerini bul - mevcut fiyatın üstündeki en yakın 3 pivot tepe"""
+    try:
+        highs = find_pivots(df, window)['highs']
+        return np.sort(highs[highs > current_price])[:3].tolist()
+    except:
+        return []
+
 def calculate_volume_analysis(df, window=20):
     """Volume analizi yap"""
     try:
-        avg_volume = df['volume'].rolling(window=window).mean()
+        avg_volume = get_indicator(df, f'volume_sma_{window}')
         current_volume = df['volume'].iloc[-1]
         avg_volume_value = avg_volume.iloc[-1]
         
@@ -156,9 +143,10 @@ def calculate_trend_strength(df):
     """Trend gücünü hesapla"""
     try:
         # SMA'ları hesapla
-        sma_20 = calculate_sma(df['close'], 20)
-        sma_50 = calculate_sma(df['close'], 50)
-        sma_200 = calculate_sma(df['close'], 200)
+        indicators = get_indicators(df, ('sma_20', 'sma_50', 'sma_200'))
+        sma_20 = indicators['sma_20']
+        sma_50 = indicators['sma_50']
+        sma_200 = indicators['sma_200']
         
         current_price = df['close'].iloc[-1]
         
@@ -222,9 +210,10 @@ def generate_trading_signals(df):
     """Trading sinyalleri üret"""
     try:
         signals = []
+        indicators = get_indicators(df, ('rsi', 'macd', 'bb'))
         
         # RSI sinyalleri
-        rsi = calculate_rsi(df['close'])
+        rsi = indicators['rsi']
         current_rsi = rsi.iloc[-1]
         
         if current_rsi < 30:
@@ -233,7 +222,7 @@ def generate_trading_signals(df):
             signals.append({"type": "SELL", "reason": "RSI aşırı alım", "strength": "Orta"})
         
         # MACD sinyalleri
-        macd_data = calculate_macd(df['close'])
+        macd_data = indicators['macd']
         if macd_data['macd'].iloc[-1] > macd_data['signal'].iloc[-1] and \
            macd_data['macd'].iloc[-2] <= macd_data['signal'].iloc[-2]:
             signals.append({"type": "BUY", "reason": "MACD pozitif kesişim", "strength": "Güçlü"})
@@ -242,7 +231,7 @@ def generate_trading_signals(df):
             signals.append({"type": "SELL", "reason": "MACD negatif kesişim", "strength": "Güçlü"})
         
         # Bollinger Bands sinyalleri
-        bb = calculate_bollinger_bands(df['close'])
+        bb = indicators['bb']
         current_price = df['close'].iloc[-1]
         
         if current_price < bb['lower'].iloc[-1]:
@@ -255,6 +244,56 @@ def generate_trading_signals(df):
         print(f"Sinyal üretme hatası: {e}")
         return []
 
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark_pivot_detection(sizes=(100, 1000, 5000), window=5, repeat=5):
+    """Vektörel pivot tespitini eski iç içe iloc döngüleriyle karşılaştır"""
+    import time
+    from utils.indicators import clear_indicator_cache
+
+    def legacy_support_resistance(df):
+        highs = []
+        lows = []
+        for i in range(window, len(df) - window):
+            if all(df['high'].iloc[i] >= df['high'].iloc[i-j] for j in range(1, window+1)) and \
+               all(df['high'].iloc[i] >= df['high'].iloc[i+j] for j in range(1, window+1)):
+                highs.append(df['high'].iloc[i])
+            if all(df['low'].iloc[i] <= df['low'].iloc[i-j] for j in range(1, window+1)) and \
+               all(df['low'].iloc[i] <= df['low'].iloc[i+j] for j in range(1, window+1)):
+                lows.append(df['low'].iloc[i])
+        return {'resistance_levels': sorted(highs, reverse=True)[:3], 'support_levels': sorted(lows)[:3]}
+
+    def vectorized(df):
+        clear_indicator_cache()  # Önbellek etkisi olmadan saf hesap süresi
+        return find_support_resistance(df, window)
+
+    def timed(fn, df, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            fn(df)
+        return (time.perf_counter() - start) / count * 1000
+
+    print(f"🧪 Pivot tespiti benchmark (window={window})")
+    rng = np.random.default_rng(42)
+    results = {}
+    for size in sizes:
+        close = 100 + np.cumsum(rng.normal(0, 1, size))
+        df = pd.DataFrame({'open': close, 'high': close + rng.random(size), 'low': close - rng.random(size),
+                           'close': close, 'volume': rng.random(size) * 1000},
+                          index=pd.date_range('2024-01-01', periods=size, freq='h'))
+        assert legacy_support_resistance(df) == find_support_resistance(df, window)
+
+        legacy_ms = timed(legacy_support_resistance, df, 1 if size > 1000 else repeat)
+        vector_ms = timed(vectorized, df, repeat * 20)
+        results[size] = (legacy_ms, vector_ms)
+        print(f"📊 {size:>5} mum: döngü {legacy_ms:.2f} ms | vektörel {vector_ms * 1000:.0f} µs "
+              f"({legacy_ms / vector_ms:.0f}x)")
+    return results
+
 if DEBUG_MODE:
     print("📈 Technical analysis utils yüklendi!")
 
+if __name__ == "__main__":
+    benchmark_pivot_detection()
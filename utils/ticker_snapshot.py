@@ -0,0 +1,166 @@
+"""
+Ticker Snapshot Utils
+Tüm Binance sembolleri için tek /ticker/24hr isteğiyle doldurulan, arka planda yenilenen
+NumPy tablo - fiyat, alarm ve movers sorguları istek anında ağa çıkmadan O(1) okunur
+"""
+
+import threading
+import time
+from functools import partial
+import numpy as np
+from config import *
+from utils.json_stream import stream_json_items
+from utils.binance_rate import binance_get, PRIORITY_BACKGROUND
+
+# Global tablo - her yenilemede yeni dict oluşturulup tek atamayla değiştirilir
+# {'symbols': [SYMBOL], 'index': {SYMBOL: satır}, 'price', 'change', 'volume',
+#  'quote_volume', 'high', 'low': np.ndarray, 'updated': zaman}
+ticker_table = None
+ticker_thread = None
+ticker_snapshot_running = False
+ticker_stats = {'refreshes': 0, 'errors': 0, 'last_refresh_seconds': None}
+
+TICKER_COLUMNS = (('price', 'lastPrice'), ('change', 'priceChangePercent'), ('volume', 'volume'),
+                  ('quote_volume', 'quoteVolume'), ('high', 'highPrice'), ('low', 'lowPrice'))
+
+def build_ticker_table(tickers):
+    """/ticker/24hr cevabından kolon dizileri oluştur"""
+    symbols = [t['symbol'] for t in tickers]
+    table = {'symbols': symbols, 'index': {symbol: i for i, symbol in enumerate(symbols)},
+             'updated': time.time()}
+    for column, field in TICKER_COLUMNS:
+        table[column] = np.array([t[field] for t in tickers], dtype=np.float64)
+    return table
+
+def refresh_ticker_snapshot():
+    """Tüm semboller için 24 saatlik ticker'ı tek istekle indir ve tabloyu değiştir"""
+    global ticker_table
+    try:
+        start = time.perf_counter()
+        tickers = stream_json_items(f"{BINANCE_BASE_URL}/ticker/24hr", timeout=BINANCE_TIMEOUT,
+                                    fields=('symbol',) + tuple(field for _, field in TICKER_COLUMNS),
+                                    get_fn=partial(binance_get, weight=80, priority=PRIORITY_BACKGROUND))
+        if tickers is None:
+            ticker_stats['errors'] += 1
+            return False
+        ticker_table = build_ticker_table(tickers)
+        ticker_stats['refreshes'] += 1
+        ticker_stats['last_refresh_seconds'] = time.perf_counter() - start
+        return True
+    except Exception as e:
+        ticker_stats['errors'] += 1
+        print(f"❌ Ticker snapshot hatası: {e}")
+        return False
+
+def get_ticker_table(max_age=TICKER_SNAPSHOT_MAX_AGE):
+    """Güncel tabloyu döndür (yoksa ya da eskiyse None)"""
+    table = ticker_table
+    if table is None or time.time() - table['updated'] > max_age:
+        return None
+    return table
+
+def get_snapshot_price(symbol):
+    """Tablodan son fiyat - O(1), ağ isteği yok"""
+    table = get_ticker_table()
+    if table is None:
+        return None
+    row = table['index'].get(symbol.upper())
+    return float(table['price'][row]) if row is not None else None
+
+def get_snapshot_stats(symbol):
+    """Tablodan 24 saatlik istatistikler (get_binance_24h_stats formatında)"""
+    table = get_ticker_table()
+    if table is None:
+        return None
+    row = table['index'].get(symbol.upper())
+    if row is None:
+        return None
+    return {
+        'price': float(table['price'][row]),
+        'change_24h': float(table['change'][row]),
+        'volume_24h': float(table['volume'][row]),
+        'high_24h': float(table['high'][row]),
+        'low_24h': float(table['low'][row])
+    }
+
+def get_snapshot_prices(symbols):
+    """Birden fazla sembol için fiyatlar - {SYMBOL: fiyat}, tabloda olmayanlar atlanır"""
+    table = get_ticker_table()
+    if table is None:
+        return {}
+    index = table['index']
+    found = [(symbol, index[symbol]) for symbol in symbols if symbol in index]
+    if not found:
+        return {}
+    rows = np.fromiter((row for _, row in found), dtype=np.int64, count=len(found))
+    return dict(zip((symbol for symbol, _ in found), table['price'][rows].tolist()))
+
+def get_top_movers(count=10, quote="USDT", min_quote_volume=1_000_000):
+    """
+    24 saatte en çok yükselen ve düşen semboller
+    Dönüş: (yükselenler, düşenler) - [(SYMBOL, değişim %, fiyat)] listeleri
+    """
+    table = get_ticker_table()
+    if table is None:
+        return [], []
+
+    symbols = table['symbols']
+    mask = table['quote_volume'] >= min_quote_volume
+    mask &= np.fromiter((s.endswith(quote) for s in symbols), dtype=bool, count=len(symbols))
+    rows = np.flatnonzero(mask)
+    if rows.size == 0:
+        return [], []
+
+    change = table['change'][rows]
+    count = min(count, rows.size)
+    # Tam sıralama yerine argpartition ile ilk `count` satır, sonra sadece onları sırala
+    top = np.argpartition(-change, count - 1)[:count]
+    top = top[np.argsort(-change[top])]
+    bottom = np.argpartition(change, count - 1)[:count]
+    bottom = bottom[np.argsort(change[bottom])]
+
+    def rows_to_list(selected):
+        return [(symbols[r], float(table['change'][r]), float(table['price'][r])) for r in rows[selected]]
+
+    return rows_to_list(top), rows_to_list(bottom)
+
+def ticker_snapshot_loop():
+    """Tabloyu periyodik olarak yenile"""
+    while ticker_snapshot_running:
+        time.sleep(TICKER_SNAPSHOT_INTERVAL)
+        if ticker_snapshot_running:
+            refresh_ticker_snapshot()
+
+def start_ticker_snapshot():
+    """İlk tabloyu indir ve yenileme thread'ini başlat"""
+    global ticker_thread, ticker_snapshot_running
+
+    if ticker_snapshot_running:
+        return False
+
+    refresh_ticker_snapshot()
+    ticker_snapshot_running = True
+    ticker_thread = threading.Thread(target=ticker_snapshot_loop, daemon=True)
+    ticker_thread.start()
+    print(f"✅ Ticker snapshot başladı! (Her {TICKER_SNAPSHOT_INTERVAL} saniyede)")
+    return True
+
+def stop_ticker_snapshot():
+    """Yenileme thread'ini durdur"""
+    global ticker_snapshot_running
+    ticker_snapshot_running = False
+
+def get_ticker_snapshot_stats():
+    """Snapshot istatistikleri"""
+    table = ticker_table
+    return {
+        'running': ticker_snapshot_running,
+        'symbols': len(table['symbols']) if table else 0,
+        'age_seconds': time.time() - table['updated'] if table else None,
+        'refreshes': ticker_stats['refreshes'],
+        'errors': ticker_stats['errors'],
+        'last_refresh_seconds': ticker_stats['last_refresh_seconds']
+    }
+
+if DEBUG_MODE:
+    print("📋 Ticker snapshot utils yüklendi!")